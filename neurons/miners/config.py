@@ -105,6 +105,20 @@ def get_config() -> "bt.Config":
         help="OpenAI model used for fixing queries.",
     )
 
+    parser.add_argument(
+        "--miner.stream_coalesce_ms",
+        type=float,
+        default=20,
+        help="Streamed tokens of the same role are sent together within this window in milliseconds. Set to 0 to disable.",
+    )
+
+    parser.add_argument(
+        "--miner.stream_coalesce_bytes",
+        type=int,
+        default=512,
+        help="Streamed tokens of the same role are sent as soon as this many bytes are buffered. Set to 0 to disable.",
+    )
+
     # Adds subtensor specific arguments i.e. --subtensor.chain_endpoint ... --subtensor.network ...
     bt.subtensor.add_args(parser)
 
@@ -3,6 +3,8 @@ import bittensor as bt
 from starlette.types import Send
 from template.protocol import (
     ScraperStreamingSynapse,
+    STREAM_PROTOCOL_VERSION,
+    negotiate_stream_framing,
 )
 from template.tools.tool_manager import ToolManager
 from template.utils import save_logs_from_miner
@@ -19,6 +21,10 @@ class ScraperMiner:
             seed = synapse.seed
             tools = synapse.tools
             is_intro_text = synapse.is_intro_text
+            stream_framing = negotiate_stream_framing(synapse.stream_framings)
+            stream_protocol_version = min(
+                synapse.stream_protocol_version, STREAM_PROTOCOL_VERSION
+            )
 
             bt.logging.trace(synapse)
 
@@ -36,6 +42,8 @@ class ScraperMiner:
                 send=send,
                 is_intro_text=is_intro_text,
                 miner=self.miner,
+                stream_framing=stream_framing,
+                stream_protocol_version=stream_protocol_version,
             )
 
             await tool_manager.run()
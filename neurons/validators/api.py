@@ -28,7 +28,7 @@ async def response_stream(data):
     try:
         last_message = data["messages"][-1]
         async for response in neu.scraper_validator.organic(last_message):
-            yield f"{response}"
+            yield response if isinstance(response, bytes) else f"{response}"
 
     except Exception as e:
         bt.logging.error(f"error in response_stream {traceback.format_exc()}")
@@ -56,8 +56,17 @@ async def response_stream_event(data):
             uids = None
             merged_chunks = ""
             async for response in neu.scraper_validator.organic(last_message):
+                # Miner frames are single-line JSON bytes, forward them as they are
+                if isinstance(response, bytes) and b"\n" not in response:
+                    yield b"data: " + response + b"\n\n"
+                    continue
+
                 # Decode the chunk if necessary and merge
-                chunk = str(response)  # Assuming response is already a string
+                chunk = (
+                    response.decode("utf-8")
+                    if isinstance(response, bytes)
+                    else str(response)
+                )
                 merged_chunks += chunk
                 lines = chunk.split("\n")
                 sse_data = "\n".join(f"data: {line if line else ' '}" for line in lines)
@@ -0,0 +1,99 @@
+import asyncio
+import bittensor as bt
+from typing import Any, AsyncIterator, Callable, Dict, List
+
+
+class LookupBroker:
+    """
+    Merges lookups from concurrent rounds into shared actor runs. Lookups made
+    within `window` seconds of each other are sent as one run, keys already
+    being looked up join the run in flight, and every waiting round gets each
+    item as soon as the run writes it.
+
+    `iterate_items(urls)` runs the actor and yields its items, `get_item_key(item)`
+    returns the key the item answers.
+    """
+
+    def __init__(
+        self,
+        iterate_items: Callable[[List[str]], AsyncIterator[Any]],
+        get_item_key: Callable[[Any], str],
+        window: float = 1.0,
+        max_batch_size: int = 500,
+    ):
+        self.iterate_items = iterate_items
+        self.get_item_key = get_item_key
+        self.window = window
+        self.max_batch_size = max_batch_size
+
+        # Keys waiting for the window to close, with the url to look them up by
+        self.pending: Dict[str, str] = {}
+        # Futures of every pending or running key
+        self.futures: Dict[str, asyncio.Future] = {}
+        self.flush_timer = None
+        self.running_tasks = set()
+
+        self.runs = 0
+        self.lookups = 0
+
+    async def lookup(self, urls_by_key: Dict[str, str]) -> Dict[str, Any]:
+        """Returns the items found for the keys, keys without an item are left out."""
+        loop = asyncio.get_running_loop()
+        self.lookups += 1
+
+        futures = {}
+        for key, url in urls_by_key.items():
+            future = self.futures.get(key)
+            if future is None:
+                future = loop.create_future()
+                self.futures[key] = future
+                self.pending[key] = url
+            futures[key] = future
+
+        if len(self.pending) >= self.max_batch_size:
+            self.flush()
+        elif self.pending and self.flush_timer is None:
+            self.flush_timer = loop.call_later(self.window, self.flush)
+
+        # Shielded so a cancelled round does not cancel lookups other rounds wait for
+        results = await asyncio.gather(
+            *[asyncio.shield(future) for future in futures.values()]
+        )
+        return {
+            key: result
+            for key, result in zip(futures.keys(), results)
+            if result is not None
+        }
+
+    def flush(self):
+        if self.flush_timer is not None:
+            self.flush_timer.cancel()
+            self.flush_timer = None
+
+        if not self.pending:
+            return
+
+        batch, self.pending = self.pending, {}
+        task = asyncio.get_running_loop().create_task(self.run_batch(batch))
+        self.running_tasks.add(task)
+        task.add_done_callback(self.running_tasks.discard)
+
+    async def run_batch(self, batch: Dict[str, str]):
+        self.runs += 1
+        bt.logging.debug(
+            f"Looking up {len(batch)} urls in one run, {self.runs} runs for {self.lookups} lookups."
+        )
+
+        try:
+            async for item in self.iterate_items(list(batch.values())):
+                key = self.get_item_key(item)
+                future = self.futures.get(key) if key in batch else None
+                if future is not None and not future.done():
+                    future.set_result(item)
+        except Exception as e:
+            bt.logging.warning(f"Lookup run failed: {e}")
+        finally:
+            for key in batch:
+                future = self.futures.pop(key, None)
+                if future is not None and not future.done():
+                    future.set_result(None)
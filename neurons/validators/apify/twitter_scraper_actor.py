@@ -1,10 +1,11 @@
 import os
-from typing import List
+from typing import AsyncIterator, List
 
 # DEALINGS IN THE SOFTWARE.p
 import traceback
 import bittensor as bt
 from apify_client import ApifyClientAsync
+from neurons.validators.apify.utils import iterate_run_items
 from template.protocol import (
     TwitterScraperTweet,
     TwitterScraperMedia,
@@ -27,65 +28,71 @@ class TwitterScraperActor:
         self.actor_id = "61RPP7dywgiy0JPD0"
         self.client = ApifyClientAsync(token=APIFY_API_KEY)
 
-    async def get_tweets(
-        self, urls: List[str], add_user_info: bool = True
-    ) -> List[TwitterScraperTweet]:
+    def parse_tweet(self, item: dict) -> TwitterScraperTweet:
+        media_list = item.get("extendedEntities", {}).get("media", [])
+
+        media_list = [
+            TwitterScraperMedia(
+                media_url=media.get("media_url_https"), type=media.get("type")
+            )
+            for media in media_list
+        ]
+
+        author = item.get("author", {})
+
+        tweet = TwitterScraperTweet(
+            id=item.get("id"),
+            full_text=item.get("text"),
+            reply_count=item.get("replyCount"),
+            retweet_count=item.get("retweetCount"),
+            like_count=item.get("likeCount"),
+            quote_count=item.get("quoteCount"),
+            url=item.get("url"),
+            created_at=item.get("createdAt"),
+            is_quote_tweet=item.get("isQuote"),
+            is_retweet=item.get("isRetweet"),
+            media=media_list,
+            user=TwitterScraperUser(
+                id=author.get("id"),
+                created_at=author.get("createdAt"),
+                description=author.get("description"),
+                followers_count=author.get("followers"),
+                favourites_count=author.get("favouritesCount"),
+                media_count=author.get("mediaCount"),
+                statuses_count=author.get("statusesCount"),
+                verified=author.get("isVerified"),
+                profile_image_url=author.get("profilePicture"),
+                url=author.get("url"),
+                name=author.get("name"),
+                username=author.get("userName"),
+            ),
+        )
+        return tweet
+
+    async def iterate_tweets(
+        self, urls: List[str]
+    ) -> AsyncIterator[TwitterScraperTweet]:
+        """Yields tweets as the actor writes them, before the run has finished."""
         if not APIFY_API_KEY:
             bt.logging.warning(
                 "Please set the APIFY_API_KEY environment variable. See here: https://github.com/surcyf123/smart-scrape/blob/main/docs/env_variables.md. This will be required in the next release."
             )
-            return []
-        try:
-            run_input = {
-                "startUrls": urls,
-            }
+            return
 
-            run = await self.client.actor(self.actor_id).call(run_input=run_input)
+        run_input = {
+            "startUrls": urls,
+        }
 
-            tweets: List[TwitterScraperTweet] = []
+        async for item in iterate_run_items(self.client, self.actor_id, run_input):
+            yield self.parse_tweet(item)
 
-            async for item in self.client.dataset(
-                run["defaultDatasetId"]
-            ).iterate_items():
-                media_list = item.get("extendedEntities", {}).get("media", [])
-
-                media_list = [
-                    TwitterScraperMedia(
-                        media_url=media.get("media_url_https"), type=media.get("type")
-                    )
-                    for media in media_list
-                ]
-
-                author = item.get("author", {})
-
-                tweet = TwitterScraperTweet(
-                    id=item.get("id"),
-                    full_text=item.get("text"),
-                    reply_count=item.get("replyCount"),
-                    retweet_count=item.get("retweetCount"),
-                    like_count=item.get("likeCount"),
-                    quote_count=item.get("quoteCount"),
-                    url=item.get("url"),
-                    created_at=item.get("createdAt"),
-                    is_quote_tweet=item.get("isQuote"),
-                    is_retweet=item.get("isRetweet"),
-                    media=media_list,
-                    user=TwitterScraperUser(
-                        id=author.get("id"),
-                        created_at=author.get("createdAt"),
-                        description=author.get("description"),
-                        followers_count=author.get("followers"),
-                        favourites_count=author.get("favouritesCount"),
-                        media_count=author.get("mediaCount"),
-                        statuses_count=author.get("statusesCount"),
-                        verified=author.get("isVerified"),
-                        profile_image_url=author.get("profilePicture"),
-                        url=author.get("url"),
-                        name=author.get("name"),
-                        username=author.get("userName"),
-                    ),
-                )
+    async def get_tweets(
+        self, urls: List[str], add_user_info: bool = True
+    ) -> List[TwitterScraperTweet]:
+        try:
+            tweets: List[TwitterScraperTweet] = []
 
+            async for tweet in self.iterate_tweets(urls):
                 tweets.append(tweet)
 
             return tweets
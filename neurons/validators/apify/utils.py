@@ -0,0 +1,38 @@
+from typing import AsyncIterator
+from apify_client import ApifyClientAsync
+
+# Statuses of a run that is still producing items
+ACTIVE_RUN_STATUSES = ("READY", "RUNNING")
+
+
+async def iterate_run_items(
+    client: ApifyClientAsync,
+    actor_id: str,
+    run_input: dict,
+    poll_interval: int = 1,
+    page_size: int = 1000,
+) -> AsyncIterator[dict]:
+    """
+    Starts an actor run and yields the items of its default dataset as they are
+    written, instead of waiting for the run to finish before reading them.
+    """
+    run = await client.actor(actor_id).start(run_input=run_input)
+    run_client = client.run(run["id"])
+    dataset = client.dataset(run["defaultDatasetId"])
+
+    offset = 0
+    finished = False
+    while True:
+        page = await dataset.list_items(offset=offset, limit=page_size)
+        for item in page.items:
+            yield item
+        offset += len(page.items)
+
+        if page.items:
+            continue
+        # One more read after the run finished, for items written before it ended
+        if finished:
+            break
+
+        run = await run_client.wait_for_finish(wait_secs=poll_interval)
+        finished = run is None or run.get("status") not in ACTIVE_RUN_STATUSES
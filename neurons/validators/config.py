@@ -127,6 +127,228 @@ def add_args(cls, parser):
         default=DefaultRewardFrameworkConfig.web_search_relavance_weight,
     )
 
+    parser.add_argument(
+        "--neuron.organic_stream_policy",
+        type=str,
+        choices=["first", "interleave", "best"],
+        help="How concurrent miner streams are forwarded to organic clients: the first miner to respond, all miners interleaved, or the best completion once every miner has finished.",
+        default="first",
+    )
+
+    parser.add_argument(
+        "--neuron.stream_idle_timeout",
+        type=float,
+        help="Seconds a miner stream may go without sending a chunk before it is closed and scored as timed out.",
+        default=30,
+    )
+
+    parser.add_argument(
+        "--neuron.stream_first_chunk_timeout",
+        type=float,
+        help="Seconds a miner stream may take to send its first chunk, for example while the miner calls tools, before it is closed and scored as timed out.",
+        default=120,
+    )
+
+    parser.add_argument(
+        "--neuron.round_deadline",
+        type=float,
+        help="Seconds after which unfinished miner streams of a round are cancelled and scored as timed out. Defaults to the dendrite timeout (150 seconds) plus 10 seconds; a shorter deadline also cuts miners that are still within the dendrite timeout.",
+        default=None,
+    )
+
+    parser.add_argument(
+        "--reward.scoring_batch_size",
+        type=int,
+        help="Maximum number of scoring messages sent to the local scoring model in one batch.",
+        default=16,
+    )
+
+    parser.add_argument(
+        "--reward.scoring_batch_max_wait",
+        type=float,
+        help="Seconds to wait for more scoring messages before a partial batch is sent to the local scoring model.",
+        default=0.05,
+    )
+
+    parser.add_argument(
+        "--reward.scoring_mode",
+        type=str,
+        choices=["generate", "logits"],
+        help="How the local scoring model scores: generate samples an answer and parses it, logits reads the score code probabilities from a single forward pass and uses the expected score.",
+        default="generate",
+    )
+
+    parser.add_argument(
+        "--reward.scoring_source_timeout",
+        type=float,
+        help="Seconds a scoring source may take for a message before the next source is asked as well. The first valid score is used.",
+        default=60,
+    )
+
+    parser.add_argument(
+        "--reward.scoring_deadline",
+        type=float,
+        help="Seconds after which a message that no scoring source has scored is given up.",
+        default=300,
+    )
+
+    parser.add_argument(
+        "--reward.scoring_chunk_size",
+        type=int,
+        help="Number of scoring messages sent to a scoring source in one request. Chunks are hedged to the next source together.",
+        default=16,
+    )
+
+    parser.add_argument(
+        "--reward.enable_subnet_18_scoring",
+        action="store_true",
+        help="Use Subnet 18 (URL_SUBNET_18) as the last scoring source.",
+        default=False,
+    )
+
+    parser.add_argument(
+        "--reward.scoring_backend",
+        type=str,
+        choices=["hf", "int8", "onnx", "gguf"],
+        help="Runtime used to load the local scoring model: hf (bfloat16, GPU), int8 (int8 weights, bitsandbytes on GPU, dynamic quantization on CPU), onnx (ONNX Runtime through optimum, CPU) or gguf (llama.cpp, CPU).",
+        default="hf",
+    )
+
+    parser.add_argument(
+        "--reward.scoring_gguf_path",
+        type=str,
+        help="Path of the GGUF model file used by the gguf scoring backend.",
+        default=None,
+    )
+
+    parser.add_argument(
+        "--reward.scoring_onnx_cache_dir",
+        type=str,
+        help="Directory where the onnx scoring backend keeps its ONNX export, so the model is only exported once. Default: ~/.cache/smart-scrape/onnx",
+        default=None,
+    )
+
+    parser.add_argument(
+        "--reward.scoring_server_url",
+        type=str,
+        help="URL of a shared scoring server started with neurons/validators/scoring_server.py, either http://host:port or unix:/path/to/socket. When set, the scoring model is not loaded in this process.",
+        default=None,
+    )
+
+    parser.add_argument(
+        "--reward.relevance_prefilter",
+        action="store_true",
+        help="Scores clearly unrelated tweets and pages as irrelevant (SM_SCS_PNK, 2) with a small embedding model and only sends the rest to the scoring LLM.",
+        default=False,
+    )
+
+    parser.add_argument(
+        "--reward.prefilter_low_threshold",
+        type=float,
+        help="Prompt similarity below which the relevance prefilter scores content as irrelevant (SM_SCS_PNK, 2).",
+        default=0.1,
+    )
+
+    parser.add_argument(
+        "--reward.prefilter_high_threshold",
+        type=float,
+        help="Prompt similarity above which the relevance prefilter scores content as relevant (SM_SCS_YAL, 9). Off unless set from calibration data.",
+        default=None,
+    )
+
+    parser.add_argument(
+        "--reward.prefilter_calibration_path",
+        type=str,
+        help="When set, the relevance prefilter scores everything with the LLM and appends similarities and scores to this file for calibration.",
+        default=None,
+    )
+
+    parser.add_argument(
+        "--reward.twitter_fetch_budget",
+        type=int,
+        help="Maximum number of Twitter links verified per round. 0 verifies just enough links to check 5 links of every response.",
+        default=0,
+    )
+
+    parser.add_argument(
+        "--reward.search_fetch_budget",
+        type=int,
+        help="Maximum number of search links verified per round. 0 verifies just enough links to check 3 links of every response.",
+        default=0,
+    )
+
+    parser.add_argument(
+        "--reward.tweet_verifier",
+        type=str,
+        choices=["apify", "twitter_v2"],
+        help="How the tweets of miner links are fetched for verification: apify runs the tweet scraper actor, twitter_v2 uses the Twitter API v2 tweet lookup with TWITTER_BEARER_TOKEN.",
+        default="apify",
+    )
+
+    parser.add_argument(
+        "--reward.twitter_api_base_url",
+        type=str,
+        help="Base URL of the Twitter API v2 used by the twitter_v2 tweet verifier.",
+        default="https://api.twitter.com/2",
+    )
+
+    parser.add_argument(
+        "--reward.web_metadata_backend",
+        type=str,
+        choices=["apify", "local"],
+        help="How the title and description of search links are read: apify runs the Cheerio crawler actor, local fetches the page heads from this machine.",
+        default="apify",
+    )
+
+    parser.add_argument(
+        "--reward.apify_lookup_window",
+        type=float,
+        help="Seconds tweet and page lookups from concurrent rounds are collected before they are sent as one Apify run.",
+        default=1.0,
+    )
+
+    parser.add_argument(
+        "--reward.disable_tweet_cache",
+        action="store_true",
+        help="Disables the cache of verified tweets, every round fetches its tweets from the scraper.",
+        default=False,
+    )
+
+    parser.add_argument(
+        "--reward.tweet_cache_negative_ttl",
+        type=float,
+        help="Seconds a tweet the scraper could not find is remembered as missing.",
+        default=3600,
+    )
+
+    parser.add_argument(
+        "--reward.disable_score_cache",
+        action="store_true",
+        help="Disables the cache of scoring responses stored in the validator directory.",
+        default=False,
+    )
+
+    parser.add_argument(
+        "--reward.score_cache_ttl",
+        type=float,
+        help="Seconds a cached scoring response stays valid.",
+        default=7 * 24 * 60 * 60,
+    )
+
+    parser.add_argument(
+        "--reward.score_cache_memory_size",
+        type=int,
+        help="Maximum number of scoring responses kept in memory.",
+        default=10000,
+    )
+
+    parser.add_argument(
+        "--reward.score_cache_disk_size",
+        type=int,
+        help="Maximum number of scoring responses kept on disk.",
+        default=200000,
+    )
+
     parser.add_argument(
         "--neuron.run_random_miner_syn_qs_interval",
         type=int,
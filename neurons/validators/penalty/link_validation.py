@@ -84,8 +84,7 @@ class LinkValidationPenaltyModel(BasePenaltyModel):
         penalties = []
         for response in responses:
             # time.sleep(2)
-            completion = response.completion
-            twitter_links = self.client.utils.find_twitter_links(completion)
+            twitter_links = response.get_extracted_links().twitter_links
             if twitter_links and all(
                 self.is_valid_twitter_link(link) for link in twitter_links
             ):
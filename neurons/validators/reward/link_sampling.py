@@ -0,0 +1,109 @@
+import math
+import random
+from collections import defaultdict
+from typing import List, NamedTuple, Optional
+
+
+class LinkSamplingPlan(NamedTuple):
+    # Links to fetch, in the order they were picked
+    links: List[str]
+    # Number of picked links of each response
+    sampled_counts: List[int]
+    # Fraction of responses with all their required links picked
+    coverage: float
+    # Expected fraction of responses with all their required links verified,
+    # given the chance a fetch succeeds
+    expected_coverage: float
+
+
+def binomial_tail(trials: int, successes: int, probability: float) -> float:
+    """Probability of at least `successes` successes in `trials` trials."""
+    if successes <= 0:
+        return 1.0
+    return sum(
+        math.comb(trials, count)
+        * probability**count
+        * (1 - probability) ** (trials - count)
+        for count in range(successes, trials + 1)
+    )
+
+
+def plan_link_sampling(
+    links_per_response: List[List[str]],
+    per_response: int,
+    budget: Optional[int] = None,
+    success_rate: float = 1.0,
+    rng: random.Random = random,
+) -> LinkSamplingPlan:
+    """
+    Picks the links to verify in a round. Every response needs `per_response` of its
+    links verified (or all of them if it has fewer). Links cited by several
+    responses count for each of them, so they are picked first.
+
+    Each response first gets one random link of its own, so links that few miners
+    cite are still checked and no miner can predict which links are verified. The
+    rest of the budget goes greedily to the link needed by the most responses,
+    breaking ties at random. Without a budget, picking stops once every response
+    has its links.
+    """
+    response_links = [list(dict.fromkeys(links or [])) for links in links_per_response]
+    required = [min(per_response, len(links)) for links in response_links]
+
+    responses_by_link = defaultdict(list)
+    for index, links in enumerate(response_links):
+        for link in links:
+            responses_by_link[link].append(index)
+
+    selected = []
+    selected_set = set()
+    sampled_counts = [0] * len(response_links)
+
+    def select(link):
+        selected.append(link)
+        selected_set.add(link)
+        for index in responses_by_link[link]:
+            sampled_counts[index] += 1
+
+    def has_budget():
+        return budget is None or len(selected) < budget
+
+    # Exploration: one random link per response, in random response order
+    order = list(range(len(response_links)))
+    rng.shuffle(order)
+    for index in order:
+        if not has_budget():
+            break
+        if sampled_counts[index] > 0 or not response_links[index]:
+            continue
+        select(rng.choice(response_links[index]))
+
+    # Greedy: the link needed by the most responses that are still short
+    while has_budget():
+        best_links = []
+        best_gain = 0
+        for link, indexes in responses_by_link.items():
+            if link in selected_set:
+                continue
+            gain = sum(1 for index in indexes if sampled_counts[index] < required[index])
+            if gain > best_gain:
+                best_links, best_gain = [link], gain
+            elif gain == best_gain and gain > 0:
+                best_links.append(link)
+
+        if not best_links:
+            break
+        select(rng.choice(best_links))
+
+    responses = [index for index, count in enumerate(required) if count > 0]
+    if not responses:
+        return LinkSamplingPlan(selected, sampled_counts, 1.0, 1.0)
+
+    coverage = sum(
+        1 for index in responses if sampled_counts[index] >= required[index]
+    ) / len(responses)
+    expected_coverage = sum(
+        binomial_tail(sampled_counts[index], required[index], success_rate)
+        for index in responses
+    ) / len(responses)
+
+    return LinkSamplingPlan(selected, sampled_counts, coverage, expected_coverage)
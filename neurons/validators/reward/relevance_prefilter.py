@@ -0,0 +1,230 @@
+import json
+import asyncio
+import hashlib
+import argparse
+import torch
+import bittensor as bt
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from transformers import AutoTokenizer, AutoModel
+
+EMBEDDING_MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+
+# Score texts returned for items the prefilter decides, parsed by ScoringPrompt.extract_score.
+# They are the lowest and highest codes of the link and search content templates, so
+# prefiltered items score like the LLM would score them
+IRRELEVANT_SCORE_TEXT = "SM_SCS_PNK"
+RELEVANT_SCORE_TEXT = "SM_SCS_YAL"
+
+
+class RelevancePrefilter:
+    """
+    First stage of content relevance scoring. Compares sentence embeddings of the
+    prompt and each tweet or page, scores clearly unrelated content (similarity
+    below `low_threshold`) as irrelevant and sends everything else to the scoring LLM.
+
+    Content restating the prompt is similar to it whether or not it is useful, so
+    scoring content above `high_threshold` as relevant is off unless a calibrated
+    threshold is passed.
+
+    With `calibration_path` set, nothing is decided and the similarity and LLM
+    score of every item are appended to that file, to calibrate the thresholds
+    with `calibrate_thresholds`.
+    """
+
+    def __init__(
+        self,
+        low_threshold: float,
+        high_threshold: Optional[float] = None,
+        device: str = "cpu",
+        model_name: str = EMBEDDING_MODEL_NAME,
+        cache_size: int = 20000,
+        calibration_path: str = None,
+    ):
+        self.low_threshold = low_threshold
+        self.high_threshold = high_threshold
+        self.device = device
+        self.model_name = model_name
+        self.calibration_path = calibration_path
+
+        self.tokenizer = None
+        self.model = None
+        self.model_lock = asyncio.Lock()
+
+        # Embeddings by text hash, prompts and popular tweets repeat across rounds
+        self.embedding_cache = OrderedDict()
+        self.cache_size = cache_size
+
+        self.decided = 0
+        self.escalated = 0
+
+    def init_model(self):
+        self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+        self.model = AutoModel.from_pretrained(self.model_name).to(self.device)
+        self.model.eval()
+
+    def get_cache_key(self, text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def embed(self, texts: List[str]) -> torch.Tensor:
+        """Returns normalized mean-pooled embeddings, computing only uncached texts."""
+        if self.model is None:
+            self.init_model()
+
+        keys = [self.get_cache_key(text) for text in texts]
+        missing = list(
+            OrderedDict(
+                (key, text)
+                for key, text in zip(keys, texts)
+                if key not in self.embedding_cache
+            ).items()
+        )
+
+        if missing:
+            encoded = self.tokenizer(
+                [text for _, text in missing],
+                padding=True,
+                truncation=True,
+                max_length=256,
+                return_tensors="pt",
+            ).to(self.device)
+
+            with torch.no_grad():
+                token_embeddings = self.model(**encoded).last_hidden_state
+
+            mask = encoded["attention_mask"].unsqueeze(-1).to(token_embeddings.dtype)
+            embeddings = (token_embeddings * mask).sum(dim=1) / mask.sum(dim=1).clamp(
+                min=1e-9
+            )
+            embeddings = torch.nn.functional.normalize(embeddings, dim=-1).cpu()
+
+            for (key, _), embedding in zip(missing, embeddings):
+                self.embedding_cache[key] = embedding
+
+        for key in keys:
+            self.embedding_cache.move_to_end(key)
+        result = torch.stack([self.embedding_cache[key] for key in keys])
+
+        while len(self.embedding_cache) > self.cache_size:
+            self.embedding_cache.popitem(last=False)
+
+        return result
+
+    def get_similarities(self, prompt: str, contents: List[str]) -> List[float]:
+        embeddings = self.embed([prompt] + contents)
+        return (embeddings[1:] @ embeddings[0]).tolist()
+
+    async def prefilter(
+        self, prompt: str, contents: Dict[str, str]
+    ) -> Tuple[Dict[str, str], Dict[str, float]]:
+        """
+        Returns the score texts of the items decided by the embedding model and the
+        similarity of every item. Items missing from the first dict need the LLM.
+        """
+        if not contents:
+            return {}, {}
+
+        keys = list(contents.keys())
+        try:
+            async with self.model_lock:
+                loop = asyncio.get_running_loop()
+                similarities = await loop.run_in_executor(
+                    None,
+                    self.get_similarities,
+                    prompt,
+                    [contents[key] for key in keys],
+                )
+        except Exception as e:
+            bt.logging.error(f"Relevance prefilter failed, scoring all items with the LLM: {e}")
+            return {}, {}
+
+        similarities = dict(zip(keys, similarities))
+        if self.calibration_path:
+            return {}, similarities
+
+        decided = {}
+        for key, similarity in similarities.items():
+            if similarity < self.low_threshold:
+                decided[key] = IRRELEVANT_SCORE_TEXT
+            elif self.high_threshold is not None and similarity > self.high_threshold:
+                decided[key] = RELEVANT_SCORE_TEXT
+
+        self.decided += len(decided)
+        self.escalated += len(keys) - len(decided)
+        bt.logging.info(
+            f"Relevance prefilter decided {len(decided)} of {len(keys)} items, "
+            f"{self.decided} of {self.decided + self.escalated} in total."
+        )
+        return decided, similarities
+
+    def record(self, similarities: Dict[str, float], scores: Dict[str, float]):
+        """Appends (similarity, LLM score) pairs to the calibration file."""
+        try:
+            with open(self.calibration_path, "a") as f:
+                for key, similarity in similarities.items():
+                    if key in scores:
+                        f.write(
+                            json.dumps({"similarity": similarity, "score": scores[key]})
+                            + "\n"
+                        )
+        except OSError as e:
+            bt.logging.warning(f"Could not record prefilter calibration data: {e}")
+
+
+def calibrate_thresholds(
+    records: List[dict],
+    tolerance: float = 0.05,
+    low_score: float = 2,
+    high_score: float = 8,
+) -> Tuple[float, float]:
+    """
+    Picks the widest thresholds for which at most `tolerance` of the items below
+    the low threshold have an LLM score above `low_score`, and at most `tolerance`
+    of the items above the high threshold have an LLM score below `high_score`.
+    """
+    ordered = sorted(records, key=lambda record: record["similarity"])
+
+    low_threshold = float("-inf")
+    errors = 0
+    for count, record in enumerate(ordered, start=1):
+        if record["score"] > low_score:
+            errors += 1
+        if errors / count > tolerance:
+            break
+        low_threshold = record["similarity"]
+
+    high_threshold = float("inf")
+    errors = 0
+    for count, record in enumerate(reversed(ordered), start=1):
+        if record["score"] < high_score:
+            errors += 1
+        if errors / count > tolerance:
+            break
+        high_threshold = record["similarity"]
+
+    # Items exactly at a threshold are escalated, so the thresholds sit just past them
+    low_threshold = low_threshold + 1e-6 if low_threshold != float("-inf") else low_threshold
+    high_threshold = high_threshold - 1e-6 if high_threshold != float("inf") else high_threshold
+    return low_threshold, max(high_threshold, low_threshold)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Calibrates prefilter thresholds from --reward.prefilter_calibration_path records."
+    )
+    parser.add_argument("path", type=str)
+    parser.add_argument("--tolerance", type=float, default=0.05)
+    args = parser.parse_args()
+
+    with open(args.path) as f:
+        records = [json.loads(line) for line in f if line.strip()]
+
+    low_threshold, high_threshold = calibrate_thresholds(records, args.tolerance)
+    decided = sum(
+        1
+        for record in records
+        if record["similarity"] < low_threshold or record["similarity"] > high_threshold
+    )
+    print(f"--reward.prefilter_low_threshold {low_threshold:.4f}")
+    print(f"--reward.prefilter_high_threshold {high_threshold:.4f}")
+    print(f"Items decided without the LLM: {decided} of {len(records)}")
@@ -60,10 +60,22 @@ class BaseRewardModel:
         return str(self.name)
 
     @abstractmethod
-    def get_rewards(
-        self, prompt: str, responses: List[ScraperStreamingSynapse], name: str, uids
+    async def get_rewards(
+        self,
+        prompt: str,
+        responses: List[ScraperStreamingSynapse],
+        name: str,
+        uids,
+        eligible: List[bool] = None,
     ) -> Union[torch.FloatTensor, dict]: ...
 
+    def prevalidate(self, responses: List[ScraperStreamingSynapse]) -> List[bool]:
+        """
+        Cheap structural checks run before any fetching or LLM scoring. Responses
+        marked False would score 0 anyway, so their links are not verified.
+        """
+        return [True] * len(responses)
+
     def __init__(self) -> None:
         self.count = 0
         self.mean = 0.0
@@ -137,8 +149,13 @@ class BaseRewardModel:
             return successful_completion.strip()
         return None
 
-    def apply(
-        self, prompt: str, responses: List[ScraperStreamingSynapse], name: str, uids
+    async def apply(
+        self,
+        prompt: str,
+        responses: List[ScraperStreamingSynapse],
+        name: str,
+        uids,
+        eligible: List[bool] = None,
     ) -> Union[torch.FloatTensor, dict]:
         """Applies the reward model across each call. Unsuccessful responses are zeroed."""
         # Get indices of correctly responding calls.
@@ -151,7 +168,7 @@ class BaseRewardModel:
 
         # Reward each completion.
         reward_events = BaseRewardEvent.parse_reward_events(
-            self.get_rewards(prompt, responses, name, uids)
+            await self.get_rewards(prompt, responses, name, uids, eligible)
         )
         successful_rewards = reward_events
         successful_rewards = torch.tensor(
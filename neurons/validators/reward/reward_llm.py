@@ -1,20 +1,29 @@
 from typing import List
 import torch
 import random
-import requests
+import aiohttp
 import os
 import asyncio
 import bittensor as bt
 import re
 import time
+import copy
 from template.utils import call_openai
 from transformers import AutoTokenizer, AutoModelForCausalLM
 from neurons.validators.utils.prompts import (
     extract_score_and_explanation,
 )
 from neurons.validators.utils.prompts import ScoringPrompt
+from neurons.validators.reward.score_cache import ScoreCache
+from neurons.validators.reward.relevance_prefilter import RelevancePrefilter
+from neurons.validators.reward.scoring_backends import (
+    LOGIT_SCORING_BACKENDS,
+    ZEPHYR_MODEL_NAME,
+    create_scoring_pipeline,
+)
 
 from enum import Enum
+from collections import OrderedDict
 import torch
 from transformers import pipeline
 
@@ -23,21 +32,117 @@ os.environ["TOKENIZERS_PARALLELISM"] = "false"
 EXPECTED_ACCESS_KEY = os.environ.get("EXPECTED_ACCESS_KEY", "hello")
 URL_SUBNET_18 = os.environ.get("URL_SUBNET_18")
 
+OPENAI_SCORING_MODEL = "gpt-3.5-turbo-16k"
+
+# The scoring server reports the model tag of its local model in this response header
+SCORING_MODEL_TAG_HEADER = "scoring-model-tag"
+
 
 class ScoringSource(Enum):
     Subnet18 = 1
     OpenAI = 2
     LocalLLM = 3
     LocalZephyr = 4
+    ScoringServer = 5
+
+
+class SourceCircuitBreaker:
+    """
+    Skips a scoring source after repeated failures. Once `reset_timeout` seconds
+    have passed, a single trial request decides whether the source is used again.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 120):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+
+    def allow_request(self) -> bool:
+        if self.opened_at is None:
+            return True
+        if time.time() - self.opened_at >= self.reset_timeout:
+            # Let one trial through, it reopens the breaker if it fails
+            self.opened_at = time.time()
+            return True
+        return False
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+
+    def record_failure(self):
+        self.failures += 1
+        if self.failures >= self.failure_threshold:
+            self.opened_at = time.time()
 
 
 class RewardLLM:
-    def __init__(self):
+    def __init__(
+        self,
+        scoring_batch_size: int = 16,
+        scoring_batch_max_wait: float = 0.05,
+        scoring_mode: str = "generate",
+        score_cache: ScoreCache = None,
+        scoring_source_timeout: float = 60,
+        scoring_deadline: float = 300,
+        scoring_server_url: str = None,
+        relevance_prefilter: RelevancePrefilter = None,
+        scoring_chunk_size: int = 16,
+        enable_subnet_18: bool = False,
+    ):
         self.tokenizer = None
         self.model = None
         self.device = None
         self.pipe = None
+        self.scoring_backend = None
         self.scoring_prompt = ScoringPrompt()
+        # Local models run one batch at a time, concurrent reward models wait here
+        self.local_model_lock = asyncio.Lock()
+
+        # Messages from all reward models and rounds are queued and scored together
+        self.scoring_batch_size = scoring_batch_size
+        self.scoring_batch_max_wait = scoring_batch_max_wait
+        self.scoring_queue = None
+        self.scoring_worker = None
+        # The worker takes several batches worth of waiting messages at once, so they
+        # can be grouped by length and padded less
+        self.scoring_window_size = scoring_batch_size * 4
+
+        # Chat template split around the user content, per system message
+        self.compiled_prompts = {}
+        # Token counts of rendered prompts, used to group batches by length
+        self.prompt_lengths = OrderedDict()
+        self.prompt_lengths_size = 4096
+
+        # generate: sample an answer and parse it, logits: read score code probabilities
+        self.scoring_mode = scoring_mode
+
+        # KV cache of the rendered prompt before the user content, one entry per scoring template
+        self.prefix_cache = OrderedDict()
+        self.prefix_cache_size = 8
+
+        # Optional cache of scoring responses, checked before any scoring source
+        self.score_cache = score_cache
+
+        # Messages are sent to the sources in chunks of scoring_chunk_size. A chunk is
+        # hedged to the next source after scoring_source_timeout and given up after
+        # scoring_deadline seconds
+        self.scoring_source_timeout = scoring_source_timeout
+        self.scoring_deadline = scoring_deadline
+        self.scoring_chunk_size = scoring_chunk_size
+        self.circuit_breakers = {source: SourceCircuitBreaker() for source in ScoringSource}
+        self.scoring_sessions = {}
+        # Model tags reported by remote scoring sources, by source name
+        self.remote_model_tags = {}
+
+        # Shared scoring server holding the local model, used instead of loading it in this process
+        self.scoring_server_url = scoring_server_url
+        # Subnet 18 is only used when explicitly enabled, it was disabled as a default source
+        self.enable_subnet_18 = enable_subnet_18
+
+        # Optional embedding model that scores clearly unrelated content without the LLM
+        self.relevance_prefilter = relevance_prefilter
 
     def init_tokenizer(self, device, model_name):
         # https://huggingface.co/VMware/open-llama-7b-open-instruct
@@ -60,16 +165,47 @@ class RewardLLM:
 
         return tokenizer, model
 
-    def init_pipe_zephyr(self):
-        pipe = pipeline(
-            "text-generation",
-            model="HuggingFaceH4/zephyr-7b-alpha",
-            torch_dtype=torch.bfloat16,
-            device_map="auto",
+    def init_pipe_zephyr(
+        self, backend: str = "hf", gguf_path: str = None, onnx_cache_dir: str = None
+    ):
+        pipe = create_scoring_pipeline(
+            backend=backend, gguf_path=gguf_path, onnx_cache_dir=onnx_cache_dir
         )
+
+        if self.scoring_mode == "logits" and backend not in LOGIT_SCORING_BACKENDS:
+            bt.logging.warning(
+                f"Logit scoring is not supported by the {backend} backend, using generate."
+            )
+            self.scoring_mode = "generate"
+
+        # Batched generation pads on the left, like init_tokenizer
+        tokenizer = pipe.tokenizer
+        if tokenizer.pad_token_id is None:
+            tokenizer.pad_token = tokenizer.eos_token
+        tokenizer.padding_side = "left"
+
         self.pipe = pipe
+        self.scoring_backend = backend
         return pipe
 
+    def get_local_model_tag(self):
+        return f"{ZEPHYR_MODEL_NAME}-{self.scoring_backend}-{self.scoring_mode}"
+
+    def get_model_tag(self, source: ScoringSource):
+        """
+        Identifies the model behind a scoring source for the score cache, or returns
+        None if it is unknown and the scores of the source are not cached.
+        """
+        if source == ScoringSource.LocalZephyr:
+            return self.get_local_model_tag()
+        if source == ScoringSource.ScoringServer:
+            return self.remote_model_tags.get("Scoring server")
+        if source == ScoringSource.OpenAI:
+            return f"openai-{OPENAI_SCORING_MODEL}"
+        if source == ScoringSource.Subnet18:
+            return "subnet-18"
+        return None
+
     def clean_text(self, text):
         # Remove newline characters and replace with a space
         text = text.replace("\n", " ")
@@ -87,45 +223,84 @@ class RewardLLM:
 
         return text
 
-    def call_to_subnet_18_scoring(self, data):
+    def get_scoring_session(self, name, create_connector):
+        # One pooled session per server and event loop keeps connections alive between calls
+        loop = asyncio.get_running_loop()
+        session_loop, session = self.scoring_sessions.get(name, (None, None))
+        if session is None or session.closed or session_loop is not loop:
+            session = aiohttp.ClientSession(
+                connector=create_connector(),
+                timeout=aiohttp.ClientTimeout(total=self.scoring_deadline),
+            )
+            self.scoring_sessions[name] = (loop, session)
+        return session
+
+    async def post_scoring_request(self, name, session, url, data):
         start_time = time.time()  # Start timing for execution
         try:
-            if not URL_SUBNET_18:
-                bt.logging.warning(
-                    "Please set the URL_SUBNET_18 environment variable. See here: https://github.com/surcyf123/smart-scrape/blob/main/docs/env_variables.md"
-                )
-                return None
-
             headers = {
                 "access-key": EXPECTED_ACCESS_KEY,
                 "Content-Type": "application/json",
             }
-            response = requests.post(
-                url=f"{URL_SUBNET_18}/text-validator/",
-                headers=headers,
-                json=data,
-                timeout=10 * 60,  # Timeout after 10 minutes
-            )  # Using json parameter to automatically set the content-type to application/json
-
-            if response.status_code in [401, 403]:
-                bt.logging.error(f"Connection issue with Subnet 18: {response.text}")
-                return {}
-            if response.status_code != 200:
-                bt.logging.error(
-                    f"ERROR connect to Subnet 18: Status code: {response.status_code}"
-                )
-                return None
+            async with session.post(url=url, headers=headers, json=data) as response:
+                if response.status in [401, 403]:
+                    bt.logging.error(
+                        f"Connection issue with {name}: {await response.text()}"
+                    )
+                    return None
+                if response.status != 200:
+                    bt.logging.error(
+                        f"ERROR connect to {name}: Status code: {response.status}"
+                    )
+                    return None
+                result = await response.json()
+                model_tag = response.headers.get(SCORING_MODEL_TAG_HEADER)
+                if model_tag:
+                    self.remote_model_tags[name] = model_tag
+
             execution_time = (
                 time.time() - start_time
             ) / 60  # Calculate execution time in minutes
             bt.logging.info(
-                f"Subnet 18 scoring call execution time: {execution_time:.2f} minutes"
+                f"{name} scoring call execution time: {execution_time:.2f} minutes"
             )
-            return response
+            return result
         except Exception as e:
-            bt.logging.warning(f"Error calling Subnet 18 scoring: {e}")
+            bt.logging.warning(f"Error calling {name} scoring: {e}")
+            return None
+
+    async def call_to_subnet_18_scoring(self, data):
+        if not URL_SUBNET_18:
+            bt.logging.warning(
+                "Please set the URL_SUBNET_18 environment variable. See here: https://github.com/surcyf123/smart-scrape/blob/main/docs/env_variables.md"
+            )
             return None
 
+        session = self.get_scoring_session(
+            "Subnet 18", lambda: aiohttp.TCPConnector(limit=32)
+        )
+        return await self.post_scoring_request(
+            "Subnet 18", session, f"{URL_SUBNET_18}/text-validator/", data
+        )
+
+    async def call_scoring_server(self, data):
+        # unix:/path/to/socket or http://host:port
+        if self.scoring_server_url.startswith("unix:"):
+            socket_path = self.scoring_server_url[len("unix:") :]
+            session = self.get_scoring_session(
+                "Scoring server", lambda: aiohttp.UnixConnector(path=socket_path)
+            )
+            base_url = "http://localhost"
+        else:
+            session = self.get_scoring_session(
+                "Scoring server", lambda: aiohttp.TCPConnector(limit=32)
+            )
+            base_url = self.scoring_server_url.rstrip("/")
+
+        return await self.post_scoring_request(
+            "Scoring server", session, f"{base_url}/text-validator/", data
+        )
+
     async def get_score_by_openai(self, messages):
         try:
             start_time = time.time()  # Start timing for query execution
@@ -138,7 +313,7 @@ class RewardLLM:
                         return await call_openai(
                             messages=message,
                             temperature=0.2,
-                            model="gpt-3.5-turbo-16k",
+                            model=OPENAI_SCORING_MODEL,
                         )
                     except Exception as e:
                         print(f"Error sending message to OpenAI: {e}")
@@ -216,6 +391,60 @@ class RewardLLM:
             return None
         return result
 
+    def render_prompt(self, message_list):
+        """
+        Applies the chat template. The template is rendered once per system message
+        around a placeholder and later prompts are filled in by concatenation.
+        """
+        tokenizer = self.pipe.tokenizer
+        if (
+            len(message_list) != 2
+            or message_list[0].get("role") != "system"
+            or message_list[1].get("role") != "user"
+        ):
+            return tokenizer.apply_chat_template(
+                message_list, tokenize=False, add_generation_prompt=True
+            )
+
+        system_message = message_list[0]["content"]
+        user_content = message_list[1]["content"]
+
+        if system_message not in self.compiled_prompts:
+            placeholder = "\x00USER_CONTENT\x00"
+            rendered = tokenizer.apply_chat_template(
+                [message_list[0], {"role": "user", "content": placeholder}],
+                tokenize=False,
+                add_generation_prompt=True,
+            )
+            compiled = None
+            if rendered.count(placeholder) == 1:
+                compiled = tuple(rendered.split(placeholder))
+                # Templates that transform the content cannot be filled in
+                expected = tokenizer.apply_chat_template(
+                    message_list, tokenize=False, add_generation_prompt=True
+                )
+                if compiled[0] + user_content + compiled[1] != expected:
+                    compiled = None
+            self.compiled_prompts[system_message] = compiled
+
+        compiled = self.compiled_prompts[system_message]
+        if compiled is None:
+            return tokenizer.apply_chat_template(
+                message_list, tokenize=False, add_generation_prompt=True
+            )
+        return compiled[0] + user_content + compiled[1]
+
+    def get_prompt_length(self, prompt):
+        length = self.prompt_lengths.get(prompt)
+        if length is None:
+            length = len(self.pipe.tokenizer(prompt, add_special_tokens=False).input_ids)
+            self.prompt_lengths[prompt] = length
+            if len(self.prompt_lengths) > self.prompt_lengths_size:
+                self.prompt_lengths.popitem(last=False)
+        else:
+            self.prompt_lengths.move_to_end(prompt)
+        return length
+
     def get_score_by_zephyer(self, messages):
         result = {}
         total_start_time = time.time()  # Start timing for total execution
@@ -225,15 +454,19 @@ class RewardLLM:
             keys = []
             for message_dict in messages:  # Iterate over each dictionary in the list
                 ((key, message_list),) = message_dict.items()
-                prompt = self.pipe.tokenizer.apply_chat_template(
-                    message_list, tokenize=False, add_generation_prompt=True
-                )
+                prompt = self.render_prompt(message_list)
                 prompts.append(prompt)
                 keys.append(key)
 
+            # Prompts of similar length are batched together to limit padding
+            order = sorted(
+                range(len(prompts)), key=lambda index: self.get_prompt_length(prompts[index])
+            )
+
             # Process batch
             outputs = self.pipe(
-                prompts,
+                [prompts[index] for index in order],
+                batch_size=self.scoring_batch_size,
                 max_new_tokens=50,
                 do_sample=True,
                 temperature=0.2,
@@ -242,7 +475,7 @@ class RewardLLM:
             )
 
             # Process outputs
-            for key, output in zip(keys, outputs):
+            for key, output in zip([keys[index] for index in order], outputs):
                 generated_text = output[0]["generated_text"]
                 # score_text = extract_score_and_explanation(generated_text)
                 score_text = extract_score_and_explanation(generated_text)
@@ -259,61 +492,511 @@ class RewardLLM:
             return None
         return result
 
-    def get_score_by_source(self, messages, source: ScoringSource):
+    def get_code_probabilities(self, logits, past_key_values, code_ids, depth=0):
+        """
+        Walks the token trie of the score codes from the answer position and
+        returns the probability of each code. Shared prefixes are forwarded once.
+        """
+        model = self.pipe.model
+        log_probs = torch.log_softmax(logits.float(), dim=-1)
+
+        groups = {}
+        for code, ids in code_ids.items():
+            token_id = ids[depth] if depth < len(ids) else None
+            groups.setdefault(token_id, {})[code] = ids
+
+        # The cache is extended in place, so only the last branch reuses it
+        branching = [
+            token_id
+            for token_id, group in groups.items()
+            if token_id is not None and len(group) > 1
+        ]
+
+        probabilities = {}
+        for token_id, group in groups.items():
+            if token_id is None:
+                # Code ended here while longer codes continue
+                for code in group:
+                    probabilities[code] = 1.0
+                continue
+
+            token_probability = log_probs[token_id].exp().item()
+            if len(group) == 1:
+                probabilities[next(iter(group))] = token_probability
+                continue
+
+            past = (
+                past_key_values
+                if token_id == branching[-1]
+                else copy.deepcopy(past_key_values)
+            )
+            outputs = model(
+                input_ids=torch.tensor([[token_id]], device=logits.device),
+                past_key_values=past,
+                use_cache=True,
+            )
+            child_probabilities = self.get_code_probabilities(
+                outputs.logits[0, -1], outputs.past_key_values, group, depth + 1
+            )
+            for code, probability in child_probabilities.items():
+                probabilities[code] = token_probability * probability
+
+        return probabilities
+
+    def get_prefix_cache(self, prompt, user_content, prompt_ids):
+        """
+        Returns the token ids and KV cache of the part of the prompt before the user
+        content. The system message is the same for every message of a template, so
+        it is only forwarded the first time it is seen.
+        """
+        index = prompt.rfind(user_content)
+        if index <= 0:
+            return [], None
+
+        prefix = prompt[:index]
+        if prefix in self.prefix_cache:
+            self.prefix_cache.move_to_end(prefix)
+        else:
+            model = self.pipe.model
+            prefix_ids = self.pipe.tokenizer(prefix, add_special_tokens=False).input_ids
+            outputs = model(
+                input_ids=torch.tensor([prefix_ids], device=model.device),
+                use_cache=True,
+            )
+            self.prefix_cache[prefix] = (prefix_ids, outputs.past_key_values)
+            if len(self.prefix_cache) > self.prefix_cache_size:
+                self.prefix_cache.popitem(last=False)
+
+        prefix_ids, past_key_values = self.prefix_cache[prefix]
+
+        # The prefix is only usable when the full prompt tokenizes to the same ids
+        if prompt_ids[: len(prefix_ids)] != prefix_ids:
+            bt.logging.debug("Scoring prompt prefix does not align, forwarding it fully.")
+            return [], None
+
+        # Legacy tuple caches are never modified, cache objects are extended in place
+        if not isinstance(past_key_values, tuple):
+            past_key_values = copy.deepcopy(past_key_values)
+
+        return prefix_ids, past_key_values
+
+    def get_score_by_logits(self, messages):
+        result = {}
+        total_start_time = time.time()  # Start timing for total execution
+        try:
+            tokenizer = self.pipe.tokenizer
+            model = self.pipe.model
+
+            for message_dict in messages:  # Iterate over each dictionary in the list
+                ((key, message_list),) = message_dict.items()
+                prompt = self.render_prompt(message_list)
+                prompt_ids = tokenizer(prompt, add_special_tokens=False).input_ids
+
+                # Candidate codes are the ones the system message asks for
+                codes = self.scoring_prompt.find_score_codes(
+                    message_list[0]["content"]
+                )
+                if not codes:
+                    result[key] = ""
+                    continue
+
+                # Codes are tokenized after the prompt so the first token merges like it would when generated
+                code_ids = {}
+                for code in codes:
+                    ids = tokenizer(prompt + code, add_special_tokens=False).input_ids
+                    if ids[: len(prompt_ids)] != prompt_ids:
+                        ids = prompt_ids + tokenizer(
+                            code, add_special_tokens=False
+                        ).input_ids
+                    code_ids[code] = ids[len(prompt_ids) :]
+
+                with torch.no_grad():
+                    prefix_ids, past_key_values = self.get_prefix_cache(
+                        prompt, message_list[-1]["content"], prompt_ids
+                    )
+                    outputs = model(
+                        input_ids=torch.tensor(
+                            [prompt_ids[len(prefix_ids) :]], device=model.device
+                        ),
+                        past_key_values=past_key_values,
+                        use_cache=True,
+                    )
+                    probabilities = self.get_code_probabilities(
+                        outputs.logits[0, -1], outputs.past_key_values, code_ids
+                    )
+
+                total_probability = sum(probabilities.values())
+                if total_probability <= 0:
+                    result[key] = ""
+                    continue
+
+                expected_score = (
+                    sum(
+                        probability * self.scoring_prompt.special_scores[code]
+                        for code, probability in probabilities.items()
+                    )
+                    / total_probability
+                )
+                result[key] = f"{expected_score:.4f}"
+
+            total_duration = (
+                time.time() - total_start_time
+            )  # Calculate total execution time
+            bt.logging.info(
+                f"Total execution time for get_score_by_logits: {total_duration} seconds"
+            )
+        except Exception as e:
+            bt.logging.error(f"Error in get_score_by_logits: {e}")
+            return None
+        return result
+
+    async def run_local_scoring(self, scoring_fn, messages, on_start=None):
+        # Runs a blocking model call in a worker thread so the event loop keeps serving
+        async with self.local_model_lock:
+            if on_start is not None:
+                on_start()
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, scoring_fn, messages)
+
+    def ensure_scoring_worker(self):
+        loop = asyncio.get_running_loop()
+        if (
+            self.scoring_worker is None
+            or self.scoring_worker.done()
+            or self.scoring_worker.get_loop() is not loop
+        ):
+            self.scoring_queue = asyncio.Queue()
+            self.scoring_worker = loop.create_task(self.run_scoring_batches())
+
+    async def run_scoring_batches(self):
+        loop = asyncio.get_running_loop()
+
+        while True:
+            # Wait for the first message, then collect more until the batch is full or the deadline passes
+            batch = [await self.scoring_queue.get()]
+            deadline = loop.time() + self.scoring_batch_max_wait
+            while len(batch) < self.scoring_window_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(
+                        await asyncio.wait_for(self.scoring_queue.get(), timeout)
+                    )
+                except asyncio.TimeoutError:
+                    break
+
+            # Keys are only unique per caller, so the batch is keyed by position
+            messages = [
+                {str(index): message_list}
+                for index, (message_list, _, _) in enumerate(batch)
+            ]
+
+            def on_start():
+                for _, _, on_dispatch in batch:
+                    on_dispatch()
+
+            try:
+                bt.logging.debug(f"Scoring batch of {len(messages)} messages.")
+                scoring_fn = (
+                    self.get_score_by_logits
+                    if self.scoring_mode == "logits"
+                    else self.get_score_by_zephyer
+                )
+                result = await self.run_local_scoring(scoring_fn, messages, on_start)
+            except Exception as e:
+                bt.logging.error(f"Error in run_scoring_batches: {e}")
+                result = None
+
+            for index, (_, future, _) in enumerate(batch):
+                if not future.done():
+                    future.set_result((result or {}).get(str(index)))
+
+    async def get_score_by_zephyer_batched(self, messages, dispatched: asyncio.Event = None):
+        """
+        Queues the messages for the scoring worker. `dispatched` is set once the
+        last of them is handed to the local model.
+        """
+        self.ensure_scoring_worker()
+        loop = asyncio.get_running_loop()
+
+        pending = len(messages)
+
+        def on_dispatch():
+            nonlocal pending
+            pending -= 1
+            if pending == 0 and dispatched is not None:
+                dispatched.set()
+
+        keys = []
+        futures = []
+        for message_dict in messages:
+            ((key, message_list),) = message_dict.items()
+            future = loop.create_future()
+            await self.scoring_queue.put((message_list, future, on_dispatch))
+            keys.append(key)
+            futures.append(future)
+
+        score_texts = await asyncio.gather(*futures)
+        if all(score_text is None for score_text in score_texts):
+            return None
+
+        # Unscored messages get an empty text so the next source picks them up
+        return {
+            key: score_text or ""
+            for key, score_text in zip(keys, score_texts)
+        }
+
+    async def get_score_by_source(
+        self, messages, source: ScoringSource, dispatched: asyncio.Event = None
+    ):
+        # Local sources set `dispatched` when the model starts on the messages, the
+        # others when the request is sent
         if source == ScoringSource.LocalZephyr:
-            return self.get_score_by_zephyer(messages)
+            return await self.get_score_by_zephyer_batched(messages, dispatched)
+        if source == ScoringSource.LocalLLM:
+            return await self.run_local_scoring(
+                self.get_score_by_llm,
+                messages,
+                dispatched.set if dispatched is not None else None,
+            )
+        if dispatched is not None:
+            dispatched.set()
+        if source == ScoringSource.ScoringServer:
+            return await self.call_scoring_server(messages)
         if source == ScoringSource.Subnet18:
-            return self.call_to_subnet_18_scoring(messages)
+            return await self.call_to_subnet_18_scoring(messages)
         elif source == ScoringSource.OpenAI:
-            loop = asyncio.get_event_loop_policy().get_event_loop()
-            return loop.run_until_complete(self.get_score_by_openai(messages=messages))
-        else:
-            return self.get_score_by_llm(messages=messages)
+            return await self.get_score_by_openai(messages=messages)
+        raise ValueError(f"Unknown scoring source: {source}")
+
+    async def llm_processing(self, messages):
+        if self.score_cache is None:
+            return await self.score_by_sources(messages)
+
+        keys = [next(iter(message_dict)) for message_dict in messages]
+        # Cached scores of any source that would be asked now are used, in source order
+        model_tags = [
+            model_tag
+            for model_tag in map(self.get_model_tag, self.get_scoring_sources())
+            if model_tag
+        ]
+        # The cache blocks on SQLite, so it runs off the event loop
+        score_responses, missing_messages = await asyncio.to_thread(
+            self.score_cache.lookup, messages, model_tags
+        )
+
+        if missing_messages:
+            start_time = time.time()
+            scored_by = {}
+            missing_score_responses = await self.score_by_sources(
+                missing_messages, scored_by
+            )
+            await asyncio.to_thread(
+                self.score_cache.store,
+                missing_messages,
+                missing_score_responses,
+                time.time() - start_time,
+                {key: self.get_model_tag(source) for key, source in scored_by.items()},
+            )
+            score_responses.update(missing_score_responses)
+
+        self.score_cache.log_metrics()
+
+        # Callers rely on the responses following the order of their messages
+        return {key: score_responses[key] for key in keys if key in score_responses}
+
+    async def content_relevance_processing(
+        self, prompt: str, contents: dict, messages: List[dict]
+    ):
+        """
+        Scores the relevance of tweets or pages to the prompt. `contents` maps each
+        message key to the scored content. With a relevance prefilter, only the
+        items it cannot decide are sent to llm_processing.
+        """
+        if self.relevance_prefilter is None:
+            return await self.llm_processing(messages)
+
+        decided, similarities = await self.relevance_prefilter.prefilter(prompt, contents)
+        remaining_messages = [
+            message_dict
+            for message_dict in messages
+            if next(iter(message_dict)) not in decided
+        ]
 
-    def llm_processing(self, messages):
-        # Initialize score_responses as an empty dictionary to hold the scoring results
         score_responses = {}
+        if remaining_messages:
+            score_responses = await self.llm_processing(remaining_messages) or {}
+
+        if self.relevance_prefilter.calibration_path:
+            self.relevance_prefilter.record(
+                similarities,
+                {
+                    key: self.scoring_prompt.extract_score(score_text)
+                    for key, score_text in score_responses.items()
+                    if self.scoring_prompt.has_score(score_text)
+                },
+            )
 
-        # Define the order of scoring sources to be used
-        scoring_sources = [
-            ScoringSource.LocalZephyr,  # Fallback to Local LLM if Subnet 18 fails or is disabled
-            ScoringSource.OpenAI,  # Final attempt with OpenAI if both Subnet 18 and Local LLM fail
-            # ScoringSource.Subnet18,  # First attempt with Subnet 18
-        ]
+        score_responses.update(decided)
+        return score_responses
+
+    def get_scoring_sources(self):
+        # Sources are tried in this order, skipping the ones that are not set up
+        scoring_sources = []
+        if self.scoring_server_url:
+            scoring_sources.append(ScoringSource.ScoringServer)
+        if self.pipe is not None:
+            scoring_sources.append(ScoringSource.LocalZephyr)
+        scoring_sources.append(ScoringSource.OpenAI)
+        if self.enable_subnet_18 and URL_SUBNET_18:
+            scoring_sources.append(ScoringSource.Subnet18)
+        return scoring_sources
+
+    async def score_with_source(
+        self, messages, source: ScoringSource, dispatched: asyncio.Event = None
+    ):
+        """
+        Returns the responses of `source` for the messages, or None if the source
+        failed. Only failures of the source count against its circuit breaker, a
+        response without a score is a problem of the message. `dispatched` is set
+        once the source starts on the messages, at the latest when it returns.
+        """
+        circuit_breaker = self.circuit_breakers[source]
 
-        # Attempt to score messages using the defined sources in order
-        for source in scoring_sources:
-            # Attempt to score with the current source
-            current_score_responses = self.get_score_by_source(
-                messages=messages, source=source
+        try:
+            score_responses = await self.get_score_by_source(
+                messages=messages, source=source, dispatched=dispatched
             )
-            if current_score_responses:
-                # Update the score_responses with the new scores
-                score_responses.update(current_score_responses)
-
-                # Filter messages that still need scoring (i.e., messages that did not receive a score)
-                messages = [
-                    message
-                    for (key, score_text), message in zip(
-                        current_score_responses.items(), messages
-                    )
-                    if not any(char.isdigit() for char in score_text)
-                ]
-                # messages = [
-                #     message
-                #     for (key, score_text), message in zip(current_score_responses.items(), messages)
-                #     if not any(char.isdigit() for char in score_text) or self.scoring_prompt.extract_score(score_text) == 0
-                # ]
-                # If all messages have been scored, break out of the loop
-                if not messages:
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            bt.logging.debug(f"Scoring with {source} failed: {e}")
+            score_responses = None
+        finally:
+            if dispatched is not None:
+                dispatched.set()
+
+        if score_responses is None:
+            circuit_breaker.record_failure()
+            return None
+
+        circuit_breaker.record_success()
+        return score_responses
+
+    async def score_chunk(self, messages, scoring_sources, scored_by=None):
+        """
+        Scores a chunk of messages, starting a hedged request on the next source
+        with the still unscored messages each time the running ones miss the
+        source timeout. The timeout counts from when the source starts on the
+        chunk, so time queued behind other chunks for the local model does not
+        hedge it. Each message takes the first valid score, and the remaining
+        requests are cancelled once every message is scored. Gives up after the
+        scoring deadline. The source of each score is recorded in `scored_by`.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.scoring_deadline
+        unscored = {next(iter(message_dict)): message_dict for message_dict in messages}
+        score_responses = {}
+        attempts = {}
+        dispatch_waiter = None
+        timed_out = False
+
+        def collect(task, source):
+            for key, score_text in (task.result() or {}).items():
+                if key in unscored and self.scoring_prompt.has_score(score_text):
+                    score_responses[key] = score_text
+                    del unscored[key]
+                    if scored_by is not None:
+                        scored_by[key] = source
+
+        try:
+            for source in scoring_sources:
+                if not unscored or loop.time() >= deadline:
                     break
-                else:
-                    bt.logging.info(
-                        f"{source} Attempt for scoring. Remaining messages: {len(messages)}"
+                if not self.circuit_breakers[source].allow_request():
+                    bt.logging.debug(f"Skipping {source}, circuit breaker is open.")
+                    continue
+
+                dispatched = asyncio.Event()
+                attempts[
+                    asyncio.create_task(
+                        self.score_with_source(
+                            list(unscored.values()), source, dispatched
+                        )
+                    )
+                ] = source
+                dispatch_waiter = asyncio.create_task(dispatched.wait())
+                hedge_at = None
+
+                while attempts and unscored:
+                    if hedge_at is None and dispatched.is_set():
+                        hedge_at = min(
+                            loop.time() + self.scoring_source_timeout, deadline
+                        )
+                    waiting = set(attempts)
+                    if hedge_at is None:
+                        waiting.add(dispatch_waiter)
+                    done, _ = await asyncio.wait(
+                        waiting,
+                        timeout=max((hedge_at or deadline) - loop.time(), 0),
+                        return_when=asyncio.FIRST_COMPLETED,
                     )
-            else:
-                bt.logging.info(
-                    f"Scoring with {source} failed or returned no results. Attempting next source."
+                    if not done:
+                        break
+                    for task in done:
+                        if task in attempts:
+                            collect(task, attempts.pop(task))
+                dispatch_waiter.cancel()
+
+            # Every source was tried, wait for the ones still running
+            while attempts and unscored and loop.time() < deadline:
+                done, _ = await asyncio.wait(
+                    attempts,
+                    timeout=deadline - loop.time(),
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                for task in done:
+                    collect(task, attempts.pop(task))
+
+            timed_out = bool(attempts and unscored)
+        finally:
+            if dispatch_waiter is not None:
+                dispatch_waiter.cancel()
+            # Requests that lost to a faster source are only cancelled, the ones
+            # that ran past the deadline count as failures of their source
+            for task, source in attempts.items():
+                task.cancel()
+                if timed_out:
+                    self.circuit_breakers[source].record_failure()
+
+        return {
+            next(iter(message_dict)): score_responses.get(next(iter(message_dict)), "")
+            for message_dict in messages
+        }
+
+    async def score_by_sources(self, messages, scored_by=None):
+        scoring_sources = self.get_scoring_sources()
+        start_time = time.time()
+
+        chunk_results = await asyncio.gather(
+            *[
+                self.score_chunk(
+                    messages[start : start + self.scoring_chunk_size],
+                    scoring_sources,
+                    scored_by,
                 )
+                for start in range(0, len(messages), self.scoring_chunk_size)
+            ]
+        )
+
+        score_responses = {}
+        for chunk_result in chunk_results:
+            score_responses.update(chunk_result)
+        score_texts = list(score_responses.values())
 
+        unscored_count = sum(1 for score_text in score_texts if not score_text)
+        bt.logging.info(
+            f"Scored {len(messages) - unscored_count}/{len(messages)} messages in {time.time() - start_time:.2f} seconds."
+        )
         return score_responses
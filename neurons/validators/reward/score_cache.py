@@ -0,0 +1,115 @@
+import json
+import hashlib
+import bittensor as bt
+from typing import Dict, List, Optional, Tuple
+from neurons.validators.utils.cache import PersistentLRUCache
+from neurons.validators.utils.prompts import ScoringPrompt
+
+
+class ScoreCache:
+    """
+    Caches scoring responses of RewardLLM. Keys combine the scoring template (hash
+    of the system message), the model tag of the source that scored the messages
+    and a hash of the rendered messages, so a template change never returns stale
+    scores and a score is never reused as the score of a different model.
+    """
+
+    def __init__(self, cache: PersistentLRUCache):
+        self.cache = cache
+        self.scoring_prompt = ScoringPrompt()
+
+        self.hits = 0
+        self.misses = 0
+        self.latency_saved = 0.0
+        # Moving average of the scoring time per message, used to estimate the time saved by hits
+        self.average_latency = 0.0
+
+    def get_key(self, message_list: List[dict], model_tag: str) -> str:
+        system_message = next(
+            (
+                message["content"]
+                for message in message_list
+                if message.get("role") == "system"
+            ),
+            "",
+        )
+        template_id = hashlib.sha256(system_message.encode("utf-8")).hexdigest()[:16]
+        messages_hash = hashlib.sha256(
+            json.dumps(message_list, sort_keys=True).encode("utf-8")
+        ).hexdigest()
+        return f"{template_id}:{model_tag}:{messages_hash}"
+
+    def lookup(
+        self, messages: List[dict], model_tags: List[str]
+    ) -> Tuple[Dict[str, str], List[dict]]:
+        """
+        Splits scoring messages into cached responses and messages still to score.
+        Only scores of the given models are used, the first one cached wins.
+        """
+        cached_responses = {}
+        missing_messages = []
+
+        for message_dict in messages:
+            ((key, message_list),) = message_dict.items()
+            score_text = None
+            for model_tag in model_tags:
+                score_text = self.cache.get(self.get_key(message_list, model_tag))
+                if score_text is not None:
+                    break
+            if score_text is None:
+                missing_messages.append(message_dict)
+            else:
+                cached_responses[key] = score_text
+
+        self.hits += len(cached_responses)
+        self.misses += len(missing_messages)
+        self.latency_saved += len(cached_responses) * self.average_latency
+
+        return cached_responses, missing_messages
+
+    def store(
+        self,
+        messages: List[dict],
+        score_responses: Dict[str, str],
+        duration: float,
+        model_tags: Dict[str, Optional[str]],
+    ):
+        """
+        Stores the responses that contain a score under the model tag of the source
+        that scored them, and updates the latency estimate from the time it took to
+        score `messages`. Responses without a model tag are not stored.
+        """
+        items = {}
+        for message_dict in messages:
+            ((key, message_list),) = message_dict.items()
+            score_text = score_responses.get(key)
+            model_tag = model_tags.get(key)
+            # Failed or unparsable responses are retried next time
+            if model_tag and self.scoring_prompt.has_score(score_text):
+                items[self.get_key(message_list, model_tag)] = score_text
+
+        self.cache.set_many(items)
+
+        if messages:
+            latency = duration / len(messages)
+            self.average_latency = (
+                latency
+                if self.average_latency == 0
+                else 0.9 * self.average_latency + 0.1 * latency
+            )
+
+    def get_metrics(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "score_cache_hits": self.hits,
+            "score_cache_misses": self.misses,
+            "score_cache_hit_rate": self.hits / lookups if lookups else 0.0,
+            "score_cache_latency_saved": self.latency_saved,
+        }
+
+    def log_metrics(self):
+        metrics = self.get_metrics()
+        bt.logging.info(
+            f"Score cache | hits: {metrics['score_cache_hits']}, misses: {metrics['score_cache_misses']}, "
+            f"hit rate: {metrics['score_cache_hit_rate']:.2%}, latency saved: {metrics['score_cache_latency_saved']:.1f} seconds"
+        )
@@ -0,0 +1,155 @@
+import os
+import torch
+import shutil
+import bittensor as bt
+from transformers import (
+    AutoTokenizer,
+    AutoModelForCausalLM,
+    BitsAndBytesConfig,
+    pipeline,
+)
+
+ZEPHYR_MODEL_NAME = "HuggingFaceH4/zephyr-7b-alpha"
+
+# ONNX exports are kept here, one directory per model, so they only run once
+DEFAULT_ONNX_CACHE_DIR = os.path.expanduser("~/.cache/smart-scrape/onnx")
+
+SCORING_BACKENDS = ["hf", "int8", "onnx", "gguf"]
+
+# Backends whose model is a torch module that accepts past_key_values, required by logit scoring
+LOGIT_SCORING_BACKENDS = ["hf", "int8"]
+
+
+class LlamaCppPipeline:
+    """
+    Wraps a llama.cpp GGUF model so it can be called like a transformers
+    text-generation pipeline. The chat template still comes from the Hugging Face
+    tokenizer, so prompts are rendered exactly like the other backends.
+    """
+
+    def __init__(self, model_path: str, model_name: str = ZEPHYR_MODEL_NAME, n_ctx: int = 4096):
+        try:
+            from llama_cpp import Llama
+        except ImportError:
+            raise ImportError(
+                "The gguf scoring backend requires llama-cpp-python: pip install llama-cpp-python"
+            )
+
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+        self.model = None
+        self.llm = Llama(model_path=model_path, n_ctx=n_ctx, verbose=False)
+
+    def __call__(
+        self,
+        prompts,
+        max_new_tokens=50,
+        do_sample=True,
+        temperature=0.2,
+        top_k=50,
+        top_p=0.95,
+        **kwargs,
+    ):
+        outputs = []
+        for prompt in prompts:
+            completion = self.llm(
+                prompt,
+                max_tokens=max_new_tokens,
+                temperature=temperature if do_sample else 0,
+                top_k=top_k,
+                top_p=top_p,
+            )
+            generated_text = prompt + completion["choices"][0]["text"]
+            outputs.append([{"generated_text": generated_text}])
+        return outputs
+
+
+def load_onnx_model(model_name: str, onnx_cache_dir: str = None):
+    """Loads the ONNX export of the model, exporting it to `onnx_cache_dir` the first time."""
+    try:
+        from optimum.onnxruntime import ORTModelForCausalLM
+    except ImportError:
+        raise ImportError(
+            "The onnx scoring backend requires optimum with ONNX Runtime: pip install optimum[onnxruntime]"
+        )
+
+    export_dir = os.path.join(
+        onnx_cache_dir or DEFAULT_ONNX_CACHE_DIR, model_name.replace("/", "--")
+    )
+    if os.path.isfile(os.path.join(export_dir, "config.json")):
+        bt.logging.info(f"Loading the ONNX export of {model_name} from {export_dir}.")
+        return ORTModelForCausalLM.from_pretrained(export_dir)
+
+    bt.logging.info(f"Exporting {model_name} to ONNX in {export_dir}, this only runs once.")
+    model = ORTModelForCausalLM.from_pretrained(model_name, export=True)
+    # Written to a temporary directory first, so an interrupted export is not reused
+    temporary_dir = f"{export_dir}.tmp"
+    model.save_pretrained(temporary_dir)
+    shutil.rmtree(export_dir, ignore_errors=True)
+    os.replace(temporary_dir, export_dir)
+    return model
+
+
+def create_scoring_pipeline(
+    backend: str = "hf",
+    model_name: str = ZEPHYR_MODEL_NAME,
+    gguf_path: str = None,
+    onnx_cache_dir: str = None,
+):
+    """
+    Loads the scoring model with the given backend. Every backend returns an object
+    that is called like a text-generation pipeline and has a `tokenizer`.
+
+    - hf: bfloat16 weights placed by accelerate, the default for GPU hosts
+    - int8: int8 weights, quantized by bitsandbytes while loading on GPU hosts and
+      by dynamic quantization of the linear layers on CPU hosts
+    - onnx: ONNX Runtime export through optimum, exported once to `onnx_cache_dir`, for CPU hosts
+    - gguf: llama.cpp with a quantized GGUF file, for CPU hosts
+    """
+    bt.logging.info(f"Loading scoring model {model_name} with the {backend} backend.")
+
+    if backend == "hf":
+        return pipeline(
+            "text-generation",
+            model=model_name,
+            torch_dtype=torch.bfloat16,
+            device_map="auto",
+        )
+
+    if backend == "int8":
+        tokenizer = AutoTokenizer.from_pretrained(model_name)
+        if torch.cuda.is_available():
+            try:
+                import bitsandbytes  # noqa: F401
+            except ImportError:
+                raise ImportError(
+                    "The int8 scoring backend on GPU hosts requires bitsandbytes: pip install bitsandbytes"
+                )
+
+            model = AutoModelForCausalLM.from_pretrained(
+                model_name,
+                quantization_config=BitsAndBytesConfig(load_in_8bit=True),
+                device_map="auto",
+                low_cpu_mem_usage=True,
+            )
+        else:
+            # bitsandbytes needs CUDA, CPU hosts quantize the linear layers after loading.
+            # low_cpu_mem_usage loads the weights once instead of into a second, random copy
+            model = AutoModelForCausalLM.from_pretrained(
+                model_name, torch_dtype=torch.float32, low_cpu_mem_usage=True
+            )
+            model = torch.quantization.quantize_dynamic(
+                model, {torch.nn.Linear}, dtype=torch.qint8
+            )
+        return pipeline("text-generation", model=model, tokenizer=tokenizer)
+
+    if backend == "onnx":
+        tokenizer = AutoTokenizer.from_pretrained(model_name)
+        model = load_onnx_model(model_name, onnx_cache_dir)
+        return pipeline("text-generation", model=model, tokenizer=tokenizer)
+
+    if backend == "gguf":
+        if not gguf_path:
+            raise ValueError("The gguf scoring backend requires the path of a GGUF model file.")
+        return LlamaCppPipeline(model_path=gguf_path, model_name=model_name)
+
+    raise ValueError(f"Unknown scoring backend: {backend}")
@@ -6,6 +6,9 @@ from template.protocol import ScraperStreamingSynapse, ScraperTextRole
 import traceback
 import bittensor as bt
 from neurons.validators.apify.web_scraper_actor import WebScraperActor
+from neurons.validators.apify.lookup_broker import LookupBroker
+from neurons.validators.utils.page_metadata import PageMetadataFetcher
+from neurons.validators.reward.link_sampling import plan_link_sampling
 import re
 import asyncio
 from neurons.validators.utils.prompts import (
@@ -24,15 +27,37 @@ class WebSearchContentRelevanceModel(BaseRewardModel):
     def name(self) -> str:
         return RewardModelType.search_summary_relevance_match.value
 
-    def __init__(self, device: str, scoring_type: None, llm_reward: RewardLLM):
+    def __init__(
+        self,
+        device: str,
+        scoring_type: None,
+        llm_reward: RewardLLM,
+        lookup_window: float = 1.0,
+        fetch_budget: int = 0,
+        metadata_fetcher: PageMetadataFetcher = None,
+    ):
         super().__init__()
         self.device = device
         self.reward_llm = llm_reward
 
+        # Links verified per round, 0 picks just enough links to cover every response
+        self.fetch_budget = fetch_budget
+        # Moving average of the share of links whose metadata was found
+        self.fetch_success_rate = 1.0
+
+        # Page lookups of concurrent rounds share crawler runs. The local fetcher
+        # has no start-up cost, so its lookups are only merged while in flight.
+        self.metadata_broker = LookupBroker(
+            iterate_items=(metadata_fetcher or WebScraperActor()).iterate_metadata,
+            get_item_key=lambda metadata: metadata.get("url"),
+            window=lookup_window if metadata_fetcher is None else 0,
+        )
+
         self.scoring_type = scoring_type
 
     async def llm_process_validator_links(self, prompt, links_with_metadata):
         scoring_messages = []
+        contents = {}
 
         for link_with_metadata in links_with_metadata:
             url = link_with_metadata.get("url")
@@ -46,35 +71,72 @@ class WebSearchContentRelevanceModel(BaseRewardModel):
             if result:
                 scoring_prompt, scoring_text = result
                 scoring_messages.append({url: scoring_text})
+                contents[url] = content
 
-        score_responses = self.reward_llm.llm_processing(scoring_messages)
+        score_responses = await self.reward_llm.content_relevance_processing(
+            prompt, contents, scoring_messages
+        )
         return score_responses
 
-    async def process_links(
-        self, prompt: str, responses: List[ScraperStreamingSynapse]
-    ):
-        all_links = []
-
+    def prevalidate(self, responses: List[ScraperStreamingSynapse]) -> List[bool]:
+        """Mirrors the checks of check_response_random_link that need no fetched pages."""
+        eligible = []
         for response in responses:
-            links = [
-                link
-                for link in random.sample(
-                    response.search_completion_links,
-                    min(3, len(response.search_completion_links)),
+            try:
+                eligible.append(
+                    bool(
+                        self.get_successful_search_summary_completion(response=response)
+                        and response.search_results
+                        and len(response.search_completion_links) >= 2
+                    )
                 )
-            ]
-
-            all_links.extend(links)
+            except Exception as e:
+                bt.logging.debug(f"WebSearchContentRelevanceModel prevalidate: {e}")
+                eligible.append(False)
+        return eligible
 
-        unique_links = list(set(all_links))
+    async def process_links(
+        self,
+        prompt: str,
+        responses: List[ScraperStreamingSynapse],
+        eligible: List[bool] = None,
+    ):
+        if eligible is None:
+            eligible = [True] * len(responses)
+
+        # Ineligible responses score 0, so their links are not verified
+        sampling_plan = plan_link_sampling(
+            [
+                response.search_completion_links if is_eligible else []
+                for response, is_eligible in zip(responses, eligible)
+            ],
+            per_response=3,
+            budget=self.fetch_budget or None,
+            success_rate=self.fetch_success_rate,
+        )
+        unique_links = sampling_plan.links
 
         if len(unique_links) == 0:
             bt.logging.info("No unique links found to process.")
             return {}
 
-        links_with_metadata = await WebScraperActor().scrape_metadata(urls=unique_links)
+        links_with_metadata = list(
+            (
+                await self.metadata_broker.lookup({url: url for url in unique_links})
+            ).values()
+        )
+        self.fetch_success_rate = (
+            0.9 * self.fetch_success_rate
+            + 0.1 * len(links_with_metadata) / len(unique_links)
+        )
+        bt.logging.info(
+            f"Fetched {len(links_with_metadata)} of {len(unique_links)} search links. "
+            f"Sampling coverage: {sampling_plan.coverage:.0%}, expected verified coverage: {sampling_plan.expected_coverage:.0%}"
+        )
 
-        for response in responses:
+        for response, is_eligible in zip(responses, eligible):
+            if not is_eligible:
+                continue
             for link_with_metadata in links_with_metadata:
                 url = link_with_metadata.get("url")
 
@@ -149,18 +211,27 @@ class WebSearchContentRelevanceModel(BaseRewardModel):
             bt.logging.error(f"Error in Prompt reward method: {str(e)}")
             return None
 
-    def get_rewards(
-        self, prompt: str, responses: List[ScraperStreamingSynapse], name: str, uids
+    async def get_rewards(
+        self,
+        prompt: str,
+        responses: List[ScraperStreamingSynapse],
+        name: str,
+        uids,
+        eligible: List[bool] = None,
     ) -> List[BaseRewardEvent]:
         try:
-            val_score_responses = asyncio.get_event_loop().run_until_complete(
-                self.process_links(prompt=prompt, responses=responses)
+            if eligible is None:
+                eligible = self.prevalidate(responses)
+
+            val_score_responses = await self.process_links(
+                prompt=prompt, responses=responses, eligible=eligible
             )
             bt.logging.info(
                 f"WebSearchContentRelevanceModel | Keys in val_score_responses: {len(val_score_responses.keys()) if val_score_responses else 'No val_score_responses available'}"
             )
             scores = [
-                self.check_response_random_link(response) for response in responses
+                self.check_response_random_link(response) if is_eligible else 0
+                for response, is_eligible in zip(responses, eligible)
             ]
 
             reward_events = []
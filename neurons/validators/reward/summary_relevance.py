@@ -95,8 +95,13 @@ class SummaryRelevanceRewardModel(BaseRewardModel):
             bt.logging.error(f"Summary Relevance get_scoring_text: {str(e)}")
             return None
 
-    def get_rewards(
-        self, prompt: str, responses: List[ScraperStreamingSynapse], name: str, uids
+    async def get_rewards(
+        self,
+        prompt: str,
+        responses: List[ScraperStreamingSynapse],
+        name: str,
+        uids,
+        eligible: List[bool] = None,
     ) -> List[BaseRewardEvent]:
         try:
             completions: List[str] = self.get_successful_twitter_completions(responses)
@@ -135,11 +140,10 @@ class SummaryRelevanceRewardModel(BaseRewardModel):
                 bt.logging.info(
                     f"Executing llm_processing on {len(messages)} summary relevance messages."
                 )
-                score_responses = self.reward_llm.llm_processing(messages)
+                score_responses = await self.reward_llm.llm_processing(messages)
                 if score_responses:
-                    for (key, score_result), (scoring_prompt, _) in zip(
-                        score_responses.items(), filter_scoring_messages
-                    ):
+                    for key, score_result in score_responses.items():
+                        scoring_prompt, _ = scoring_messages[int(key)]
                         score = scoring_prompt.extract_score(score_result)
                         # Scale 0-10 score to 0-1 range.
                         score /= 10.0
@@ -40,14 +40,43 @@ from template.protocol import (
     MinerTweetAuthor,
 )
 from neurons.validators.apify.twitter_scraper_actor import TwitterScraperActor
+from neurons.validators.apify.lookup_broker import LookupBroker
+from neurons.validators.utils.tweet_verifier import ApifyTweetVerifier, TweetVerifier
 from template.services.twitter_api_wrapper import TwitterAPIClient
 from neurons.validators.reward.reward_llm import RewardLLM
+from neurons.validators.reward.link_sampling import plan_link_sampling
+from neurons.validators.utils.tweet_cache import TweetVerificationCache
 from neurons.validators.utils.prompts import ScoringPrompt
 import json
 from datetime import datetime
 import pytz
 from pydantic import ValidationError
 
+URL_PATTERN = re.compile(r"(https?://)?\S+\.\S+\/?(\S+)?")
+LEADING_MENTIONS_PATTERN = re.compile(r"^(@\w+\s*)+")
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+# Validator tweets carry the Apify date format, miner tweets the Twitter API v2 one
+APIFY_DATE_FORMAT = "%a %b %d %H:%M:%S %z %Y"
+
+
+def parse_tweet_timestamp(value: str):
+    """Returns a tweet date in either format as epoch milliseconds, or None."""
+    if not value:
+        return None
+    try:
+        if value.endswith("Z"):
+            value = value[:-1] + "+00:00"
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        try:
+            parsed = datetime.strptime(value, APIFY_DATE_FORMAT)
+        except ValueError:
+            return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=pytz.UTC)
+    return int(parsed.timestamp() * 1000)
+
 
 class TwitterContentRelevanceModel(BaseRewardModel):
     reward_model_name: str = "VMware/open-llama-7b-open-instruct"
@@ -56,10 +85,34 @@ class TwitterContentRelevanceModel(BaseRewardModel):
     def name(self) -> str:
         return RewardModelType.link_content_match.value
 
-    def __init__(self, device: str, scoring_type: None, llm_reward: RewardLLM):
+    def __init__(
+        self,
+        device: str,
+        scoring_type: None,
+        llm_reward: RewardLLM,
+        tweet_cache: TweetVerificationCache = None,
+        lookup_window: float = 1.0,
+        fetch_budget: int = 0,
+        tweet_verifier: TweetVerifier = None,
+    ):
         super().__init__()
         self.device = device
         self.reward_llm = llm_reward
+        self.tweet_cache = tweet_cache
+
+        # Links verified per round, 0 picks just enough links to cover every response
+        self.fetch_budget = fetch_budget
+        # Moving average of the share of links whose tweet was found
+        self.fetch_success_rate = 1.0
+
+        # Tweet lookups of concurrent rounds share verifier calls, and wait for
+        # each other when a call has a start-up cost
+        self.tweet_verifier = tweet_verifier or ApifyTweetVerifier()
+        self.tweet_broker = LookupBroker(
+            iterate_items=self.tweet_verifier.iterate_tweets,
+            get_item_key=lambda tweet: tweet.id,
+            window=lookup_window if self.tweet_verifier.has_startup_cost else 0,
+        )
 
         self.scoring_type = scoring_type
         self.tw_client = TwitterAPIClient()
@@ -67,6 +120,7 @@ class TwitterContentRelevanceModel(BaseRewardModel):
     async def llm_process_validator_tweets(self, prompt, tweets_list):
         start_llm_time = time.time()
         scoring_messages = []
+        contents = {}
         for tweet in tweets_list:
             val_text = tweet.full_text
             val_tweet_id = tweet.id
@@ -76,7 +130,10 @@ class TwitterContentRelevanceModel(BaseRewardModel):
             if result:
                 scoring_prompt, scoring_text = result
                 scoring_messages.append({str(val_tweet_id): scoring_text})
-        score_responses = self.reward_llm.llm_processing(scoring_messages)
+                contents[str(val_tweet_id)] = val_text
+        score_responses = await self.reward_llm.content_relevance_processing(
+            prompt, contents, scoring_messages
+        )
 
         end_llm_time = time.time()
         llm_duration_minutes = (end_llm_time - start_llm_time) / 60
@@ -85,30 +142,127 @@ class TwitterContentRelevanceModel(BaseRewardModel):
         )
         return score_responses
 
-    async def process_tweets(self, prompt, responses):
+    async def get_tweets(self, links: List[str]) -> List[TwitterScraperTweet]:
+        """
+        Fetches the tweets of the links, using the tweet cache when available.
+        Links without a tweet ID cannot be matched to a tweet and are skipped.
+        """
+        links_by_id = {}
+        for link in links:
+            tweet_id = self.tw_client.utils.extract_tweet_id(link)
+            if tweet_id:
+                links_by_id.setdefault(tweet_id, link)
+
+        cached_tweets = {}
+        missing_ids = list(links_by_id)
+        if self.tweet_cache is not None:
+            # The cache blocks on SQLite, so it runs off the event loop
+            cached_tweets, missing_ids = await asyncio.to_thread(
+                self.tweet_cache.lookup, missing_ids
+            )
+
+        fetched_tweets = []
+        if missing_ids:
+            fetched_tweets = list(
+                (
+                    await self.tweet_broker.lookup(
+                        {tweet_id: links_by_id[tweet_id] for tweet_id in missing_ids}
+                    )
+                ).values()
+            )
+
+            if self.tweet_cache is not None:
+                # A failed run also returns no tweets, so only a run that fetched
+                # something confirms the others are missing
+                fetched_ids = {tweet.id for tweet in fetched_tweets}
+                not_found_ids = (
+                    [tweet_id for tweet_id in missing_ids if tweet_id not in fetched_ids]
+                    if fetched_tweets
+                    else []
+                )
+                await asyncio.to_thread(
+                    self.tweet_cache.store, fetched_tweets, not_found_ids
+                )
+
+        bt.logging.info(
+            f"Tweets: {len(cached_tweets)} cached, {len(missing_ids)} sent to the scraper."
+        )
+        return list(cached_tweets.values()) + fetched_tweets
+
+    def prevalidate(self, responses: List[ScraperStreamingSynapse]) -> List[bool]:
+        """Mirrors the checks of check_response_random_tweet that need no fetched tweets."""
+        return [self.is_eligible_response(response) for response in responses]
+
+    def is_eligible_response(self, response: ScraperStreamingSynapse) -> bool:
+        try:
+            if not self.get_successful_twitter_completion(response=response):
+                return False
+
+            if len(response.completion_links) < 2:
+                return False
+
+            miner_tweets = response.miner_tweets or {}
+            miner_tweets_data = miner_tweets.get("data", [])
+            if miner_tweets.get("meta", {}).get("result_count", 0) == 0 or not miner_tweets_data:
+                return False
+
+            # At least one miner tweet must be well formed, with a well formed author
+            users = {
+                user.get("id"): user
+                for user in miner_tweets.get("includes", {}).get("users", [])
+                if isinstance(user, dict)
+            }
+            for miner_tweet in miner_tweets_data:
+                try:
+                    tweet = MinerTweet(**miner_tweet)
+                    MinerTweetAuthor(**users[tweet.author_id])
+                except (ValidationError, KeyError, TypeError):
+                    continue
+                if tweet.text and not re.search(
+                    pattern_to_check, tweet.text, flags=re.IGNORECASE
+                ):
+                    return True
+            return False
+        except Exception as e:
+            bt.logging.debug(f"TwitterContentRelevanceModel prevalidate: {e}")
+            return False
+
+    async def process_tweets(self, prompt, responses, eligible: List[bool] = None):
         try:
             non_fetched_links = {}
             start_time = time.time()
+            if eligible is None:
+                eligible = [True] * len(responses)
+
+            # Ineligible responses score 0, so their links are not verified
             all_links = [
                 link
-                for response in responses
-                if response.completion_links
-                for link in random.sample(
-                    response.completion_links, min(5, len(response.completion_links))
-                )
+                for response, is_eligible in zip(responses, eligible)
+                if is_eligible
+                for link in response.completion_links or []
             ]
-            unique_links = list(
-                set(all_links)
-            )  # Remove duplicates to avoid redundant tasks
+            sampling_plan = plan_link_sampling(
+                [
+                    response.completion_links if is_eligible else []
+                    for response, is_eligible in zip(responses, eligible)
+                ],
+                per_response=5,
+                budget=self.fetch_budget or None,
+                success_rate=self.fetch_success_rate,
+            )
+            unique_links = sampling_plan.links
             if len(unique_links) == 0:
                 bt.logging.info("No unique links found to process.")
                 return
-            tweets_list = await TwitterScraperActor().get_tweets(urls=unique_links)
-            for response in responses:
-                ids = [
-                    self.tw_client.utils.extract_tweet_id(link)
-                    for link in response.completion_links
-                ]
+            tweets_list = await self.get_tweets(unique_links)
+            self.fetch_success_rate = (
+                0.9 * self.fetch_success_rate
+                + 0.1 * min(1.0, len(tweets_list) / len(unique_links))
+            )
+            for response, is_eligible in zip(responses, eligible):
+                if not is_eligible:
+                    continue
+                ids = set(response.get_completion_tweet_ids())
 
                 for tweet in tweets_list:
                     if tweet.id in ids:
@@ -124,7 +278,8 @@ class TwitterContentRelevanceModel(BaseRewardModel):
             bt.logging.info(
                 f"Fetched Twitter links method took {end_time - start_time} seconds. "
                 f"All links count: {len(all_links)}, Unique links count: {len(unique_links)}, "
-                f"APIFY fetched tweets links count: {len(tweets_list)}"
+                f"APIFY fetched tweets links count: {len(tweets_list)}, "
+                f"Sampling coverage: {sampling_plan.coverage:.0%}, expected verified coverage: {sampling_plan.expected_coverage:.0%}"
             )
             fetched_tweet_ids = {tweet.id for tweet in tweets_list}
             non_fetched_links = [
@@ -147,11 +302,11 @@ class TwitterContentRelevanceModel(BaseRewardModel):
 
     def format_text_for_match(self, text):
         # url shorteners can cause problems with tweet verification, so remove urls from the text comparison.
-        text = re.sub(r"(https?://)?\S+\.\S+\/?(\S+)?", "", text)
+        text = URL_PATTERN.sub("", text)
         # Some scrapers put the mentions at the front of the text, remove them.
-        text = re.sub(r"^(@\w+\s*)+", "", text)
+        text = LEADING_MENTIONS_PATTERN.sub("", text)
         # And some trim trailing whitespace at the end of newlines, so ignore whitespace.
-        text = re.sub(r"\s+", "", text)
+        text = WHITESPACE_PATTERN.sub("", text)
         # And some have special characters escaped as html entities
         text = html.unescape(text)
         # The validator apify actor uses the tweet.text field and not the note_tweet field (> 280) charts, so only
@@ -159,7 +314,25 @@ class TwitterContentRelevanceModel(BaseRewardModel):
         text = text[:280]
         return text
 
-    def check_response_random_tweet(self, response: ScraperStreamingSynapse):
+    def get_validator_tweet_match_key(self, val_tweet, validator_tweet_keys: dict = None):
+        """
+        Returns the normalized text and epoch timestamp of a validator tweet. Many miners
+        cite the same tweets, so keys are kept in `validator_tweet_keys` by tweet ID.
+        """
+        if validator_tweet_keys is not None and val_tweet.id in validator_tweet_keys:
+            return validator_tweet_keys[val_tweet.id]
+
+        key = (
+            self.format_text_for_match(val_tweet.full_text or ""),
+            parse_tweet_timestamp(val_tweet.created_at),
+        )
+        if validator_tweet_keys is not None:
+            validator_tweet_keys[val_tweet.id] = key
+        return key
+
+    def check_response_random_tweet(
+        self, response: ScraperStreamingSynapse, validator_tweet_keys: dict = None
+    ):
         try:
             tweet_score = 0
 
@@ -184,30 +357,29 @@ class TwitterContentRelevanceModel(BaseRewardModel):
                 # Ensure there are at least two twitter links provided by miners and check for the presence of miner and validator tweets
                 return 0
 
-           
+            # Index miner tweets and users once, keeping the first of duplicate IDs
+            miner_tweets_by_id = {}
+            for tweet in miner_tweets_data:
+                miner_tweets_by_id.setdefault(tweet["id"], tweet)
+            miner_users_by_id = {}
+            for user in miner_tweets_users:
+                miner_users_by_id.setdefault(user.get("id"), user)
+
             # Initialize a list to hold scores for each validator tweet
             tweet_scores = []
             # Iterate over all validator tweets instead of selecting a random one
             for val_tweet in response.validator_tweets:
-                # Extract content, ID, and creation time of the validator tweet
-                val_tweet_content = val_tweet.full_text
-                val_tweet_id = val_tweet.id
-                val_tweet_created_at = val_tweet.created_at
-
                 # Find the corresponding miner tweet by ID
-                miner_tweet = next(
-                    (tweet for tweet in miner_tweets_data if tweet["id"] == val_tweet_id),
-                    None,
-                )
+                miner_tweet = miner_tweets_by_id.get(val_tweet.id)
 
                 # Initialize the score for this iteration
                 tweet_score = 0
 
                 if miner_tweet:
-                    if not self.is_valid_miner_tweet(miner_tweet, miner_tweets_users):
+                    if not self.is_valid_miner_tweet(miner_tweet, miner_users_by_id):
                         tweet_scores.append(0)
                         continue
-                    
+
                     miner_tweet_text = miner_tweet["text"]
 
                     if not miner_tweet_text or re.search(
@@ -217,23 +389,22 @@ class TwitterContentRelevanceModel(BaseRewardModel):
                         continue
 
                     # Prepare texts for comparison by normalizing them
+                    validator_text_compared, validator_created_at = (
+                        self.get_validator_tweet_match_key(val_tweet, validator_tweet_keys)
+                    )
                     miner_text_compared = self.format_text_for_match(miner_tweet_text)
-                    validator_text_compared = self.format_text_for_match(val_tweet_content)
 
                     if miner_text_compared == validator_text_compared:
                         tweet_score = 1
                     else:
                         tweet_score = 0
 
-                    converted_val_tweet_created_at = (
-                        datetime.strptime(val_tweet_created_at, "%a %b %d %H:%M:%S %z %Y")
-                        .astimezone(pytz.UTC)
-                        .strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3]
-                        + "Z"
-                    )
-
-                    if not miner_tweet.get("created_at") == converted_val_tweet_created_at:
-                        tweet_score = 0 
+                    if (
+                        validator_created_at is None
+                        or parse_tweet_timestamp(miner_tweet.get("created_at"))
+                        != validator_created_at
+                    ):
+                        tweet_score = 0
 
                 tweet_scores.append(tweet_score)
 
@@ -249,24 +420,14 @@ class TwitterContentRelevanceModel(BaseRewardModel):
             bt.logging.error(f"check_response_random_tweet: {str(e)}")
             return 0
 
-    def is_valid_miner_tweet(self, miner_tweet, miner_tweet_users):
+    def is_valid_miner_tweet(self, miner_tweet, miner_users_by_id: dict):
         try:
             miner_tweet = MinerTweet(**miner_tweet)
         except ValidationError as e:
             bt.logging.error(f"Invalid miner tweet data: {e}")
             return False
 
-        author = (
-            next(
-                (
-                    user
-                    for user in miner_tweet_users
-                    if user.get("id") == miner_tweet.author_id
-                ),
-                None,
-            )
-            or None
-        )
+        author = miner_users_by_id.get(miner_tweet.author_id)
 
         if not author:
             return False
@@ -312,8 +473,13 @@ class TwitterContentRelevanceModel(BaseRewardModel):
             bt.logging.warning("\n".join(tb_str) + error_message)
             return None
 
-    def get_rewards(
-        self, prompt: str, responses: List[bt.Synapse], name: str, uids
+    async def get_rewards(
+        self,
+        prompt: str,
+        responses: List[bt.Synapse],
+        name: str,
+        uids,
+        eligible: List[bool] = None,
     ) -> List[BaseRewardEvent]:
         try:
             completions: List[str] = self.get_successful_twitter_completions(responses)
@@ -324,15 +490,23 @@ class TwitterContentRelevanceModel(BaseRewardModel):
                 f"TwitterContentRelevanceModel | prompt: {repr(prompt[:50])} ... {repr(prompt[-50:])}"
             )
 
-            val_score_responses = asyncio.get_event_loop().run_until_complete(
-                self.process_tweets(prompt=prompt, responses=responses)
+            if eligible is None:
+                eligible = self.prevalidate(responses)
+
+            val_score_responses = await self.process_tweets(
+                prompt=prompt, responses=responses, eligible=eligible
             )
             bt.logging.info(f"TwitterContentRelevanceModel | PROMPT: {prompt}")
             bt.logging.info(
                 f"TwitterContentRelevanceModel | Keys in val_score_responses: {len(val_score_responses.keys()) if val_score_responses else 'No val_score_responses available'}"
             )
+            # Normalized validator tweets, shared by every response citing them
+            validator_tweet_keys = {}
             scores = [
-                self.check_response_random_tweet(response) for response in responses
+                self.check_response_random_tweet(response, validator_tweet_keys)
+                if is_eligible
+                else 0
+                for response, is_eligible in zip(responses, eligible)
             ]
 
             reward_events = []
@@ -0,0 +1,108 @@
+import os
+import argparse
+import uvicorn
+import bittensor as bt
+from fastapi import FastAPI, HTTPException, Request, Response
+from neurons.validators.reward.reward_llm import RewardLLM, SCORING_MODEL_TAG_HEADER
+from neurons.validators.reward.scoring_backends import SCORING_BACKENDS
+
+EXPECTED_ACCESS_KEY = os.environ.get("EXPECTED_ACCESS_KEY", "hello")
+
+app = FastAPI()
+reward_llm: RewardLLM = None
+
+
+@app.post("/text-validator/")
+async def score_messages(request: Request, response: Response, data: list):
+    """
+    Scores messages for validator processes on this machine. Takes the same request
+    as Subnet 18, a list of {key: [system message, user message]} dicts, and returns
+    {key: score text}. Requests from all processes share one model and its batches.
+    The model tag header lets validators cache the scores per model.
+    """
+    access_key = request.headers.get("access-key")
+    if access_key != EXPECTED_ACCESS_KEY:
+        raise HTTPException(status_code=401, detail="Invalid access key")
+
+    response.headers[SCORING_MODEL_TAG_HEADER] = reward_llm.get_local_model_tag()
+    score_responses = await reward_llm.get_score_by_zephyer_batched(data)
+    return score_responses or {}
+
+
+@app.get("/")
+async def health_check():
+    return {"status": "healthy"}
+
+
+def get_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--host", type=str, help="Host to listen on.", default="127.0.0.1"
+    )
+    parser.add_argument("--port", type=int, help="Port to listen on.", default=8010)
+    parser.add_argument(
+        "--uds",
+        type=str,
+        help="Unix socket path to listen on instead of host and port.",
+        default=None,
+    )
+    parser.add_argument(
+        "--scoring_mode",
+        type=str,
+        choices=["generate", "logits"],
+        help="How the scoring model scores, see --reward.scoring_mode of the validator.",
+        default="generate",
+    )
+    parser.add_argument(
+        "--scoring_backend",
+        type=str,
+        choices=SCORING_BACKENDS,
+        help="Runtime used to load the scoring model, see --reward.scoring_backend of the validator.",
+        default="hf",
+    )
+    parser.add_argument(
+        "--gguf_path",
+        type=str,
+        help="Path of the GGUF model file used by the gguf backend.",
+        default=None,
+    )
+    parser.add_argument(
+        "--onnx_cache_dir",
+        type=str,
+        help="Directory where the onnx backend keeps its ONNX export.",
+        default=None,
+    )
+    parser.add_argument(
+        "--scoring_batch_size",
+        type=int,
+        help="Maximum number of messages scored in one batch.",
+        default=32,
+    )
+    parser.add_argument(
+        "--scoring_batch_max_wait",
+        type=float,
+        help="Seconds to wait for more messages before a partial batch is scored.",
+        default=0.05,
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = get_args()
+
+    reward_llm = RewardLLM(
+        scoring_batch_size=args.scoring_batch_size,
+        scoring_batch_max_wait=args.scoring_batch_max_wait,
+        scoring_mode=args.scoring_mode,
+    )
+    reward_llm.init_pipe_zephyr(
+        backend=args.scoring_backend,
+        gguf_path=args.gguf_path,
+        onnx_cache_dir=args.onnx_cache_dir,
+    )
+    bt.logging.info("Scoring model loaded.")
+
+    if args.uds:
+        uvicorn.run(app, uds=args.uds, timeout_keep_alive=300)
+    else:
+        uvicorn.run(app, host=args.host, port=args.port, timeout_keep_alive=300)
@@ -1,3 +1,4 @@
+import os
 import math
 import torch
 import wandb
@@ -5,8 +6,18 @@ import random
 import json
 import bittensor as bt
 from base_validator import AbstractNeuron
-from template.protocol import ScraperStreamingSynapse, TwitterPromptAnalysisResult
-from template.stream import process_async_responses, process_single_response
+from template.protocol import (
+    JSONStreamDecoder,
+    ScraperStreamingSynapse,
+    TwitterPromptAnalysisResult,
+    STREAM_PROTOCOL_VERSION,
+    supported_stream_framings,
+)
+from template.stream import (
+    merge_async_responses,
+    process_async_responses,
+    process_single_response,
+)
 from reward import RewardModelType, RewardScoringType
 from typing import List
 from utils.mock import MockRewardModel
@@ -24,6 +35,12 @@ from neurons.validators.reward.search_content_relevance import (
     WebSearchContentRelevanceModel,
 )
 from neurons.validators.reward.reward_llm import RewardLLM
+from neurons.validators.reward.relevance_prefilter import RelevancePrefilter
+from neurons.validators.reward.score_cache import ScoreCache
+from neurons.validators.utils.cache import PersistentLRUCache
+from neurons.validators.utils.tweet_cache import TweetVerificationCache
+from neurons.validators.utils.page_metadata import PageMetadataFetcher
+from neurons.validators.utils.tweet_verifier import create_tweet_verifier
 from neurons.validators.utils.tasks import TwitterTask
 
 from template.dataset import MockTwitterQuestionsDataset
@@ -32,6 +49,9 @@ from template.utils import save_logs
 from template import QUERY_MINERS
 import asyncio
 
+# Seconds past the dendrite timeout before the default round deadline cuts the remaining streams
+ROUND_DEADLINE_GRACE = 10
+
 
 class ScraperValidator:
     def __init__(self, neuron: AbstractNeuron):
@@ -67,12 +87,83 @@ class ScraperValidator:
             bt.logging.error(message)
             raise Exception(message)
 
-        self.reward_llm = RewardLLM()
+        score_cache = None
+        if not self.neuron.config.reward.disable_score_cache:
+            score_cache = ScoreCache(
+                cache=PersistentLRUCache(
+                    path=os.path.join(
+                        self.neuron.config.neuron.full_path, "score_cache.sqlite"
+                    ),
+                    table="scores",
+                    max_memory_items=self.neuron.config.reward.score_cache_memory_size,
+                    max_disk_items=self.neuron.config.reward.score_cache_disk_size,
+                    ttl=self.neuron.config.reward.score_cache_ttl,
+                ),
+            )
+
+        relevance_prefilter = None
+        if self.neuron.config.reward.relevance_prefilter:
+            relevance_prefilter = RelevancePrefilter(
+                low_threshold=self.neuron.config.reward.prefilter_low_threshold,
+                high_threshold=self.neuron.config.reward.prefilter_high_threshold,
+                device=self.neuron.config.neuron.device,
+                calibration_path=self.neuron.config.reward.prefilter_calibration_path,
+            )
+
+        self.reward_llm = RewardLLM(
+            scoring_batch_size=self.neuron.config.reward.scoring_batch_size,
+            scoring_batch_max_wait=self.neuron.config.reward.scoring_batch_max_wait,
+            scoring_mode=self.neuron.config.reward.scoring_mode,
+            score_cache=score_cache,
+            scoring_source_timeout=self.neuron.config.reward.scoring_source_timeout,
+            scoring_deadline=self.neuron.config.reward.scoring_deadline,
+            scoring_chunk_size=self.neuron.config.reward.scoring_chunk_size,
+            enable_subnet_18=self.neuron.config.reward.enable_subnet_18_scoring,
+            scoring_server_url=self.neuron.config.reward.scoring_server_url,
+            relevance_prefilter=relevance_prefilter,
+        )
         if (
             self.neuron.config.reward.twitter_content_weight > 0
             or self.neuron.config.reward.summary_relevance_weight > 0
         ) and not self.neuron.config.neuron.is_disable_tokenizer_reward:
-            self.reward_llm.init_pipe_zephyr()
+            if self.neuron.config.reward.scoring_server_url:
+                bt.logging.info(
+                    f"Scoring with the shared scoring server at {self.neuron.config.reward.scoring_server_url}"
+                )
+            else:
+                self.reward_llm.init_pipe_zephyr(
+                    backend=self.neuron.config.reward.scoring_backend,
+                    gguf_path=self.neuron.config.reward.scoring_gguf_path,
+                    onnx_cache_dir=self.neuron.config.reward.scoring_onnx_cache_dir,
+                )
+
+        self.tweet_cache = None
+        if not self.neuron.config.reward.disable_tweet_cache:
+            self.tweet_cache = TweetVerificationCache(
+                cache=PersistentLRUCache(
+                    path=os.path.join(
+                        self.neuron.config.neuron.full_path, "tweet_cache.sqlite"
+                    ),
+                    table="tweets",
+                    max_memory_items=20000,
+                    max_disk_items=500000,
+                ),
+                negative_ttl=self.neuron.config.reward.tweet_cache_negative_ttl,
+            )
+
+        metadata_fetcher = None
+        if self.neuron.config.reward.web_metadata_backend == "local":
+            metadata_fetcher = PageMetadataFetcher(
+                cache=PersistentLRUCache(
+                    path=os.path.join(
+                        self.neuron.config.neuron.full_path, "page_cache.sqlite"
+                    ),
+                    table="pages",
+                    max_memory_items=5000,
+                    max_disk_items=100000,
+                    ttl=7 * 24 * 3600,
+                ),
+            )
 
         self.reward_functions = [
             (
@@ -89,6 +180,13 @@ class ScraperValidator:
                     device=self.neuron.config.neuron.device,
                     scoring_type=RewardScoringType.summary_relevance_score_template,
                     llm_reward=self.reward_llm,
+                    tweet_cache=self.tweet_cache,
+                    lookup_window=self.neuron.config.reward.apify_lookup_window,
+                    fetch_budget=self.neuron.config.reward.twitter_fetch_budget,
+                    tweet_verifier=create_tweet_verifier(
+                        self.neuron.config.reward.tweet_verifier,
+                        base_url=self.neuron.config.reward.twitter_api_base_url,
+                    ),
                 )
                 if self.neuron.config.reward.twitter_content_weight > 0
                 else MockRewardModel(RewardModelType.link_content_match.value)
@@ -98,6 +196,9 @@ class ScraperValidator:
                     device=self.neuron.config.neuron.device,
                     scoring_type=RewardScoringType.search_relevance_score_template,
                     llm_reward=self.reward_llm,
+                    lookup_window=self.neuron.config.reward.apify_lookup_window,
+                    fetch_budget=self.neuron.config.reward.search_fetch_budget,
+                    metadata_fetcher=metadata_fetcher,
                 )
                 if self.neuron.config.reward.web_search_relavance_weight > 0
                 else MockRewardModel(
@@ -144,6 +245,8 @@ class ScraperValidator:
             seed=self.seed,
             is_intro_text=is_intro_text,
             tools=tools,
+            stream_framings=supported_stream_framings(),
+            stream_protocol_version=STREAM_PROTOCOL_VERSION,
         )
 
         # Make calls to the network with the prompt.
@@ -157,6 +260,55 @@ class ScraperValidator:
 
         return async_responses, uids, event, start_time
 
+    def create_timeout_synapse(self, prompt, uid, chunks):
+        """
+        Finalizes a miner stream that was cut by a timeout or the round deadline,
+        keeping whatever it streamed so far. Texts, completion and links are built
+        like those of a finished stream, so reward models see the same shape.
+        """
+        axon = self.neuron.metagraph.axons[uid]
+        synapse = ScraperStreamingSynapse(
+            messages=prompt,
+            model=self.model,
+            seed=self.seed,
+            dendrite=bt.TerminalInfo(
+                status_code=408,
+                status_message="Stream cancelled by timeout or round deadline.",
+            ),
+            axon=bt.TerminalInfo(ip=axon.ip, port=axon.port, hotkey=axon.hotkey),
+        )
+
+        decoder = JSONStreamDecoder(source=f"UID: {uid};")
+        streamed_texts = {}
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode("utf-8")
+            for json_data in decoder.feed(chunk):
+                content_type = json_data.get("type")
+                if content_type == "text":
+                    streamed_texts.setdefault(json_data.get("role"), []).append(
+                        json_data.get("content", "")
+                    )
+                elif content_type == "tweets":
+                    synapse.miner_tweets = json_data.get("content", {})
+                elif content_type == "search":
+                    synapse.search_results = json_data.get("content", {})
+
+        synapse.rebuild_texts(streamed_texts, None, decoder.source)
+
+        extracted_links = synapse.get_extracted_links()
+        synapse.completion_links = extracted_links.twitter_links
+        synapse.search_completion_links = extracted_links.search_links
+        return synapse
+
+    def get_round_deadline(self):
+        # Without a configured deadline, streams are not cut before the dendrite times out.
+        # A configured deadline is used as is, also below the dendrite timeout
+        round_deadline = self.neuron.config.neuron.round_deadline
+        if round_deadline is None:
+            return self.timeout + ROUND_DEADLINE_GRACE
+        return round_deadline
+
     async def compute_rewards_and_penalties(
         self, event, prompt, task, responses, uids, start_time
     ):
@@ -170,23 +322,45 @@ class ScraperValidator:
             rewards = torch.zeros(len(responses), dtype=torch.float32).to(
                 self.neuron.config.neuron.device
             )
-            for weight_i, reward_fn_i in zip(
-                self.reward_weights, self.reward_functions
-            ):
-                start_time = time.time()
-                reward_i_normalized, reward_event = reward_fn_i.apply(
-                    task.base_text, responses, task.task_name, uids
+            # Cheap checks first, so fetching and LLM scoring skip responses that would score 0
+            eligible_per_reward = []
+            for reward_fn_i in self.reward_functions:
+                eligible = reward_fn_i.prevalidate(responses)
+                eligible_per_reward.append(eligible)
+                bt.logging.info(
+                    f"Pre-validation: {sum(eligible)} of {len(responses)} responses eligible for {reward_fn_i.name}"
+                )
+
+            async def apply_reward_function(reward_fn_i, eligible):
+                reward_start_time = time.time()
+                result = await reward_fn_i.apply(
+                    task.base_text, responses, task.task_name, uids, eligible
                 )
+                execution_time = time.time() - reward_start_time
+                bt.logging.info(
+                    f"Applied reward function: {reward_fn_i.name} in {execution_time / 60:.2f} minutes"
+                )
+                return result
+
+            # Reward models fetch and score independently, so they run concurrently
+            reward_results = await asyncio.gather(
+                *[
+                    apply_reward_function(reward_fn_i, eligible)
+                    for reward_fn_i, eligible in zip(
+                        self.reward_functions, eligible_per_reward
+                    )
+                ]
+            )
+
+            for weight_i, reward_fn_i, (reward_i_normalized, reward_event) in zip(
+                self.reward_weights, self.reward_functions, reward_results
+            ):
                 rewards += weight_i * reward_i_normalized.to(
                     self.neuron.config.neuron.device
                 )
                 if not self.neuron.config.neuron.disable_log_rewards:
                     event = {**event, **reward_event}
-                execution_time = time.time() - start_time
                 bt.logging.trace(str(reward_fn_i.name), reward_i_normalized.tolist())
-                bt.logging.info(
-                    f"Applied reward function: {reward_fn_i.name} in {execution_time / 60:.2f} minutes"
-                )
 
             for penalty_fn_i in self.penalty_functions:
                 raw_penalty_i, adjusted_penalty_i, applied_penalty_i = (
@@ -204,6 +378,11 @@ class ScraperValidator:
                     f"Applied penalty function: {penalty_fn_i.name} in {penalty_execution_time:.2f} seconds"
                 )
 
+            if self.reward_llm.score_cache is not None:
+                event.update(self.reward_llm.score_cache.get_metrics())
+            if self.tweet_cache is not None:
+                event.update(self.tweet_cache.get_metrics())
+
             scattered_rewards = self.neuron.update_moving_averaged_scores(uids, rewards)
             self.log_event(
                 task, event, start_time, uids, rewards, prompt=task.compose_prompt()
@@ -317,7 +496,15 @@ class ScraperValidator:
             )
 
             final_synapses = []
-            async for value in process_async_responses(async_responses):
+            async for value in process_async_responses(
+                async_responses,
+                idle_timeout=self.neuron.config.neuron.stream_idle_timeout,
+                first_chunk_timeout=self.neuron.config.neuron.stream_first_chunk_timeout,
+                round_timeout=self.get_round_deadline(),
+                on_timeout=lambda index, chunks: self.create_timeout_synapse(
+                    prompt=task.compose_prompt(), uid=int(uids[index]), chunks=chunks
+                ),
+            ):
                 if isinstance(value, bt.Synapse):
                     final_synapses.append(value)
                 else:
@@ -359,13 +546,24 @@ class ScraperValidator:
                 is_intro_text=True,
                 tools=tools,
             )
-            final_synapses = []
-            for response in async_responses:
-                async for value in response:
-                    if isinstance(value, bt.Synapse):
-                        final_synapses.append(value)
-                    else:
-                        yield value
+            uid_list = [int(uid) for uid in uids]
+            final_synapses_by_uid = {}
+            chunks_by_uid = {uid: [] for uid in uid_list}
+            async for value in self.multiplex_organic_responses(
+                async_responses, uid_list, final_synapses_by_uid, chunks_by_uid
+            ):
+                yield value
+
+            # Miners that failed without a final synapse are scored as timed out,
+            # so responses stay aligned with uids
+            final_synapses = [
+                final_synapses_by_uid[uid]
+                if uid in final_synapses_by_uid
+                else self.create_timeout_synapse(
+                    prompt=task.compose_prompt(), uid=uid, chunks=chunks_by_uid[uid]
+                )
+                for uid in uid_list
+            ]
 
             async def process_and_score_responses():
                 await self.compute_rewards_and_penalties(
@@ -382,6 +580,54 @@ class ScraperValidator:
             bt.logging.error(f"Error in organic: {e}")
             raise e
 
+    async def multiplex_organic_responses(
+        self, async_responses, uids, final_synapses_by_uid, chunks_by_uid=None
+    ):
+        """
+        Streams miner chunks to the organic client according to the configured
+        policy while collecting every miner's final synapse for scoring.
+
+        - first: forwards only the miner that sends the first chunk
+        - interleave: forwards chunks from every miner as they arrive
+        - best: waits for all miners and replays the longest successful completion
+        """
+        policy = self.neuron.config.neuron.organic_stream_policy
+        streaming_uid = None
+        buffered_chunks = {uid: [] for uid in uids}
+
+        async for uid, value in merge_async_responses(async_responses, uids):
+            if isinstance(value, bt.Synapse):
+                final_synapses_by_uid[uid] = value
+                continue
+
+            if chunks_by_uid is not None:
+                chunks_by_uid.setdefault(uid, []).append(value)
+
+            if policy == "interleave":
+                yield value
+            elif policy == "best":
+                buffered_chunks[uid].append(value)
+            else:
+                if streaming_uid is None:
+                    streaming_uid = uid
+                    bt.logging.debug(f"Organic response streamed from UID: {uid}")
+                if uid == streaming_uid:
+                    yield value
+
+        if policy == "best":
+            best_uid = max(
+                uids,
+                key=lambda uid: (
+                    uid in final_synapses_by_uid
+                    and not final_synapses_by_uid[uid].is_failure,
+                    len(getattr(final_synapses_by_uid.get(uid), "completion", None) or ""),
+                ),
+                default=None,
+            )
+            bt.logging.debug(f"Organic response replayed from UID: {best_uid}")
+            for value in buffered_chunks.get(best_uid, []):
+                yield value
+
     async def organic_specified(self, query, specified_uids=None):
         try:
             prompt = query["content"]
@@ -410,7 +656,15 @@ class ScraperValidator:
             
 
             final_synapses = []
-            async for value in  process_async_responses(async_responses):
+            async for value in process_async_responses(
+                async_responses,
+                idle_timeout=self.neuron.config.neuron.stream_idle_timeout,
+                first_chunk_timeout=self.neuron.config.neuron.stream_first_chunk_timeout,
+                round_timeout=self.get_round_deadline(),
+                on_timeout=lambda index, chunks: self.create_timeout_synapse(
+                    prompt=task.compose_prompt(), uid=int(uids[index]), chunks=chunks
+                ),
+            ):
                 if isinstance(value, bt.Synapse):
                     final_synapses.append(value)
                 else:
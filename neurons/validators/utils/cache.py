@@ -0,0 +1,205 @@
+import json
+import time
+import sqlite3
+import threading
+import bittensor as bt
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+
+class PersistentLRUCache:
+    """
+    Two-tier key/value cache: an in-memory LRU in front of an optional SQLite table.
+    Values must be JSON serializable. Entries older than `ttl` seconds are treated
+    as missing, and each tier drops its least recently used entries past its size.
+
+    Reads never leave a write transaction open, since other processes may share the
+    file: access times of disk hits are buffered and written with the next `set_many`,
+    or once `max_pending_accesses` of them are waiting. Calls block on SQLite, so
+    async callers run them in a thread.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        table: str = "cache",
+        max_memory_items: int = 10000,
+        max_disk_items: int = 100000,
+        ttl: Optional[float] = None,
+        max_pending_accesses: int = 256,
+    ):
+        self.path = path
+        self.table = table
+        self.max_memory_items = max_memory_items
+        self.max_disk_items = max_disk_items
+        self.ttl = ttl
+        self.max_pending_accesses = max_pending_accesses
+
+        self.memory = OrderedDict()
+        # Access times of disk hits not written yet
+        self.pending_accesses: Dict[str, float] = {}
+        self.lock = threading.Lock()
+        self.connection = None
+        self.writes_since_trim = 0
+
+        if path:
+            try:
+                self.connection = sqlite3.connect(path, check_same_thread=False)
+                self.connection.execute("PRAGMA journal_mode=WAL")
+                self.connection.execute("PRAGMA synchronous=NORMAL")
+                self.connection.execute(
+                    f"CREATE TABLE IF NOT EXISTS {table} "
+                    "(key TEXT PRIMARY KEY, value TEXT, created_at REAL, accessed_at REAL)"
+                )
+                self.connection.execute(
+                    f"CREATE INDEX IF NOT EXISTS {table}_accessed_at ON {table} (accessed_at)"
+                )
+                self.connection.commit()
+            except sqlite3.Error as e:
+                bt.logging.warning(f"Cache {path} unavailable, using memory only: {e}")
+                self.connection = None
+
+    def is_expired(self, created_at: float, now: float) -> bool:
+        return self.ttl is not None and now - created_at > self.ttl
+
+    def get(self, key: str) -> Optional[Any]:
+        now = time.time()
+
+        with self.lock:
+            entry = self.memory.get(key)
+            if entry is not None:
+                value, created_at = entry
+                if not self.is_expired(created_at, now):
+                    self.memory.move_to_end(key)
+                    return value
+                del self.memory[key]
+
+            if self.connection is None:
+                return None
+
+            try:
+                row = self.connection.execute(
+                    f"SELECT value, created_at FROM {self.table} WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    return None
+
+                value, created_at = json.loads(row[0]), row[1]
+                if self.is_expired(created_at, now):
+                    return None
+            except sqlite3.Error as e:
+                bt.logging.debug(f"Cache read failed for {key}: {e}")
+                return None
+
+            self.pending_accesses[key] = now
+            if len(self.pending_accesses) >= self.max_pending_accesses:
+                try:
+                    self.write_pending_accesses()
+                    self.connection.commit()
+                except sqlite3.Error as e:
+                    bt.logging.debug(f"Cache access time update failed: {e}")
+                    self.rollback()
+
+            self.set_memory(key, value, created_at)
+            return value
+
+    def set(self, key: str, value: Any):
+        self.set_many({key: value})
+
+    def set_many(self, items: dict):
+        """Stores every item, writing them to disk in a single transaction."""
+        now = time.time()
+
+        with self.lock:
+            for key, value in items.items():
+                self.set_memory(key, value, now)
+
+            if self.connection is None or not items:
+                return
+
+            try:
+                self.write_pending_accesses()
+                self.connection.executemany(
+                    f"INSERT OR REPLACE INTO {self.table} (key, value, created_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    [(key, json.dumps(value), now, now) for key, value in items.items()],
+                )
+                self.writes_since_trim += len(items)
+                # Trimming scans the table, so it only runs every few hundred writes
+                if self.writes_since_trim >= 256:
+                    self.trim_disk(now)
+                self.connection.commit()
+            except sqlite3.Error as e:
+                bt.logging.debug(f"Cache write failed: {e}")
+                self.rollback()
+
+    def rollback(self):
+        # A failed write must not keep the database locked for other processes
+        try:
+            self.connection.rollback()
+        except sqlite3.Error as e:
+            bt.logging.debug(f"Cache rollback failed: {e}")
+
+    def write_pending_accesses(self):
+        """Writes the buffered access times, the caller commits."""
+        if not self.pending_accesses:
+            return
+
+        accesses, self.pending_accesses = self.pending_accesses, {}
+        self.connection.executemany(
+            f"UPDATE {self.table} SET accessed_at = ? WHERE key = ?",
+            [(accessed_at, key) for key, accessed_at in accesses.items()],
+        )
+
+    def set_memory(self, key: str, value: Any, created_at: float):
+        self.memory[key] = (value, created_at)
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.max_memory_items:
+            self.memory.popitem(last=False)
+
+    def trim_disk(self, now: float):
+        self.writes_since_trim = 0
+
+        if self.ttl is not None:
+            self.connection.execute(
+                f"DELETE FROM {self.table} WHERE created_at < ?", (now - self.ttl,)
+            )
+
+        self.connection.execute(
+            f"DELETE FROM {self.table} WHERE key IN ("
+            f"SELECT key FROM {self.table} ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_disk_items,),
+        )
+
+    def keys(self) -> List[str]:
+        """Returns the keys of every stored entry, including expired ones."""
+        with self.lock:
+            if self.connection is None:
+                return list(self.memory.keys())
+            try:
+                return [
+                    row[0]
+                    for row in self.connection.execute(f"SELECT key FROM {self.table}")
+                ]
+            except sqlite3.Error as e:
+                bt.logging.debug(f"Cache key listing failed: {e}")
+                return list(self.memory.keys())
+
+    def __len__(self):
+        with self.lock:
+            if self.connection is None:
+                return len(self.memory)
+            return self.connection.execute(
+                f"SELECT COUNT(*) FROM {self.table}"
+            ).fetchone()[0]
+
+    def close(self):
+        with self.lock:
+            if self.connection is not None:
+                try:
+                    self.write_pending_accesses()
+                except sqlite3.Error as e:
+                    bt.logging.debug(f"Cache access time update failed: {e}")
+                self.connection.commit()
+                self.connection.close()
+                self.connection = None
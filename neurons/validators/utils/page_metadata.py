@@ -0,0 +1,279 @@
+import re
+import codecs
+import socket
+import asyncio
+import aiohttp
+import ipaddress
+import bittensor as bt
+from yarl import URL
+from html.parser import HTMLParser
+from urllib.parse import urlsplit
+from aiohttp.abc import AbstractResolver
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+from neurons.validators.utils.cache import PersistentLRUCache
+
+REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+NUMERIC_HOST_PATTERN = re.compile(r"[0-9.]+|.*:.*")
+
+
+def is_public_address(address: str) -> bool:
+    """
+    Whether an IP address is publicly routable. Loopback, private, link-local
+    (cloud metadata), shared, reserved and multicast addresses are not.
+    """
+    try:
+        ip = ipaddress.ip_address(address.split("%")[0])
+    except ValueError:
+        return False
+    if ip.version == 6 and ip.ipv4_mapped is not None:
+        ip = ip.ipv4_mapped
+    return ip.is_global and not ip.is_multicast
+
+
+class PublicAddressResolver(AbstractResolver):
+    """
+    Resolves host names like aiohttp's default resolver, dropping addresses that
+    are not allowed so miner URLs cannot reach hosts inside the validator network.
+    """
+
+    def __init__(self, is_allowed_address: Callable[[str], bool] = is_public_address):
+        self.resolver = aiohttp.DefaultResolver()
+        self.is_allowed_address = is_allowed_address
+
+    async def resolve(
+        self, host: str, port: int = 0, family: int = socket.AF_INET
+    ) -> List[Dict[str, Any]]:
+        hosts = await self.resolver.resolve(host, port, family)
+        allowed_hosts = [
+            resolved for resolved in hosts if self.is_allowed_address(resolved["host"])
+        ]
+        if not allowed_hosts:
+            raise OSError(f"{host} does not resolve to an allowed address")
+        return allowed_hosts
+
+    async def close(self) -> None:
+        await self.resolver.close()
+
+
+class HeadMetadataParser(HTMLParser):
+    """Reads the title and meta description, and notes when the head has ended."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.title = None
+        self.description = None
+        self.in_title = False
+        self.title_parts = []
+        self.head_ended = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "title" and self.title is None:
+            self.in_title = True
+        elif tag == "meta":
+            attributes = dict(attrs)
+            if (attributes.get("name") or "").lower() == "description":
+                if self.description is None:
+                    self.description = attributes.get("content")
+        elif tag == "body":
+            self.head_ended = True
+
+    def handle_endtag(self, tag):
+        if tag == "title" and self.in_title:
+            self.in_title = False
+            self.title = "".join(self.title_parts).strip()
+        elif tag == "head":
+            self.head_ended = True
+
+    def handle_data(self, data):
+        if self.in_title:
+            self.title_parts.append(data)
+
+
+class PageMetadataFetcher:
+    """
+    Reads the title and meta description of pages with a pooled HTTP client, as a
+    local alternative to WebScraperActor with the same result shape. Responses are
+    read only until the end of `<head>`, each host gets at most
+    `per_host_limit` concurrent requests, and pages in `cache` are revalidated
+    with ETag / Last-Modified instead of downloaded again.
+
+    URLs come from miners, so only http(s) is fetched, and every request, including
+    each redirect hop, must go to an address `is_allowed_address` accepts.
+    """
+
+    def __init__(
+        self,
+        cache: Optional[PersistentLRUCache] = None,
+        per_host_limit: int = 4,
+        total_limit: int = 100,
+        timeout: float = 10,
+        max_head_bytes: int = 512 * 1024,
+        chunk_size: int = 8192,
+        max_redirects: int = 5,
+        is_allowed_address: Callable[[str], bool] = is_public_address,
+    ):
+        self.cache = cache
+        self.per_host_limit = per_host_limit
+        self.total_limit = total_limit
+        self.timeout = timeout
+        self.max_head_bytes = max_head_bytes
+        self.chunk_size = chunk_size
+        self.max_redirects = max_redirects
+        self.is_allowed_address = is_allowed_address
+
+        self.session = None
+        self.session_loop = None
+        self.host_semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    def get_session(self) -> aiohttp.ClientSession:
+        # One pooled session per event loop keeps connections alive between rounds
+        loop = asyncio.get_running_loop()
+        if self.session is None or self.session.closed or self.session_loop is not loop:
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.total_limit,
+                    ttl_dns_cache=300,
+                    resolver=PublicAddressResolver(self.is_allowed_address),
+                ),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers={
+                    "User-Agent": "Mozilla/5.0 (compatible; smart-scrape-validator)",
+                    "Accept": "text/html,application/xhtml+xml",
+                },
+            )
+            self.session_loop = loop
+            self.host_semaphores = {}
+        return self.session
+
+    def get_host_semaphore(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc.lower()
+        if host not in self.host_semaphores:
+            self.host_semaphores[host] = asyncio.Semaphore(self.per_host_limit)
+        return self.host_semaphores[host]
+
+    def is_allowed_url(self, url: URL) -> bool:
+        # Host names are checked by the resolver, IP literals never reach it
+        if url.scheme not in ("http", "https") or not url.host:
+            return False
+        try:
+            ipaddress.ip_address(url.host)
+        except ValueError:
+            # Other numeric forms, like 127.000.000.001, are not valid host names either
+            return not NUMERIC_HOST_PATTERN.fullmatch(url.host)
+        return self.is_allowed_address(url.host)
+
+    async def read_head(self, response: aiohttp.ClientResponse) -> HeadMetadataParser:
+        parser = HeadMetadataParser()
+        try:
+            decoder = codecs.getincrementaldecoder(response.charset or "utf-8")(
+                errors="replace"
+            )
+        except LookupError:
+            decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+        bytes_read = 0
+        async for chunk in response.content.iter_chunked(self.chunk_size):
+            bytes_read += len(chunk)
+            parser.feed(decoder.decode(chunk))
+            if parser.head_ended or bytes_read >= self.max_head_bytes:
+                break
+
+        return parser
+
+    async def fetch_metadata(self, url: str) -> Optional[dict]:
+        # The cache blocks on SQLite, so it runs off the event loop
+        cached = (
+            await asyncio.to_thread(self.cache.get, url)
+            if self.cache is not None
+            else None
+        )
+
+        headers = {}
+        if cached:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+
+        try:
+            async with self.get_host_semaphore(url):
+                request_url = URL(url)
+                # Redirects are followed here, so every hop is checked
+                for _ in range(self.max_redirects + 1):
+                    if not self.is_allowed_url(request_url):
+                        bt.logging.debug(f"Page metadata of {url}: {request_url} is not allowed")
+                        return None
+
+                    async with self.get_session().get(
+                        request_url, headers=headers, allow_redirects=False
+                    ) as response:
+                        if response.status in REDIRECT_STATUSES:
+                            location = response.headers.get("Location")
+                            if not location:
+                                return None
+                            request_url = response.url.join(URL(location))
+                            continue
+
+                        return await self.read_metadata(url, response, cached)
+
+                bt.logging.debug(f"Page metadata of {url}: too many redirects")
+                return None
+        except Exception as e:
+            bt.logging.debug(f"Page metadata of {url} failed: {e}")
+            return None
+
+    async def read_metadata(
+        self, url: str, response: aiohttp.ClientResponse, cached: Optional[dict]
+    ) -> Optional[dict]:
+        if response.status == 304 and cached:
+            return {
+                "title": cached["title"],
+                "description": cached["description"],
+                "url": url,
+            }
+
+        if response.status != 200:
+            bt.logging.debug(f"Page metadata of {url}: status {response.status}")
+            return None
+
+        if "html" not in response.headers.get("Content-Type", "text/html"):
+            return None
+
+        parser = await self.read_head(response)
+        # Closing the connection instead of reading the rest of the body
+        response.close()
+
+        metadata = {
+            "title": parser.title,
+            "description": parser.description,
+            "url": url,
+        }
+
+        if self.cache is not None and (
+            response.headers.get("ETag") or response.headers.get("Last-Modified")
+        ):
+            # The cache blocks on SQLite, so it runs off the event loop
+            await asyncio.to_thread(
+                self.cache.set,
+                url,
+                {
+                    **metadata,
+                    "etag": response.headers.get("ETag"),
+                    "last_modified": response.headers.get("Last-Modified"),
+                },
+            )
+        return metadata
+
+    async def iterate_metadata(self, urls: List[str]) -> AsyncIterator[dict]:
+        """Yields page metadata as each page is read, like WebScraperActor.iterate_metadata."""
+        for task in asyncio.as_completed([self.fetch_metadata(url) for url in urls]):
+            metadata = await task
+            if metadata is not None:
+                yield metadata
+
+    async def scrape_metadata(self, urls: List[str]) -> List[dict]:
+        return [metadata async for metadata in self.iterate_metadata(urls)]
+
+    async def close(self):
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
@@ -18,6 +18,7 @@
 
 import re
 import random
+from functools import lru_cache
 
 
 class BasePrompt:
@@ -29,11 +30,11 @@ class BasePrompt:
 
     def text(self, *args) -> str:
         r"""Sanitize input strings and format prompt template."""
-        sanitized = args
-        tags = find_unique_tags(self.template)
-        for tag in tags:
-            sanitized = [arg.replace(tag, "") for arg in sanitized]
+        tags_pattern = compile_tags_pattern(self.template)
+        if tags_pattern is None:
+            return self.template.format(*args)
 
+        sanitized = [tags_pattern.sub("", arg) for arg in args]
         return self.template.format(*sanitized)
 
     def extract(self, response: str):
@@ -55,6 +56,16 @@ class BasePrompt:
 
 
 class ScoringPrompt(BasePrompt):
+    # Mapping of special codes to numeric scores
+    special_scores = {
+        "SM_SCS_RDD": 0,
+        "SM_SCS_PNK": 2,
+        "SM_SCS_BLE": 5,
+        "SM_SCS_GRY": 8,
+        "SM_SCS_YAL": 9,
+        "SM_SCS_GRN": 10,
+    }
+
     def __init__(self):
         super().__init__()
         self.extract_pattern = r"\b([0-9]|10)\b"
@@ -73,21 +84,19 @@ class ScoringPrompt(BasePrompt):
 
     def extract_score(self, response: str) -> float:
         r"""Extract numeric score (range 0-10) from prompt response."""
-        # Mapping of special codes to numeric scores
-        special_scores = {
-            "SM_SCS_RDD": 0,
-            "SM_SCS_PNK": 2,
-            "SM_SCS_BLE": 5,
-            "SM_SCS_GRY": 8,
-            "SM_SCS_YAL": 9,
-            "SM_SCS_GRN": 10,
-        }
-
         # Check for special codes in the response
-        for code, score in special_scores.items():
+        for code, score in self.special_scores.items():
             if code in response:
                 return score
 
+        # Expected scores from logit scoring are plain numbers
+        try:
+            score = float(response.strip())
+            if 0 <= score <= 10:
+                return score
+        except ValueError:
+            pass
+
         # Original extraction logic
         extraction = self.extract(response)
         if extraction is not None:
@@ -99,6 +108,23 @@ class ScoringPrompt(BasePrompt):
                 return 0
         return 0
 
+    def has_score(self, response: str) -> bool:
+        r"""Checks if a response contains a special code or a number to score from."""
+        if not response:
+            return False
+        return any(code in response for code in self.special_scores) or any(
+            char.isdigit() for char in response
+        )
+
+    def find_score_codes(self, text: str):
+        r"""Returns the special codes mentioned in a scoring template, in order of appearance."""
+        codes = re.findall(r"SM_SCS_[A-Z]{3}", text)
+        return [
+            code
+            for code in dict.fromkeys(codes)
+            if code in self.special_scores
+        ]
+
     @staticmethod
     def mock_response():
         r"""Mock responses to a followup prompt, for use in MockDendritePool."""
@@ -147,6 +173,15 @@ def find_unique_tags(input_text: str):
     return list(set(matches))
 
 
+@lru_cache(maxsize=None)
+def compile_tags_pattern(template: str):
+    r"""Compiles one pattern removing every tag of the template, longest first."""
+    tags = sorted((tag for tag in find_unique_tags(template) if tag), key=len, reverse=True)
+    if not tags:
+        return None
+    return re.compile("|".join(re.escape(tag) for tag in tags))
+
+
 def extract_score_and_explanation(generated_text):
     # Regular expression to find the text after "<|assistant|>".
     explanation_match = re.search(
@@ -0,0 +1,108 @@
+import math
+import time
+import hashlib
+import bittensor as bt
+from typing import Dict, Iterable, List, Tuple
+from template.protocol import TwitterScraperTweet
+from neurons.validators.utils.cache import PersistentLRUCache
+
+
+class BloomFilter:
+    """
+    Set membership with false positives but no false negatives, used to skip
+    cache lookups for tweet IDs that were never stored.
+    """
+
+    def __init__(self, capacity: int = 1000000, error_rate: float = 0.01):
+        self.size = max(
+            8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2))
+        )
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def get_positions(self, key: str):
+        digest = hashlib.sha256(key.encode("utf-8")).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:16], "little") | 1
+        return [(first + index * second) % self.size for index in range(self.hash_count)]
+
+    def add(self, key: str):
+        for position in self.get_positions(key):
+            self.bits[position // 8] |= 1 << (position % 8)
+
+    def __contains__(self, key: str) -> bool:
+        return all(
+            self.bits[position // 8] & (1 << (position % 8))
+            for position in self.get_positions(key)
+        )
+
+
+class TweetVerificationCache:
+    """
+    Tweets fetched for verification, keyed by tweet ID. Tweet text and creation
+    time never change, so fetched tweets are kept until they age out of `cache`.
+    IDs the scraper confirmed missing are kept for `negative_ttl` seconds, since
+    the scraper may also miss tweets that exist.
+    """
+
+    def __init__(self, cache: PersistentLRUCache, negative_ttl: float = 3600):
+        self.cache = cache
+        self.negative_ttl = negative_ttl
+
+        self.bloom_filter = BloomFilter(capacity=max(cache.max_disk_items, 1000))
+        for key in cache.keys():
+            self.bloom_filter.add(key)
+
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(
+        self, tweet_ids: List[str]
+    ) -> Tuple[Dict[str, TwitterScraperTweet], List[str]]:
+        """
+        Returns the cached tweets and the IDs that still have to be fetched. IDs
+        cached as missing are in neither.
+        """
+        now = time.time()
+        tweets = {}
+        missing_ids = []
+
+        for tweet_id in tweet_ids:
+            value = self.cache.get(tweet_id) if tweet_id in self.bloom_filter else None
+
+            if value is None or (
+                value.get("missing") and now - value["checked_at"] > self.negative_ttl
+            ):
+                missing_ids.append(tweet_id)
+                continue
+
+            if not value.get("missing"):
+                try:
+                    tweets[tweet_id] = TwitterScraperTweet(**value["tweet"])
+                except Exception as e:
+                    bt.logging.debug(f"Dropping unreadable cached tweet {tweet_id}: {e}")
+                    missing_ids.append(tweet_id)
+                    continue
+
+        self.misses += len(missing_ids)
+        self.hits += len(tweet_ids) - len(missing_ids)
+        return tweets, missing_ids
+
+    def store(self, tweets: List[TwitterScraperTweet], missing_ids: Iterable[str] = ()):
+        now = time.time()
+        items = {
+            tweet_id: {"missing": True, "checked_at": now} for tweet_id in missing_ids
+        }
+        items.update({tweet.id: {"tweet": tweet.dict()} for tweet in tweets if tweet.id})
+
+        self.cache.set_many(items)
+        for tweet_id in items:
+            self.bloom_filter.add(tweet_id)
+
+    def get_metrics(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "tweet_cache_hits": self.hits,
+            "tweet_cache_misses": self.misses,
+            "tweet_cache_hit_rate": self.hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,206 @@
+import os
+import asyncio
+import aiohttp
+import bittensor as bt
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import AsyncIterator, List, Optional
+from template.protocol import (
+    TwitterScraperMedia,
+    TwitterScraperTweet,
+    TwitterScraperUser,
+)
+from template.services.twitter_utils import TwitterUtils
+
+TWITTER_API_BASE_URL = "https://api.twitter.com/2"
+
+# Dates are compared in the format of the Apify tweet scraper
+APIFY_DATE_FORMAT = "%a %b %d %H:%M:%S %z %Y"
+
+
+class TweetVerifier(ABC):
+    """Fetches the tweets behind miner links so their content can be verified."""
+
+    # Whether each call pays a start-up cost, worth merging lookups of concurrent rounds for
+    has_startup_cost: bool = False
+
+    @abstractmethod
+    def iterate_tweets(self, urls: List[str]) -> AsyncIterator[TwitterScraperTweet]:
+        ...
+
+
+class ApifyTweetVerifier(TweetVerifier):
+    has_startup_cost = True
+
+    def __init__(self):
+        # The actor module requires APIFY_API_KEY, so it is only imported when used
+        from neurons.validators.apify.twitter_scraper_actor import TwitterScraperActor
+
+        self.actor = TwitterScraperActor()
+
+    def iterate_tweets(self, urls: List[str]) -> AsyncIterator[TwitterScraperTweet]:
+        return self.actor.iterate_tweets(urls)
+
+
+def convert_iso_date(value: Optional[str]) -> str:
+    """Converts a Twitter API v2 date, 2024-01-10T12:00:00.000Z, to the Apify format."""
+    if not value:
+        return ""
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).strftime(
+            APIFY_DATE_FORMAT
+        )
+    except ValueError:
+        return ""
+
+
+class TwitterV2TweetVerifier(TweetVerifier):
+    """
+    Looks tweets up with the Twitter API v2 multi-ID endpoint. IDs are sent in
+    requests of up to 100, all running concurrently on one pooled session.
+    """
+
+    fields = {
+        "tweet.fields": "created_at,public_metrics,author_id,referenced_tweets,attachments",
+        "expansions": "author_id,attachments.media_keys",
+        "user.fields": "created_at,description,public_metrics,verified,profile_image_url,username,name",
+        "media.fields": "url,preview_image_url,type",
+    }
+
+    def __init__(
+        self,
+        bearer_token: Optional[str] = None,
+        base_url: str = TWITTER_API_BASE_URL,
+        chunk_size: int = 100,
+        timeout: float = 30,
+    ):
+        self.bearer_token = bearer_token or os.environ.get("TWITTER_BEARER_TOKEN")
+        self.base_url = base_url.rstrip("/")
+        self.chunk_size = chunk_size
+        self.timeout = timeout
+        self.utils = TwitterUtils()
+
+        self.session = None
+        self.session_loop = None
+
+    def get_session(self) -> aiohttp.ClientSession:
+        # One pooled session per event loop keeps connections alive between rounds
+        loop = asyncio.get_running_loop()
+        if self.session is None or self.session.closed or self.session_loop is not loop:
+            self.session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers={
+                    "Authorization": f"Bearer {self.bearer_token}",
+                    "User-Agent": "v2TweetLookupPython",
+                },
+            )
+            self.session_loop = loop
+        return self.session
+
+    async def lookup_chunk(self, tweet_ids: List[str]) -> List[TwitterScraperTweet]:
+        params = {"ids": ",".join(tweet_ids), **self.fields}
+        try:
+            async with self.get_session().get(
+                f"{self.base_url}/tweets", params=params
+            ) as response:
+                if response.status != 200:
+                    bt.logging.warning(
+                        f"Twitter API tweet lookup failed with status {response.status}: {await response.text()}"
+                    )
+                    return []
+                payload = await response.json()
+        except Exception as e:
+            bt.logging.warning(f"Twitter API tweet lookup failed: {e}")
+            return []
+
+        return self.parse_tweets(payload)
+
+    def parse_tweets(self, payload: dict) -> List[TwitterScraperTweet]:
+        includes = payload.get("includes", {})
+        users = {user.get("id"): user for user in includes.get("users", [])}
+        media_by_key = {media.get("media_key"): media for media in includes.get("media", [])}
+
+        tweets = []
+        for item in payload.get("data", []):
+            user = users.get(item.get("author_id"), {})
+            username = user.get("username", "")
+            metrics = item.get("public_metrics", {})
+            user_metrics = user.get("public_metrics", {})
+            referenced_types = {
+                reference.get("type") for reference in item.get("referenced_tweets", [])
+            }
+            media_keys = item.get("attachments", {}).get("media_keys", [])
+
+            tweets.append(
+                TwitterScraperTweet(
+                    id=item.get("id"),
+                    full_text=item.get("text"),
+                    reply_count=metrics.get("reply_count"),
+                    retweet_count=metrics.get("retweet_count"),
+                    like_count=metrics.get("like_count"),
+                    view_count=metrics.get("impression_count"),
+                    quote_count=metrics.get("quote_count"),
+                    url=f"https://x.com/{username}/status/{item.get('id')}",
+                    created_at=convert_iso_date(item.get("created_at")),
+                    is_quote_tweet="quoted" in referenced_types,
+                    is_retweet="retweeted" in referenced_types,
+                    media=[
+                        TwitterScraperMedia(
+                            media_url=media_by_key[key].get("url")
+                            or media_by_key[key].get("preview_image_url"),
+                            type=media_by_key[key].get("type"),
+                        )
+                        for key in media_keys
+                        if key in media_by_key
+                    ],
+                    user=TwitterScraperUser(
+                        id=user.get("id"),
+                        url=f"https://x.com/{username}" if username else "",
+                        username=username,
+                        name=user.get("name"),
+                        description=user.get("description"),
+                        created_at=convert_iso_date(user.get("created_at")),
+                        followers_count=user_metrics.get("followers_count"),
+                        favourites_count=user_metrics.get("like_count"),
+                        listed_count=user_metrics.get("listed_count"),
+                        media_count=user_metrics.get("media_count"),
+                        statuses_count=user_metrics.get("tweet_count"),
+                        verified=user.get("verified"),
+                        profile_image_url=user.get("profile_image_url"),
+                    ),
+                )
+            )
+        return tweets
+
+    async def iterate_tweets(self, urls: List[str]) -> AsyncIterator[TwitterScraperTweet]:
+        if not self.bearer_token:
+            bt.logging.warning(
+                "Please set the TWITTER_BEARER_TOKEN environment variable to verify tweets with the Twitter API."
+            )
+            return
+
+        tweet_ids = list(
+            dict.fromkeys(
+                tweet_id
+                for tweet_id in (self.utils.extract_tweet_id(url) for url in urls)
+                if tweet_id
+            )
+        )
+        chunks = [
+            tweet_ids[start : start + self.chunk_size]
+            for start in range(0, len(tweet_ids), self.chunk_size)
+        ]
+
+        for task in asyncio.as_completed([self.lookup_chunk(chunk) for chunk in chunks]):
+            for tweet in await task:
+                yield tweet
+
+    async def close(self):
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+
+
+def create_tweet_verifier(name: str, base_url: str = TWITTER_API_BASE_URL) -> TweetVerifier:
+    if name == "twitter_v2":
+        return TwitterV2TweetVerifier(base_url=base_url)
+    return ApifyTweetVerifier()
@@ -1,16 +1,23 @@
+import re
+import hashlib
 import pydantic
 import bittensor as bt
 import typing
 import json
 from abc import ABC, abstractmethod
-from typing import List, Union, Callable, Awaitable, Dict, Optional, Any
+from typing import List, Union, Callable, Awaitable, Dict, Optional, Any, NamedTuple
 from starlette.responses import StreamingResponse
 from pydantic import BaseModel, Field
 from enum import Enum
 
 from aiohttp import ClientResponse
 from template.services.twitter_utils import TwitterUtils
-from template.services.web_search_utils import WebSearchUtils
+from template.services.link_extractor import ExtractedLinks, LinkExtractor
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
 
 
 class IsAlive(bt.Synapse):
@@ -86,6 +93,74 @@ class ScraperTextRole(str, Enum):
     FINAL_SUMMARY = "summary"
 
 
+class StreamFraming(str, Enum):
+    # Back-to-back JSON objects without a delimiter, used by older miners
+    JSON = "json"
+    # One JSON object per line
+    NDJSON = "ndjson"
+    # 4-byte big-endian length prefix followed by a msgpack encoded object
+    MSGPACK = "msgpack"
+
+
+STREAM_FRAMING_VERSION = 1
+
+# Version 2 replaces the final "texts" and "completion" events with a "digest" event,
+# the validator rebuilds them from the streamed "text" events.
+STREAM_PROTOCOL_VERSION = 2
+STREAM_FRAMING_PREAMBLE = b"#framing/"
+
+
+def supported_stream_framings() -> List[str]:
+    """Returns the framed modes this node can encode and decode, most preferred first."""
+    framings = [StreamFraming.NDJSON.value]
+    if msgpack is not None:
+        framings.insert(0, StreamFraming.MSGPACK.value)
+    return framings
+
+
+def negotiate_stream_framing(accepted_framings: Optional[List[str]]) -> StreamFraming:
+    """Picks the first framing requested by the validator that is supported locally."""
+    supported = supported_stream_framings()
+    for framing in accepted_framings or []:
+        if framing in supported:
+            return StreamFraming(framing)
+    return StreamFraming.JSON
+
+
+def encode_stream_preamble(framing: StreamFraming) -> bytes:
+    """Announces a framed stream. Unframed streams start directly with the first object."""
+    if framing == StreamFraming.JSON:
+        return b""
+    return (
+        STREAM_FRAMING_PREAMBLE
+        + f"{STREAM_FRAMING_VERSION} {framing.value}\n".encode("utf-8")
+    )
+
+
+def compute_texts_digest(texts: Dict[str, str], role_order: List[str]) -> Dict[str, Any]:
+    """Summarizes streamed texts so the receiver can check it rebuilt them correctly."""
+    return {
+        "roles": role_order,
+        "texts": {
+            role: {
+                "length": len(text),
+                "sha256": hashlib.sha256(text.encode("utf-8")).hexdigest(),
+            }
+            for role, text in texts.items()
+        },
+    }
+
+
+def encode_stream_frame(event: Dict[str, Any], framing: StreamFraming) -> bytes:
+    if framing == StreamFraming.MSGPACK:
+        body = msgpack.packb(event, use_bin_type=True)
+        return len(body).to_bytes(4, "big") + body
+    body = json.dumps(event).encode("utf-8")
+    if framing == StreamFraming.NDJSON:
+        return body + b"\n"
+    return body
+
+
 class ScraperStreamingSynapse(bt.StreamingSynapse):
     messages: str = pydantic.Field(
         ...,
@@ -171,12 +246,28 @@ class ScraperStreamingSynapse(bt.StreamingSynapse):
         description="Indicates whether the text is an introductory text.",
     )
 
+    stream_framings: Optional[List[str]] = pydantic.Field(
+        default_factory=list,
+        title="Stream Framings",
+        description="Framing modes the validator can decode, most preferred first. The miner streams with the first one it supports and falls back to unframed JSON.",
+    )
+
+    stream_protocol_version: int = pydantic.Field(
+        1,
+        title="Stream Protocol Version",
+        description="The highest stream protocol version the validator understands.",
+    )
+
     texts: Optional[Dict[str, str]] = pydantic.Field(
         default_factory=dict,
         title="Texts",
         description="A dictionary of texts in the StreamPrompting scenario, containing a role (intro, twitter summary, search summary, summary) and content. Immutable.",
     )
 
+    # Links extracted from the completion and search summary, with the texts they came from
+    _extracted_links: Optional[ExtractedLinks] = pydantic.PrivateAttr(default=None)
+    _extracted_links_source: Optional[tuple] = pydantic.PrivateAttr(default=None)
+
     def set_prompt_analysis(self, data: any):
         self.prompt_analysis = data
 
@@ -189,28 +280,46 @@ class ScraperStreamingSynapse(bt.StreamingSynapse):
     def get_search_summary_completion(self) -> Optional[str]:
         return self.texts.get(ScraperTextRole.SEARCH_SUMMARY.value, "")
 
+    def get_extracted_links(self) -> ExtractedLinks:
+        """
+        Returns the Twitter and search links of the response. They are extracted once
+        and reused by the reward and penalty models until the texts change.
+        """
+        source = (self.completion or "", self.get_search_summary_completion() or "")
+        if self._extracted_links is None or self._extracted_links_source != source:
+            self._extracted_links = LinkExtractor().extract(*source)
+            self._extracted_links_source = source
+        return self._extracted_links
+
+    def get_completion_tweet_ids(self) -> List[Optional[str]]:
+        """Returns the tweet ID of each of the completion links."""
+        tweet_ids = self.get_extracted_links().tweet_ids
+        return [
+            tweet_ids[link] if link in tweet_ids else TwitterUtils.extract_tweet_id(link)
+            for link in self.completion_links
+        ]
+
     async def process_streaming_response(self, response: StreamingResponse):
         if self.completion is None:
             self.completion = ""
 
-        buffer = ""  # Initialize an empty buffer to accumulate data across chunks
+        decoder = StreamFrameDecoder(
+            source=f"Host: {response.real_url.host}:{response.real_url.port};"
+        )
+        streamed_texts: Dict[str, List[str]] = {}
 
         try:
             async for chunk in response.content.iter_any():
-                # Decode the chunk from bytes to a string
-                chunk_str = chunk.decode("utf-8")
-                # Attempt to parse the chunk as JSON, updating the buffer with remaining incomplete JSON data
-                json_objects, buffer = extract_json_chunk(chunk_str, response, buffer)
-                for json_data in json_objects:
+                for frame in decoder.feed_frames(chunk):
+                    json_data = frame.data
                     content_type = json_data.get("type")
 
                     if content_type == "text":
                         text_content = json_data.get("content", "")
                         role = json_data.get("role")
+                        streamed_texts.setdefault(role, []).append(text_content)
 
-                        yield json.dumps(
-                            {"type": "text", "role": role, "content": text_content}
-                        )
+                        yield self.passthrough_frame(frame)
                     elif content_type == "texts":
                         texts = json_data.get("content", "")
                         self.texts = texts
@@ -218,7 +327,14 @@ class ScraperStreamingSynapse(bt.StreamingSynapse):
                         completion = json_data.get("content", "")
                         self.completion = completion
 
-                        yield json.dumps({"type": "completion", "content": completion})
+                        yield self.passthrough_frame(frame)
+                    elif content_type == "digest":
+                        digest = json_data.get("content", {})
+                        self.rebuild_texts(streamed_texts, digest, decoder.source)
+
+                        yield json.dumps(
+                            {"type": "completion", "content": self.completion}
+                        ).encode("utf-8")
                     elif content_type == "prompt_analysis":
                         prompt_analysis_json = json_data.get("content", "{}")
                         prompt_analysis = TwitterPromptAnalysisResult()
@@ -228,12 +344,12 @@ class ScraperStreamingSynapse(bt.StreamingSynapse):
                     elif content_type == "tweets":
                         tweets_json = json_data.get("content", "[]")
                         self.miner_tweets = tweets_json
-                        yield json.dumps({"type": "tweets", "content": tweets_json})
+                        yield self.passthrough_frame(frame)
 
                     elif content_type == "search":
                         search_json = json_data.get("content", "{}")
                         self.search_results = search_json
-                        yield json.dumps({"type": "search", "content": search_json})
+                        yield self.passthrough_frame(frame)
         except json.JSONDecodeError as e:
             port = response.real_url.port
             host = response.real_url.host
@@ -247,6 +363,38 @@ class ScraperStreamingSynapse(bt.StreamingSynapse):
                 f"process_streaming_response: Host: {host}:{port} ERROR: {e}"
             )
 
+    @staticmethod
+    def passthrough_frame(frame: "StreamFrame") -> bytes:
+        """
+        Returns the frame as JSON bytes for organic clients, reusing the miner's
+        original bytes when the framing kept them so they are not encoded again.
+        """
+        if frame.raw is not None:
+            return bytes(frame.raw)
+        return json.dumps(frame.data).encode("utf-8")
+
+    def rebuild_texts(
+        self,
+        streamed_texts: Dict[str, List[str]],
+        digest: Optional[Dict[str, Any]],
+        source="",
+    ):
+        """
+        Rebuilds texts and completion from streamed text events and checks them against
+        the miner's digest. Streams cut before the digest are rebuilt without the check.
+        """
+        texts = {role: "".join(tokens) for role, tokens in streamed_texts.items()}
+        role_order = (digest or {}).get("roles") or list(texts.keys())
+
+        expected_digest = compute_texts_digest(texts, role_order)
+        if digest is not None and expected_digest["texts"] != digest.get("texts"):
+            bt.logging.warning(
+                f"{source} Streamed texts do not match the miner's digest, roles: {list(texts.keys())}"
+            )
+
+        self.texts = texts
+        self.completion = "".join(texts.get(role, "") for role in role_order)
+
     def deserialize(self) -> str:
         return self.completion
 
@@ -263,11 +411,9 @@ class ScraperStreamingSynapse(bt.StreamingSynapse):
                 if key.startswith(prefix)
             }
 
-        completion_links = TwitterUtils().find_twitter_links(self.completion)
-
-        search_completion_links = WebSearchUtils().find_links(
-            self.get_search_summary_completion()
-        )
+        extracted_links = self.get_extracted_links()
+        completion_links = extracted_links.twitter_links
+        search_completion_links = extracted_links.search_links
 
         return {
             "name": headers.get("name", ""),
@@ -290,52 +436,218 @@ class ScraperStreamingSynapse(bt.StreamingSynapse):
         arbitrary_types_allowed = True
 
 
-def extract_json_chunk(chunk, response, buffer=""):
+class StreamFrame(NamedTuple):
+    # Original JSON bytes as received, None for binary framings
+    raw: Optional[bytes]
+    data: Dict[str, Any]
+
+
+class JSONStreamDecoder:
     """
-    Extracts JSON objects from a chunk of data, handling cases where JSON objects are split across multiple chunks.
+    Incrementally splits a byte stream of back-to-back JSON objects into decoded objects.
 
-    :param chunk: The current chunk of data to process.
-    :param response: The response object, used for logging.
-    :param buffer: A buffer holding incomplete JSON data from previous chunks.
-    :return: A tuple containing a list of extracted JSON objects and the updated buffer.
+    The scan position, string/escape state and nesting depth are kept between calls to
+    `feed`, so every byte received is inspected exactly once regardless of how the stream
+    is chunked. Braces inside JSON strings are ignored. Structural characters are all
+    ASCII and never occur inside multi-byte UTF-8 sequences, so the stream is scanned as
+    raw bytes and chunks split in the middle of a character are handled naturally.
     """
-    buffer += chunk  # Add the current chunk to the buffer
-    json_objects = []
-    start_index = None  # Initialize start_index for JSON object extraction
-
-    i = 0  # Start index for scanning the buffer
-    while i < len(buffer):
-        if buffer[i] == "{":
-            if start_index is None:  # Start of a new JSON object
-                start_index = i
-            stack = 1  # Initialize stack to keep track of braces
-            i += 1
-            while i < len(buffer) and stack > 0:
-                if buffer[i] == "{":
-                    stack += 1
-                elif buffer[i] == "}":
-                    stack -= 1
+
+    _structural_regex = re.compile(rb'[{}"]')
+    _string_regex = re.compile(rb'["\\]')
+
+    def __init__(self, source: str = ""):
+        self.source = source
+        self._pending: List[bytes] = []
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+
+    @property
+    def has_pending(self) -> bool:
+        return self._depth > 0
+
+    def feed(self, chunk: bytes) -> List[Dict[str, Any]]:
+        """
+        Consumes the next chunk of the stream.
+
+        :param chunk: Raw bytes received from the miner.
+        :return: A list of JSON objects completed by this chunk, in stream order.
+        """
+        return [frame.data for frame in self.feed_frames(chunk)]
+
+    def feed_frames(self, chunk: bytes) -> List[StreamFrame]:
+        """Same as `feed`, but keeps the original bytes of every object."""
+        frames = []
+
+        for json_bytes in self._split(chunk):
+            try:
+                frames.append(StreamFrame(raw=json_bytes, data=json.loads(json_bytes)))
+            except json.JSONDecodeError as e:
+                bt.logging.debug(
+                    f"{self.source} Failed to decode JSON object: {e} - JSON string: {json_bytes[:200]}"
+                )
+
+        return frames
+
+    def _split(self, chunk: bytes) -> List[bytes]:
+        frames = []
+        length = len(chunk)
+        # Start of the current object within this chunk (0 if it began in an earlier chunk)
+        start = 0 if self._depth else None
+        i = 0
+
+        while i < length:
+            if self._escape:
+                self._escape = False
                 i += 1
-            if stack == 0:  # Found a complete JSON object
-                json_str = buffer[start_index:i]
-                try:
-                    json_obj = json.loads(json_str)
-                    json_objects.append(json_obj)
-                    start_index = None  # Reset start_index for the next JSON object
-                except json.JSONDecodeError as e:
-                    port = response.real_url.port
-                    host = response.real_url.host
-                    bt.logging.debug(
-                        f"Host: {host}:{port}; Failed to decode JSON object: {e} - JSON string: {json_str}"
-                    )
-        else:
-            i += 1  # Move to the next character if not the start of a JSON object
-
-    remaining_buffer = (
-        buffer[start_index:] if start_index is not None else ""
-    )  # Remaining buffer after extracting JSON objects
-
-    return json_objects, remaining_buffer
+            elif self._in_string:
+                match = self._string_regex.search(chunk, i)
+                if match is None:
+                    break
+                i = match.end()
+                if chunk[match.start()] == 0x5C:  # backslash
+                    self._escape = True
+                else:
+                    self._in_string = False
+            elif self._depth == 0:
+                # Skip anything between objects (whitespace, separators)
+                start = chunk.find(b"{", i)
+                if start == -1:
+                    start = None
+                    break
+                self._depth = 1
+                i = start + 1
+            else:
+                match = self._structural_regex.search(chunk, i)
+                if match is None:
+                    break
+                i = match.end()
+                char = chunk[match.start()]
+                if char == 0x22:  # quote
+                    self._in_string = True
+                elif char == 0x7B:  # {
+                    self._depth += 1
+                else:
+                    self._depth -= 1
+                    if self._depth == 0:
+                        self._pending.append(chunk[start:i])
+                        frames.append(b"".join(self._pending))
+                        self._pending = []
+                        start = None
+
+        if start is not None:
+            self._pending.append(chunk[start:])
+
+        return frames
+
+
+class StreamFrameDecoder:
+    """
+    Decodes a miner stream in whichever framing the miner picked.
+
+    Framed streams start with a preamble line naming the framing; anything else is
+    treated as the unframed JSON format sent by older miners.
+    """
+
+    max_preamble_length = 64
+
+    def __init__(self, source: str = ""):
+        self.source = source
+        self.framing: Optional[StreamFraming] = None
+        self._head = b""
+        self._json_decoder = JSONStreamDecoder(source=source)
+        self._pending_line: List[bytes] = []
+        self._buffer = bytearray()
+
+    def feed(self, chunk: bytes) -> List[Dict[str, Any]]:
+        return [frame.data for frame in self.feed_frames(chunk)]
+
+    def feed_frames(self, chunk: bytes) -> List[StreamFrame]:
+        if self.framing is None:
+            chunk = self._detect_framing(chunk)
+            if self.framing is None:
+                return []
+
+        if self.framing == StreamFraming.NDJSON:
+            return self._feed_lines(chunk)
+        if self.framing == StreamFraming.MSGPACK:
+            return self._feed_length_prefixed(chunk)
+        return self._json_decoder.feed_frames(chunk)
+
+    def _detect_framing(self, chunk: bytes) -> bytes:
+        head = self._head + chunk
+        if not head:
+            return b""
+
+        if not head.startswith(STREAM_FRAMING_PREAMBLE[: len(head)]):
+            self.framing = StreamFraming.JSON
+            return head
+
+        newline_index = head.find(b"\n")
+        if newline_index == -1:
+            if len(head) > self.max_preamble_length:
+                self.framing = StreamFraming.JSON
+                return head
+            self._head = head
+            return b""
+
+        self._head = b""
+        preamble = head[len(STREAM_FRAMING_PREAMBLE) : newline_index].decode(
+            "utf-8", errors="replace"
+        )
+        version, _, framing = preamble.partition(" ")
+
+        try:
+            self.framing = StreamFraming(framing.strip())
+        except ValueError:
+            bt.logging.debug(f"{self.source} Unknown stream framing: {preamble}")
+            self.framing = StreamFraming.JSON
+
+        if version != str(STREAM_FRAMING_VERSION):
+            bt.logging.debug(f"{self.source} Unexpected framing version: {preamble}")
+
+        return head[newline_index + 1 :]
+
+    def _feed_lines(self, chunk: bytes) -> List[StreamFrame]:
+        *lines, remaining = chunk.split(b"\n")
+        if lines and self._pending_line:
+            lines[0] = b"".join(self._pending_line) + lines[0]
+            self._pending_line = []
+        if remaining:
+            self._pending_line.append(remaining)
+
+        frames = []
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                frames.append(StreamFrame(raw=line, data=json.loads(line)))
+            except json.JSONDecodeError as e:
+                bt.logging.debug(
+                    f"{self.source} Failed to decode JSON line: {e} - JSON string: {line[:200]}"
+                )
+        return frames
+
+    def _feed_length_prefixed(self, chunk: bytes) -> List[StreamFrame]:
+        self._buffer += chunk
+        frames = []
+        offset = 0
+
+        while len(self._buffer) - offset >= 4:
+            length = int.from_bytes(self._buffer[offset : offset + 4], "big")
+            end = offset + 4 + length
+            if len(self._buffer) < end:
+                break
+            try:
+                data = msgpack.unpackb(self._buffer[offset + 4 : end], raw=False)
+                frames.append(StreamFrame(raw=None, data=data))
+            except Exception as e:
+                bt.logging.debug(f"{self.source} Failed to decode msgpack frame: {e}")
+            offset = end
+
+        del self._buffer[:offset]
+        return frames
 
 
 class MinerTweet(BaseModel):
@@ -0,0 +1,36 @@
+from typing import Dict, List, NamedTuple, Optional
+from template.services.twitter_utils import TWITTER_LINK_PATTERN, TWEET_ID_PATTERN
+from template.services.web_search_utils import MARKDOWN_LINK_PATTERN
+
+
+class ExtractedLinks(NamedTuple):
+    # Twitter links of the completion, in order of appearance
+    twitter_links: List[str]
+    # Tweet ID of each Twitter link, None for links without one
+    tweet_ids: Dict[str, Optional[str]]
+    # Markdown links of the search summary, in order of appearance
+    search_links: List[str]
+
+
+class LinkExtractor:
+    """
+    Finds the Twitter links of a completion, with their tweet IDs, and the markdown
+    links of a search summary. Each text is scanned once and the tweet ID is read
+    from the matched link only, so the results can be reused by every consumer.
+    """
+
+    def extract(self, completion: str, search_summary: str) -> ExtractedLinks:
+        twitter_links = []
+        tweet_ids = {}
+        for match in TWITTER_LINK_PATTERN.finditer(completion or ""):
+            link = match.group(0)
+            twitter_links.append(link)
+            if link not in tweet_ids:
+                tweet_id = TWEET_ID_PATTERN.search(link)
+                tweet_ids[link] = tweet_id.group(1) if tweet_id else None
+
+        search_links = [
+            match.group(3) for match in MARKDOWN_LINK_PATTERN.finditer(search_summary or "")
+        ]
+
+        return ExtractedLinks(twitter_links, tweet_ids, search_links)
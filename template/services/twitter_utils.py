@@ -4,15 +4,18 @@ from urllib.parse import urlparse
 
 VALID_DOMAINS = ["twitter.com", "x.com"]
 
+TWITTER_LINK_PATTERN = re.compile(
+    r"https?://(?:"
+    + "|".join(re.escape(domain) for domain in VALID_DOMAINS)
+    + r")/[\w/:%#\$&\?\(\)~\.=\+\-]+(?<=\d)",
+    re.IGNORECASE,
+)
+TWEET_ID_PATTERN = re.compile(r"/status(?:es)?/(\d+)")
+
 
 class TwitterUtils:
     def __init__(self):
-        self.twitter_link_regex = re.compile(
-            r"https?://(?:"
-            + "|".join(re.escape(domain) for domain in VALID_DOMAINS)
-            + r")/[\w/:%#\$&\?\(\)~\.=\+\-]+(?<=\d)",
-            re.IGNORECASE,
-        )
+        self.twitter_link_regex = TWITTER_LINK_PATTERN
 
     @staticmethod
     def extract_tweet_id(url: str) -> str:
@@ -25,7 +28,7 @@ class TwitterUtils:
         Returns:
             The extracted tweet ID.
         """
-        match = re.search(r"/status(?:es)?/(\d+)", url)
+        match = TWEET_ID_PATTERN.search(url)
         return match.group(1) if match else None
 
     @staticmethod
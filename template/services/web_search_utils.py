@@ -1,14 +1,17 @@
 import re
 from typing import List
 
+MARKDOWN_LINK_PATTERN = re.compile(
+    r"(?:^|\n)\s*(?:\d+\s*)?([^\n]*?)\s*\[([^\]]*?)\]\((.*?)\)", re.MULTILINE
+)
+
 
 class WebSearchUtils:
     @staticmethod
     def find_links(text: str) -> List[str]:
-        link_regex = r"(?:^|\n)\s*(?:\d+\s*)?([^\n]*?)\s*\[([^\]]*?)\]\((.*?)\)"
         links = []
 
-        for match in re.finditer(link_regex, text, re.MULTILINE):
+        for match in MARKDOWN_LINK_PATTERN.finditer(text):
             link = match.group(3)
             links.append(link)
 
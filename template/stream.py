@@ -1,26 +1,122 @@
-from template.protocol import ScraperStreamingSynapse, TwitterPromptAnalysisResult, extract_json_chunk
+from template.protocol import ScraperStreamingSynapse, TwitterPromptAnalysisResult, StreamFrameDecoder
 import bittensor as bt
 import aiohttp
 import json
 import asyncio
 
-async def process_async_responses(async_responses):
-    tasks = [collect_generator_results(resp) for resp in async_responses]
-    responses = await asyncio.gather(*tasks)
-    for response in responses:
+async def process_async_responses(
+    async_responses,
+    idle_timeout=None,
+    round_timeout=None,
+    on_timeout=None,
+    first_chunk_timeout=None,
+):
+    """
+    Collects all miner streams concurrently and yields one result per stream, in
+    input order, as soon as every stream has finished or the round deadline passed.
+
+    :param idle_timeout: Seconds a stream may stay silent between chunks before it is cut.
+    :param first_chunk_timeout: Seconds a stream may take to send its first chunk, defaults to idle_timeout.
+    :param round_timeout: Seconds after which the remaining streams are cancelled.
+    :param on_timeout: Called as on_timeout(index, chunks) for a stream that ended
+        without a final synapse; its return value is yielded in place of the stream text.
+    """
+    responses = [[] for _ in async_responses]
+    tasks = [
+        asyncio.create_task(
+            collect_generator_results(resp, idle_timeout, results, first_chunk_timeout)
+        )
+        for resp, results in zip(async_responses, responses)
+    ]
+
+    if tasks:
+        _, pending = await asyncio.wait(tasks, timeout=round_timeout)
+        if pending:
+            bt.logging.debug(
+                f"process_async_responses: cancelling {len(pending)} streams after round deadline"
+            )
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    for index, response in enumerate(responses):
         final_synapse = next((chunk for chunk in response if isinstance(chunk, bt.Synapse)), None)
         if final_synapse:
             yield final_synapse  # Yield final synapse
+        elif on_timeout is not None:
+            yield on_timeout(index, response)
         else:
             # Fixed code as per instructions
-            stream_text = ''.join([str(chunk) for chunk in response if chunk is not None])
+            stream_text = ''.join([chunk.decode("utf-8") if isinstance(chunk, bytes) else str(chunk) for chunk in response if chunk is not None])
             if stream_text:
                 yield stream_text  # Yield stream text as soon as it's available  
 
-async def collect_generator_results(response):
-    results = []
-    async for result in response:
-        results.append(result)
+async def merge_async_responses(async_responses, uids):
+    """
+    Consumes all miner streams concurrently and yields (uid, value) pairs in the
+    order they arrive, so a slow miner never holds back the faster ones.
+    """
+    queue = asyncio.Queue()
+    finished = object()
+
+    async def pump(uid, response):
+        try:
+            async for value in response:
+                await queue.put((uid, value))
+        except Exception as e:
+            bt.logging.debug(f"merge_async_responses UID: {uid} ERROR: {e}")
+        finally:
+            await queue.put((uid, finished))
+
+    tasks = [
+        asyncio.create_task(pump(uid, response))
+        for uid, response in zip(uids, async_responses)
+    ]
+    remaining = len(tasks)
+
+    try:
+        while remaining:
+            uid, value = await queue.get()
+            if value is finished:
+                remaining -= 1
+                continue
+            yield uid, value
+    finally:
+        for task in tasks:
+            task.cancel()
+
+async def collect_generator_results(
+    response, idle_timeout=None, results=None, first_chunk_timeout=None
+):
+    # Chunks are appended in place so they survive if the task is cancelled
+    if results is None:
+        results = []
+
+    try:
+        while True:
+            # Miners may call tools for a while before they stream anything
+            timeout = (
+                first_chunk_timeout
+                if not results and first_chunk_timeout is not None
+                else idle_timeout
+            )
+            try:
+                result = await asyncio.wait_for(response.__anext__(), timeout)
+            except StopAsyncIteration:
+                break
+            except asyncio.TimeoutError:
+                bt.logging.debug(
+                    f"collect_generator_results: no chunk for {timeout} seconds, closing stream"
+                )
+                break
+            results.append(result)
+    finally:
+        try:
+            # Closing the generator releases the miner connection right away
+            await response.aclose()
+        except Exception as e:
+            bt.logging.debug(f"collect_generator_results: failed to close stream: {e}")
+
     return results
 
 # async def collect_generator_results(response):
@@ -36,6 +132,7 @@ async def process_single_response(response):
     completion = ""
     prompt_analysis = None
     miner_tweets = []
+    decoder = StreamFrameDecoder()
 
     try:
         async for chunk in response:
@@ -44,9 +141,8 @@ async def process_single_response(response):
                     if chunk.is_failure:
                         raise Exception("Dendrite's status code indicates failure")
             else: 
-                chunk_str = chunk.decode("utf-8")
                 try:
-                    json_objects, remaining_chunk = extract_json_chunk(chunk_str)
+                    json_objects = decoder.feed(chunk)
                     for json_data in json_objects:
                         content_type = json_data.get("type")
 
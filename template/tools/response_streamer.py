@@ -1,29 +1,57 @@
-import json
+import time
 import asyncio
 from starlette.types import Send
-from template.protocol import ScraperTextRole
+from template.protocol import (
+    ScraperTextRole,
+    StreamFraming,
+    compute_texts_digest,
+    encode_stream_frame,
+    encode_stream_preamble,
+)
 import bittensor as bt
 
 
 class ResponseStreamer:
-    def __init__(self, send: Send) -> None:
+    def __init__(
+        self,
+        send: Send,
+        framing: StreamFraming = StreamFraming.JSON,
+        coalesce_window: float = 0,
+        coalesce_bytes: int = 0,
+    ) -> None:
         self.texts = {}
         self.role_order = []
         self.more_body = True
         self.send = send
-
-    async def send_text_event(self, text: str, role: ScraperTextRole):
-        text_data_json = json.dumps(
-            {"type": "text", "role": role.value, "content": text}
-        )
+        self.framing = framing
+        # Tokens of a role are sent together once either limit is reached; 0 disables the limit
+        self.coalesce_window = coalesce_window
+        self.coalesce_bytes = coalesce_bytes
+
+    async def send_preamble(self):
+        preamble = encode_stream_preamble(self.framing)
+
+        if preamble:
+            await self.send(
+                {
+                    "type": "http.response.body",
+                    "body": preamble,
+                    "more_body": True,
+                }
+            )
+
+    async def send_event(self, event: dict, more_body: bool = True):
         await self.send(
             {
                 "type": "http.response.body",
-                "body": text_data_json.encode("utf-8"),
-                "more_body": True,
+                "body": encode_stream_frame(event, self.framing),
+                "more_body": more_body,
             }
         )
 
+    async def send_text_event(self, text: str, role: ScraperTextRole):
+        await self.send_event({"type": "text", "role": role.value, "content": text})
+
     async def stream_response(self, response, role: ScraperTextRole, wait_time=None):
         if role not in self.role_order:
             self.role_order.append(role)
@@ -32,16 +60,75 @@ class ResponseStreamer:
             await self.send_text_event(text="\n\n", role=role)
             self.texts[role] = ["\n\n"]
 
-        async for chunk in response:
-            token = chunk.choices[0].delta.content or ""
-            self.texts[role].append(token)
-
-            await self.send_text_event(text=token, role=role)
-
-            if wait_time is not None:
-                await asyncio.sleep(wait_time)
-
-            bt.logging.trace(f"Streamed tokens: {token}")
+        is_coalescing = self.coalesce_window > 0 or self.coalesce_bytes > 0
+        is_first_token = True
+        pending_tokens = []
+        pending_bytes = 0
+        last_flush_time = time.monotonic()
+
+        async def flush():
+            nonlocal is_first_token, pending_tokens, pending_bytes, last_flush_time
+            await self.send_text_event(text="".join(pending_tokens), role=role)
+            is_first_token = False
+            pending_tokens = []
+            pending_bytes = 0
+            last_flush_time = time.monotonic()
+
+        chunks = response.__aiter__()
+        next_chunk = None
+        try:
+            while True:
+                # Buffered tokens are flushed when the window ends, even if the
+                # upstream stream stalls before the next token
+                if pending_tokens and self.coalesce_window > 0:
+                    next_chunk = asyncio.ensure_future(chunks.__anext__())
+                    done, _ = await asyncio.wait(
+                        {next_chunk},
+                        timeout=max(
+                            last_flush_time + self.coalesce_window - time.monotonic(), 0
+                        ),
+                    )
+                    if not done:
+                        await flush()
+                else:
+                    next_chunk = chunks.__anext__()
+
+                try:
+                    chunk = await next_chunk
+                except StopAsyncIteration:
+                    break
+
+                token = chunk.choices[0].delta.content or ""
+                self.texts[role].append(token)
+
+                if not token:
+                    continue
+
+                pending_tokens.append(token)
+                pending_bytes += len(token.encode("utf-8"))
+
+                # The first token is always sent right away to keep time to first token unchanged
+                if (
+                    not is_coalescing
+                    or is_first_token
+                    or (self.coalesce_bytes > 0 and pending_bytes >= self.coalesce_bytes)
+                    or (
+                        self.coalesce_window > 0
+                        and time.monotonic() - last_flush_time >= self.coalesce_window
+                    )
+                ):
+                    await flush()
+
+                if wait_time is not None:
+                    await asyncio.sleep(wait_time)
+
+                bt.logging.trace(f"Streamed tokens: {token}")
+        finally:
+            if asyncio.isfuture(next_chunk) and not next_chunk.done():
+                next_chunk.cancel()
+
+        if pending_tokens:
+            await flush()
 
     async def send_texts_event(self):
         texts = {}
@@ -54,12 +141,7 @@ class ResponseStreamer:
             "content": texts,
         }
 
-        await self.send(
-            {
-                "type": "http.response.body",
-                "body": json.dumps(texts_response_body).encode("utf-8"),
-            }
-        )
+        await self.send_event(texts_response_body, more_body=False)
 
     async def send_completion_event(self):
         completion_response_body = {
@@ -67,12 +149,18 @@ class ResponseStreamer:
             "content": self.get_full_text(),
         }
 
-        await self.send(
-            {
-                "type": "http.response.body",
-                "body": json.dumps(completion_response_body).encode("utf-8"),
-            }
-        )
+        await self.send_event(completion_response_body, more_body=False)
+
+    async def send_digest_event(self):
+        texts = {role.value: "".join(self.texts[role]) for role in self.texts}
+        role_order = [role.value for role in self.role_order if role in self.texts]
+
+        digest_response_body = {
+            "type": "digest",
+            "content": compute_texts_digest(texts, role_order),
+        }
+
+        await self.send_event(digest_response_body, more_body=False)
 
     def get_full_text(self):
         full_text = []
@@ -17,7 +17,7 @@ from langchain.tools.render import render_text_description
 from template.protocol import ScraperTextRole
 from openai import AsyncOpenAI
 from template.tools.response_streamer import ResponseStreamer
-from template.protocol import TwitterPromptAnalysisResult
+from template.protocol import TwitterPromptAnalysisResult, StreamFraming
 
 OpenAI.api_key = os.environ.get("OPENAI_API_KEY")
 
@@ -67,13 +67,28 @@ class ToolManager:
     twitter_prompt_analysis: Optional[TwitterPromptAnalysisResult]
     twitter_data: Optional[Dict[str, Any]]
 
-    def __init__(self, prompt, manual_tool_names, send, is_intro_text, miner):
+    def __init__(
+        self,
+        prompt,
+        manual_tool_names,
+        send,
+        is_intro_text,
+        miner,
+        stream_framing=StreamFraming.JSON,
+        stream_protocol_version=1,
+    ):
         self.prompt = prompt
         self.manual_tool_names = manual_tool_names
         self.miner = miner
         self.is_intro_text = is_intro_text
+        self.stream_protocol_version = stream_protocol_version
 
-        self.response_streamer = ResponseStreamer(send=send)
+        self.response_streamer = ResponseStreamer(
+            send=send,
+            framing=stream_framing,
+            coalesce_window=self.miner.config.miner.stream_coalesce_ms / 1000,
+            coalesce_bytes=self.miner.config.miner.stream_coalesce_bytes,
+        )
         self.send = send
         self.openai_summary_model = self.miner.config.miner.openai_summary_model
 
@@ -83,6 +98,8 @@ class ToolManager:
         self.twitter_data = None
 
     async def run(self):
+        await self.response_streamer.send_preamble()
+
         actions = await self.detect_tools_to_use()
 
         # intro_text_task = self.intro_text(
@@ -129,20 +146,11 @@ class ToolManager:
             self.response_streamer.get_full_text(),
         )
 
-        await self.response_streamer.send_texts_event()
-        await self.response_streamer.send_completion_event()
-
-        completion_response_body = {
-            "type": "completion",
-            "content": self.response_streamer.get_full_text(),
-        }
-
-        await self.send(
-            {
-                "type": "http.response.body",
-                "body": json.dumps(completion_response_body).encode("utf-8"),
-            }
-        )
+        if self.stream_protocol_version >= 2:
+            await self.response_streamer.send_digest_event()
+        else:
+            await self.response_streamer.send_texts_event()
+            await self.response_streamer.send_completion_event()
 
         if self.response_streamer.more_body:
             await self.send(
@@ -249,7 +257,9 @@ class ToolManager:
             stream=True,
         )
 
-        response_streamer = ResponseStreamer(send=self.send)
+        response_streamer = ResponseStreamer(
+            send=self.send, framing=self.response_streamer.framing
+        )
         await response_streamer.stream_response(
             response=response, role=ScraperTextRole.INTRO, wait_time=0.1
         )
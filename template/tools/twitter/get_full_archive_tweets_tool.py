@@ -1,4 +1,3 @@
-import json
 import bittensor as bt
 from typing import Type
 from starlette.types import Send
@@ -75,13 +74,7 @@ class GetFullArchiveTweetsTool(BaseTool):
                 "content": prompt_analysis.dict(),
             }
 
-            await send(
-                {
-                    "type": "http.response.body",
-                    "body": json.dumps(prompt_analysis_response_body).encode("utf-8"),
-                    "more_body": True,
-                }
-            )
+            await response_streamer.send_event(prompt_analysis_response_body)
             bt.logging.info("Prompt Analysis sent")
 
         if tweets:
@@ -90,11 +83,5 @@ class GetFullArchiveTweetsTool(BaseTool):
             tweets_response_body = {"type": "tweets", "content": tweets}
             response_streamer.more_body = False
 
-            await send(
-                {
-                    "type": "http.response.body",
-                    "body": json.dumps(tweets_response_body).encode("utf-8"),
-                    "more_body": False,
-                }
-            )
+            await response_streamer.send_event(tweets_response_body, more_body=False)
             bt.logging.info(f"Tweet data sent. Number of tweets: {tweets_amount}")
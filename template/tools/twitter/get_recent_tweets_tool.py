@@ -1,4 +1,3 @@
-import json
 from typing import Type
 import bittensor as bt
 from pydantic import BaseModel, Field
@@ -76,13 +75,7 @@ class GetRecentTweetsTool(BaseTool):
                 "content": prompt_analysis.dict(),
             }
 
-            await send(
-                {
-                    "type": "http.response.body",
-                    "body": json.dumps(prompt_analysis_response_body).encode("utf-8"),
-                    "more_body": True,
-                }
-            )
+            await response_streamer.send_event(prompt_analysis_response_body)
             bt.logging.info("Prompt Analysis sent")
 
         if tweets:
@@ -91,11 +84,5 @@ class GetRecentTweetsTool(BaseTool):
             tweets_response_body = {"type": "tweets", "content": tweets}
             response_streamer.more_body = False
 
-            await send(
-                {
-                    "type": "http.response.body",
-                    "body": json.dumps(tweets_response_body).encode("utf-8"),
-                    "more_body": False,
-                }
-            )
+            await response_streamer.send_event(tweets_response_body, more_body=False)
             bt.logging.info(f"Tweet data sent. Number of tweets: {tweets_amount}")
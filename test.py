@@ -40,6 +40,8 @@ async def main():
         response_received = False
         for resp in async_responses:
             async for chunk in resp:
+                if isinstance(chunk, bytes):
+                    chunk = chunk.decode("utf-8")
                 if isinstance(chunk, str):
                     bt.logging.trace(chunk)
                     full_response += chunk
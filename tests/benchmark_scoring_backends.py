@@ -0,0 +1,185 @@
+"""
+Compares the scoring backends of RewardLLM against the default hf pipeline.
+
+Each backend scores the same messages in a fresh process, then the script prints
+the latency per message, the peak memory of the process and how far its scores
+are from the hf scores.
+
+    python tests/benchmark_scoring_backends.py --backends hf int8 onnx gguf --gguf_path zephyr-7b-alpha.Q4_K_M.gguf
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import resource
+import subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SAMPLES = [
+    (
+        "What are the latest developments in solid state batteries?",
+        "Toyota announced a solid state battery with a 1,200 km range, planned for 2027. "
+        "QuantumScape started shipping samples of its lithium metal cells to carmakers.",
+    ),
+    (
+        "What are the latest developments in solid state batteries?",
+        "Bananas are a good source of potassium and are easy to carry as a snack.",
+    ),
+    (
+        "Who won the last Champions League final?",
+        "Real Madrid beat Borussia Dortmund 2-0 at Wembley, with goals from Carvajal and Vinicius Jr.",
+    ),
+    (
+        "How does Bittensor reward miners?",
+        "Validators score miner responses and set weights on chain, and emissions are "
+        "distributed to miners in proportion to the consensus of those weights.",
+    ),
+    (
+        "How does Bittensor reward miners?",
+        "I don't know.",
+    ),
+    (
+        "What is the capital of Australia?",
+        "The capital of Australia is Canberra, not Sydney as many people assume.",
+    ),
+]
+
+
+def get_messages(repeat: int):
+    from neurons.validators.utils.prompts import SummaryRelevancePrompt
+
+    prompt = SummaryRelevancePrompt()
+    messages = []
+    for index in range(repeat):
+        for question, completion in SAMPLES:
+            key = str(len(messages))
+            messages.append(
+                {
+                    key: [
+                        {"role": "system", "content": prompt.get_system_message()},
+                        {"role": "user", "content": prompt.text(question, completion)},
+                    ]
+                }
+            )
+    return messages
+
+
+def run_backend(args):
+    """Scores the sample messages with one backend and prints the result as JSON."""
+    from neurons.validators.reward.reward_llm import RewardLLM
+    from neurons.validators.utils.prompts import ScoringPrompt
+
+    reward_llm = RewardLLM(scoring_mode=args.scoring_mode)
+
+    start_time = time.time()
+    reward_llm.init_pipe_zephyr(backend=args.backend, gguf_path=args.gguf_path)
+    load_time = time.time() - start_time
+
+    messages = get_messages(args.repeat)
+
+    # Warm up so one-time compilation and allocation are not measured
+    reward_llm.get_score_by_zephyer(messages[:1])
+
+    start_time = time.time()
+    if reward_llm.scoring_mode == "logits":
+        score_responses = reward_llm.get_score_by_logits(messages)
+    else:
+        score_responses = reward_llm.get_score_by_zephyer(messages)
+    duration = time.time() - start_time
+
+    scoring_prompt = ScoringPrompt()
+    scores = {
+        key: scoring_prompt.extract_score(score_text)
+        for key, score_text in (score_responses or {}).items()
+    }
+
+    print(
+        json.dumps(
+            {
+                "backend": args.backend,
+                "load_time": load_time,
+                "latency": duration / len(messages),
+                # ru_maxrss is in kilobytes on Linux
+                "peak_memory_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+                "scores": scores,
+            }
+        )
+    )
+
+
+def compare_backends(args):
+    results = {}
+    for backend in args.backends:
+        command = [
+            sys.executable,
+            os.path.abspath(__file__),
+            "--backend",
+            backend,
+            "--scoring_mode",
+            args.scoring_mode,
+            "--repeat",
+            str(args.repeat),
+        ]
+        if args.gguf_path:
+            command += ["--gguf_path", args.gguf_path]
+
+        # One process per backend, so peak memory is not shared between backends
+        process = subprocess.run(command, capture_output=True, text=True)
+        output = process.stdout.strip().splitlines()
+        if process.returncode != 0 or not output:
+            print(f"{backend}: failed\n{process.stderr[-2000:]}")
+            continue
+        results[backend] = json.loads(output[-1])
+
+    reference = results.get("hf")
+
+    print(
+        f"{'backend':<8} {'load (s)':>10} {'latency (s/msg)':>16} {'peak mem (MB)':>14} {'mean |diff|':>12} {'agreement':>10}"
+    )
+    for backend, result in results.items():
+        mean_difference = agreement = float("nan")
+        if reference:
+            keys = [key for key in reference["scores"] if key in result["scores"]]
+            if keys:
+                differences = [
+                    abs(result["scores"][key] - reference["scores"][key]) for key in keys
+                ]
+                mean_difference = sum(differences) / len(keys)
+                agreement = sum(1 for difference in differences if difference <= 1) / len(keys)
+
+        print(
+            f"{backend:<8} {result['load_time']:>10.1f} {result['latency']:>16.3f} "
+            f"{result['peak_memory_mb']:>14.0f} {mean_difference:>12.2f} {agreement:>10.0%}"
+        )
+
+
+def get_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--backends",
+        nargs="+",
+        default=["hf", "int8", "onnx", "gguf"],
+        help="Backends to compare, scores are compared against hf.",
+    )
+    parser.add_argument(
+        "--backend", type=str, default=None, help="Runs a single backend and prints JSON."
+    )
+    parser.add_argument("--gguf_path", type=str, default=None)
+    parser.add_argument(
+        "--scoring_mode", type=str, choices=["generate", "logits"], default="generate"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=4, help="How many times the samples are scored."
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = get_args()
+    if args.backend:
+        run_backend(args)
+    else:
+        compare_backends(args)
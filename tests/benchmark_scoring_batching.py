@@ -0,0 +1,142 @@
+"""
+Measures the scoring throughput of get_score_by_zephyer with and without
+length-bucketed batching, and the cost of rendering scoring prompts.
+
+    python tests/benchmark_scoring_batching.py --backend hf --batch_size 16 --messages 64
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from neurons.validators.reward.reward_llm import RewardLLM
+from neurons.validators.utils.prompts import (
+    SummaryRelevancePrompt,
+    find_unique_tags,
+)
+
+WORDS = (
+    "solid state batteries toyota range quantumscape cells lithium metal carmakers "
+    "validators miners weights emissions consensus bittensor subnet twitter links "
+    "search results summary question answer relevance evidence"
+).split()
+
+
+def get_messages(count: int, seed: int = 0):
+    # Completions from a few words to a few hundred, like real miner responses
+    rng = random.Random(seed)
+    prompt = SummaryRelevancePrompt()
+    messages = []
+    for index in range(count):
+        completion = " ".join(rng.choices(WORDS, k=rng.choice([10, 40, 120, 400])))
+        messages.append(
+            {
+                str(index): [
+                    {"role": "system", "content": prompt.get_system_message()},
+                    {
+                        "role": "user",
+                        "content": prompt.text("What is new in batteries?", completion),
+                    },
+                ]
+            }
+        )
+    return messages
+
+
+def uncompiled_text(prompt, *args):
+    # BasePrompt.text before templates were compiled
+    sanitized = args
+    for tag in find_unique_tags(prompt.template):
+        sanitized = [arg.replace(tag, "") for arg in sanitized]
+    return prompt.template.format(*sanitized)
+
+
+def benchmark_prompt_text(iterations: int):
+    prompt = SummaryRelevancePrompt()
+    args = ("What is new in batteries?", " ".join(WORDS * 10))
+
+    start_time = time.perf_counter()
+    for _ in range(iterations):
+        uncompiled_text(prompt, *args)
+    before = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    for _ in range(iterations):
+        prompt.text(*args)
+    after = time.perf_counter() - start_time
+
+    print(
+        f"BasePrompt.text: {before / iterations * 1e6:.1f} us before, {after / iterations * 1e6:.1f} us after"
+    )
+
+
+def benchmark_scoring(reward_llm: RewardLLM, messages, batch_size: int, sort: bool):
+    pipe = reward_llm.pipe
+    tokenizer = pipe.tokenizer
+
+    prompts = [
+        tokenizer.apply_chat_template(
+            next(iter(message_dict.values())), tokenize=False, add_generation_prompt=True
+        )
+        for message_dict in messages
+    ]
+    lengths = [len(tokenizer(prompt, add_special_tokens=False).input_ids) for prompt in prompts]
+
+    order = list(range(len(prompts)))
+    if sort:
+        order.sort(key=lambda index: lengths[index])
+
+    # Tokens forwarded including padding, every batch is padded to its longest prompt
+    padded_tokens = sum(
+        max(lengths[index] for index in order[start : start + batch_size])
+        * len(order[start : start + batch_size])
+        for start in range(0, len(order), batch_size)
+    )
+
+    start_time = time.perf_counter()
+    pipe(
+        [prompts[index] for index in order],
+        batch_size=batch_size,
+        max_new_tokens=50,
+        do_sample=True,
+        temperature=0.2,
+        top_k=50,
+        top_p=0.95,
+    )
+    duration = time.perf_counter() - start_time
+
+    label = "length-bucketed" if sort else "arrival order"
+    print(
+        f"{label:<16} {sum(lengths) / duration:>10.0f} prompt tokens/s, "
+        f"padding {1 - sum(lengths) / padded_tokens:.0%}, {duration:.1f} s"
+    )
+
+
+def get_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--backend", type=str, default="hf")
+    parser.add_argument("--gguf_path", type=str, default=None)
+    parser.add_argument("--batch_size", type=int, default=16)
+    parser.add_argument("--messages", type=int, default=64)
+    parser.add_argument("--text_iterations", type=int, default=10000)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = get_args()
+
+    benchmark_prompt_text(args.text_iterations)
+
+    reward_llm = RewardLLM(scoring_batch_size=args.batch_size)
+    reward_llm.init_pipe_zephyr(backend=args.backend, gguf_path=args.gguf_path)
+    messages = get_messages(args.messages)
+
+    # Warm up so one-time allocation is not measured
+    reward_llm.get_score_by_zephyer(messages[:1])
+
+    benchmark_scoring(reward_llm, messages, args.batch_size, sort=False)
+    benchmark_scoring(reward_llm, messages, args.batch_size, sort=True)
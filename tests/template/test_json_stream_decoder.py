@@ -0,0 +1,121 @@
+import json
+import unittest
+from template.protocol import (
+    JSONStreamDecoder,
+    StreamFrameDecoder,
+    StreamFraming,
+    encode_stream_frame,
+    encode_stream_preamble,
+    negotiate_stream_framing,
+)
+
+events = [
+    {"type": "text", "role": "summary", "content": "Braces { inside } strings \" and \\ escapes }}"},
+    {"type": "tweets", "content": {"data": [{"id": "1", "text": "Unicode é 🙂 {{"}]}},
+    {"type": "completion", "content": "done"},
+]
+
+
+class JSONStreamDecoderTestCase(unittest.TestCase):
+    """
+    This class contains unit tests for the JSONStreamDecoder class.
+    """
+
+    def setUp(self):
+        self.stream = b"".join(
+            json.dumps(event, ensure_ascii=False).encode("utf-8") for event in events
+        )
+
+    def test_single_chunk(self):
+        """
+        Test that back-to-back objects in one chunk are all decoded.
+        """
+        decoder = JSONStreamDecoder()
+        self.assertEqual(decoder.feed(self.stream), events)
+        self.assertFalse(decoder.has_pending)
+
+    def test_every_split_position(self):
+        """
+        Test that objects split at any byte, including inside strings, escapes and
+        multi-byte characters, are decoded once complete.
+        """
+        for split in range(1, len(self.stream)):
+            decoder = JSONStreamDecoder()
+            decoded = decoder.feed(self.stream[:split]) + decoder.feed(
+                self.stream[split:]
+            )
+            self.assertEqual(decoded, events)
+
+    def test_byte_by_byte(self):
+        """
+        Test that feeding the stream one byte at a time decodes every object.
+        """
+        decoder = JSONStreamDecoder()
+        decoded = []
+        for index in range(len(self.stream)):
+            decoded.extend(decoder.feed(self.stream[index : index + 1]))
+        self.assertEqual(decoded, events)
+
+    def test_skips_invalid_object(self):
+        """
+        Test that a malformed object is dropped without affecting the next one.
+        """
+        decoder = JSONStreamDecoder()
+        decoded = decoder.feed(b'{"type": text}' + json.dumps(events[2]).encode())
+        self.assertEqual(decoded, [events[2]])
+
+    def test_frames_keep_original_bytes(self):
+        """
+        Test that decoded frames carry the exact bytes received for passthrough.
+        """
+        decoder = JSONStreamDecoder()
+        frames = decoder.feed_frames(self.stream[:10]) + decoder.feed_frames(
+            self.stream[10:]
+        )
+        self.assertEqual(b"".join(frame.raw for frame in frames), self.stream)
+        self.assertEqual([frame.data for frame in frames], events)
+
+
+class StreamFrameDecoderTestCase(unittest.TestCase):
+    """
+    This class contains unit tests for stream framing negotiation and decoding.
+    """
+
+    def encode(self, framing):
+        return encode_stream_preamble(framing) + b"".join(
+            encode_stream_frame(event, framing) for event in events
+        )
+
+    def test_negotiate_falls_back_to_json(self):
+        """
+        Test that unknown or missing framings fall back to the unframed format.
+        """
+        self.assertEqual(negotiate_stream_framing(None), StreamFraming.JSON)
+        self.assertEqual(negotiate_stream_framing(["unknown"]), StreamFraming.JSON)
+        self.assertEqual(
+            negotiate_stream_framing(["unknown", "ndjson"]), StreamFraming.NDJSON
+        )
+
+    def test_unframed_stream(self):
+        """
+        Test that streams from older miners without a preamble are still decoded.
+        """
+        decoder = StreamFrameDecoder()
+        self.assertEqual(decoder.feed(self.encode(StreamFraming.JSON)), events)
+        self.assertEqual(decoder.framing, StreamFraming.JSON)
+
+    def test_ndjson_stream_split_everywhere(self):
+        """
+        Test that a newline-delimited stream split at any byte, including inside the
+        preamble, is decoded.
+        """
+        stream = self.encode(StreamFraming.NDJSON)
+        for split in range(1, len(stream)):
+            decoder = StreamFrameDecoder()
+            decoded = decoder.feed(stream[:split]) + decoder.feed(stream[split:])
+            self.assertEqual(decoded, events)
+            self.assertEqual(decoder.framing, StreamFraming.NDJSON)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+from template.protocol import ScraperStreamingSynapse
+from template.services.link_extractor import LinkExtractor
+from template.services.twitter_utils import TwitterUtils
+from template.services.web_search_utils import WebSearchUtils
+
+completion = """
+Battery news from verified accounts:
+- [Tweet by @user](https://twitter.com/user/status/123)
+- [Tweet by @other](https://x.com/other/status/456)
+- [Profile](https://x.com/other)
+"""
+
+search_summary = """
+1. [Solid state batteries](https://example.com/solid-state)
+2. [Battery recycling](https://example.org/recycling)
+"""
+
+
+class LinkExtractorTestCase(unittest.TestCase):
+    """
+    This class contains unit tests for the LinkExtractor class.
+    """
+
+    def test_matches_existing_utils(self):
+        """
+        Test that the extracted links are the ones TwitterUtils and WebSearchUtils find.
+        """
+        links = LinkExtractor().extract(completion, search_summary)
+
+        self.assertEqual(links.twitter_links, TwitterUtils().find_twitter_links(completion))
+        self.assertEqual(links.search_links, WebSearchUtils.find_links(search_summary))
+        self.assertEqual(
+            links.tweet_ids,
+            {
+                "https://twitter.com/user/status/123": "123",
+                "https://x.com/other/status/456": "456",
+            },
+        )
+
+    def test_cached_on_synapse(self):
+        """
+        Test that the synapse extracts the links once and again only when the completion changes.
+        """
+        synapse = ScraperStreamingSynapse(messages="battery news", completion=completion)
+
+        first = synapse.get_extracted_links()
+        self.assertIs(synapse.get_extracted_links(), first)
+
+        synapse.completion = "https://x.com/user/status/789"
+        self.assertEqual(synapse.get_extracted_links().twitter_links, [synapse.completion])
+
+        synapse.completion_links = ["https://x.com/user/status/789"]
+        self.assertEqual(synapse.get_completion_tweet_ids(), ["789"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import json
+import time
+import asyncio
+import unittest
+from types import SimpleNamespace
+from template.protocol import ScraperTextRole
+from template.tools.response_streamer import ResponseStreamer
+
+
+async def token_stream(tokens):
+    for delay, token in tokens:
+        await asyncio.sleep(delay)
+        yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=token))])
+
+
+class ResponseStreamerTestCase(unittest.IsolatedAsyncioTestCase):
+    """
+    This class contains unit tests for the token coalescing of ResponseStreamer.stream_response.
+    """
+
+    async def stream(self, tokens, **kwargs):
+        sent = []
+        start_time = time.monotonic()
+
+        async def send(message):
+            event = json.loads(message["body"])
+            sent.append((time.monotonic() - start_time, event["content"]))
+
+        streamer = ResponseStreamer(send, **kwargs)
+        await streamer.stream_response(token_stream(tokens), ScraperTextRole.FINAL_SUMMARY)
+        # The first event separates the role from the previous one
+        self.assertEqual(sent[0][1], "\n\n")
+        return sent[1:], streamer
+
+    async def test_sends_first_token_immediately(self):
+        """
+        Test that the first token is not held back by the coalescing window.
+        """
+        sent, _ = await self.stream(
+            [(0, "a"), (0, "b"), (0, "c")], coalesce_window=10
+        )
+        self.assertEqual([content for _, content in sent], ["a", "bc"])
+
+    async def test_flushes_at_byte_threshold(self):
+        """
+        Test that buffered tokens are sent once they reach the byte threshold.
+        """
+        sent, _ = await self.stream(
+            [(0, "a"), (0, "bb"), (0, "cc"), (0, "d")], coalesce_bytes=4
+        )
+        self.assertEqual([content for _, content in sent], ["a", "bbcc", "d"])
+
+    async def test_flushes_when_window_ends_during_stall(self):
+        """
+        Test that buffered tokens are sent when the window ends, without waiting for the next token.
+        """
+        sent, streamer = await self.stream(
+            [(0, "a"), (0.005, "b"), (0.5, "c")], coalesce_window=0.02
+        )
+
+        self.assertEqual([content for _, content in sent], ["a", "b", "c"])
+        self.assertLess(sent[1][0], 0.25)
+        self.assertEqual(streamer.get_full_text(), "\n\nabc")
+
+    async def test_no_coalescing_sends_every_token(self):
+        """
+        Test that every token is its own event when coalescing is disabled.
+        """
+        sent, _ = await self.stream([(0, "a"), (0, ""), (0, "b")])
+        self.assertEqual([content for _, content in sent], ["a", "b"])
+
+
+if __name__ == "__main__":
+    unittest.main()
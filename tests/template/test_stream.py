@@ -0,0 +1,71 @@
+import asyncio
+import unittest
+from template.stream import merge_async_responses, process_async_responses
+
+
+async def miner_stream(name, delays):
+    for delay in delays:
+        await asyncio.sleep(delay)
+        yield f"{name}-{delay}"
+
+
+class MergeAsyncResponsesTestCase(unittest.TestCase):
+    """
+    This class contains unit tests for the merge_async_responses function.
+    """
+
+    def test_fastest_miner_comes_first(self):
+        """
+        Test that chunks are yielded as they arrive and tagged with their UID.
+        """
+
+        async def collect():
+            responses = [
+                miner_stream("slow", [0.2]),
+                miner_stream("fast", [0.01, 0.01]),
+            ]
+            return [value async for value in merge_async_responses(responses, [1, 2])]
+
+        self.assertEqual(
+            asyncio.run(collect()),
+            [(2, "fast-0.01"), (2, "fast-0.01"), (1, "slow-0.2")],
+        )
+
+
+class ProcessAsyncResponsesTestCase(unittest.TestCase):
+    """
+    This class contains unit tests for the process_async_responses function.
+    """
+
+    def collect(self, responses, **kwargs):
+        async def collect():
+            return [
+                value
+                async for value in process_async_responses(
+                    responses, on_timeout=lambda index, chunks: chunks, **kwargs
+                )
+            ]
+
+        return asyncio.run(collect())
+
+    def test_first_chunk_gets_its_own_timeout(self):
+        """
+        Test that a miner slow to send its first chunk is kept, and cut once it goes idle.
+        """
+        results = self.collect(
+            [miner_stream("tools", [0.2, 0.01, 0.5])],
+            idle_timeout=0.1,
+            first_chunk_timeout=0.4,
+        )
+        self.assertEqual(results, [["tools-0.2", "tools-0.01"]])
+
+    def test_idle_timeout_applies_without_first_chunk_timeout(self):
+        """
+        Test that the idle timeout also covers the first chunk by default.
+        """
+        results = self.collect([miner_stream("tools", [0.2])], idle_timeout=0.1)
+        self.assertEqual(results, [[]])
+
+
+if __name__ == "__main__":
+    unittest.main()
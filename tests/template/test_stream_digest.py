@@ -0,0 +1,147 @@
+import json
+import asyncio
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+from template.protocol import (
+    ScraperStreamingSynapse,
+    ScraperTextRole,
+    StreamFraming,
+    compute_texts_digest,
+    encode_stream_frame,
+)
+from template.tools.response_streamer import ResponseStreamer
+
+INTRO_TOKENS = ["Battery ", "news, ", "in short."]
+SUMMARY_TOKENS = ["Solid ", "state ", "cells ", "are ", "coming. ", "éè"]
+
+
+async def token_stream(tokens):
+    for token in tokens:
+        yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=token))])
+
+
+async def stream_miner(framing, protocol_version=2):
+    """Returns the bytes a miner sends with the given framing and protocol version."""
+    body = []
+
+    async def send(message):
+        body.append(message["body"])
+
+    streamer = ResponseStreamer(send, framing=framing)
+    await streamer.send_preamble()
+    await streamer.stream_response(token_stream(INTRO_TOKENS), ScraperTextRole.INTRO)
+    await streamer.stream_response(
+        token_stream(SUMMARY_TOKENS), ScraperTextRole.FINAL_SUMMARY
+    )
+    if protocol_version >= 2:
+        await streamer.send_digest_event()
+    else:
+        await streamer.send_texts_event()
+        await streamer.send_completion_event()
+    return b"".join(body)
+
+
+def make_response(stream_bytes, chunk_size=7):
+    async def iter_any():
+        for start in range(0, len(stream_bytes), chunk_size):
+            yield stream_bytes[start : start + chunk_size]
+
+    return SimpleNamespace(
+        content=SimpleNamespace(iter_any=iter_any),
+        real_url=SimpleNamespace(host="127.0.0.1", port=8091),
+    )
+
+
+async def receive(stream_bytes):
+    synapse = ScraperStreamingSynapse(messages="battery news")
+    yielded = [
+        json.loads(value)
+        async for value in synapse.process_streaming_response(make_response(stream_bytes))
+    ]
+    return synapse, yielded
+
+
+EXPECTED_TEXTS = {
+    "intro": "\n\n" + "".join(INTRO_TOKENS),
+    "summary": "\n\n" + "".join(SUMMARY_TOKENS),
+}
+EXPECTED_COMPLETION = EXPECTED_TEXTS["intro"] + EXPECTED_TEXTS["summary"]
+
+
+class StreamDigestTestCase(unittest.TestCase):
+    """
+    This class contains unit tests for the digest that ends version 2 miner streams.
+    """
+
+    def test_round_trip_all_framings(self):
+        """
+        Test that texts and completion are rebuilt from text events in every framing.
+        """
+        for framing in StreamFraming:
+            with self.subTest(framing=framing):
+                stream_bytes = asyncio.run(stream_miner(framing))
+                with mock.patch("bittensor.logging.warning") as warning:
+                    synapse, yielded = asyncio.run(receive(stream_bytes))
+
+                self.assertEqual(synapse.texts, EXPECTED_TEXTS)
+                self.assertEqual(synapse.completion, EXPECTED_COMPLETION)
+                self.assertEqual(
+                    yielded[-1], {"type": "completion", "content": EXPECTED_COMPLETION}
+                )
+                warning.assert_not_called()
+
+    def test_digest_mismatch_keeps_streamed_texts(self):
+        """
+        Test that a digest not matching the text events is reported and the streamed texts are kept.
+        """
+        digest = compute_texts_digest(
+            {"intro": "something else", "summary": EXPECTED_TEXTS["summary"]},
+            ["intro", "summary"],
+        )
+        stream_bytes = b"".join(
+            [
+                encode_stream_frame(
+                    {"type": "text", "role": role, "content": text}, StreamFraming.JSON
+                )
+                for role, text in EXPECTED_TEXTS.items()
+            ]
+            + [encode_stream_frame({"type": "digest", "content": digest}, StreamFraming.JSON)]
+        )
+
+        with mock.patch("bittensor.logging.warning") as warning:
+            synapse, _ = asyncio.run(receive(stream_bytes))
+
+        warning.assert_called_once()
+        self.assertEqual(synapse.texts, EXPECTED_TEXTS)
+        self.assertEqual(synapse.completion, EXPECTED_COMPLETION)
+
+    def test_digest_role_order_sets_completion(self):
+        """
+        Test that the completion follows the role order of the digest, not the arrival order.
+        """
+        synapse = ScraperStreamingSynapse(messages="battery news")
+        texts = {"summary": "second", "intro": "first "}
+        synapse.rebuild_texts(
+            {role: [text] for role, text in texts.items()},
+            compute_texts_digest(texts, ["intro", "summary"]),
+        )
+        self.assertEqual(synapse.completion, "first second")
+
+    def test_version_1_miner(self):
+        """
+        Test that texts and completion events of version 1 miners are still used as sent.
+        """
+        stream_bytes = asyncio.run(stream_miner(StreamFraming.JSON, protocol_version=1))
+        synapse, yielded = asyncio.run(receive(stream_bytes))
+
+        self.assertEqual(synapse.texts, EXPECTED_TEXTS)
+        self.assertEqual(synapse.completion, EXPECTED_COMPLETION)
+        self.assertEqual(
+            [event["type"] for event in yielded].count("completion"), 1
+        )
+        self.assertNotIn("digest", [event["type"] for event in yielded])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import asyncio
+import unittest
+from neurons.validators.apify.lookup_broker import LookupBroker
+
+
+class LookupBrokerTestCase(unittest.TestCase):
+    """
+    This class contains unit tests for the LookupBroker class.
+    """
+
+    def setUp(self):
+        self.runs = []
+
+    async def iterate_items(self, urls):
+        self.runs.append(sorted(urls))
+        for url in urls:
+            await asyncio.sleep(0.01)
+            if "missing" not in url:
+                yield {"url": url}
+
+    def get_broker(self, **kwargs):
+        return LookupBroker(
+            iterate_items=self.iterate_items,
+            get_item_key=lambda item: item["url"],
+            **kwargs,
+        )
+
+    def test_concurrent_lookups_share_one_run(self):
+        """
+        Test that lookups within the window are sent as one run and fanned back out.
+        """
+
+        async def run():
+            broker = self.get_broker(window=0.05)
+            return await asyncio.gather(
+                broker.lookup({"a": "a", "b": "b"}),
+                broker.lookup({"b": "b", "c": "c", "missing": "missing"}),
+            )
+
+        first, second = asyncio.run(run())
+
+        self.assertEqual(self.runs, [["a", "b", "c", "missing"]])
+        self.assertEqual(set(first), {"a", "b"})
+        self.assertEqual(set(second), {"b", "c"})
+
+    def test_lookup_joins_run_in_flight(self):
+        """
+        Test that a key already being looked up is not sent again.
+        """
+
+        async def run():
+            broker = self.get_broker(window=0)
+            first = asyncio.create_task(broker.lookup({"a": "a"}))
+            await asyncio.sleep(0.005)
+            second = await broker.lookup({"a": "a"})
+            return await first, second
+
+        first, second = asyncio.run(run())
+
+        self.assertEqual(self.runs, [["a"]])
+        self.assertEqual(first, second)
+
+    def test_batch_size_limit(self):
+        """
+        Test that a full batch is sent without waiting for the window.
+        """
+
+        async def run():
+            broker = self.get_broker(window=10, max_batch_size=2)
+            return await asyncio.wait_for(broker.lookup({"a": "a", "b": "b"}), 1)
+
+        self.assertEqual(set(asyncio.run(run())), {"a", "b"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import random
+import unittest
+from neurons.validators.reward.link_sampling import binomial_tail, plan_link_sampling
+
+
+class PlanLinkSamplingTestCase(unittest.TestCase):
+    """
+    This class contains unit tests for the verification link sampling planner.
+    """
+
+    def test_shared_links_cover_all_responses(self):
+        """
+        Test that links cited by every response are enough to cover them all.
+        """
+        shared = ["shared1", "shared2"]
+        links_per_response = [shared + [f"own{index}"] for index in range(10)]
+
+        plan = plan_link_sampling(
+            links_per_response, per_response=2, rng=random.Random(0)
+        )
+
+        self.assertEqual(plan.coverage, 1.0)
+        # One exploration link per response at most, plus the shared links
+        self.assertLessEqual(len(plan.links), 12)
+        self.assertTrue(all(count >= 2 for count in plan.sampled_counts))
+
+    def test_every_response_is_explored(self):
+        """
+        Test that each response gets at least one link even with shared links available.
+        """
+        links_per_response = [["shared", f"own{index}"] for index in range(5)]
+
+        plan = plan_link_sampling(
+            links_per_response, per_response=1, rng=random.Random(1)
+        )
+
+        self.assertTrue(all(count >= 1 for count in plan.sampled_counts))
+        self.assertEqual(len(plan.links), len(set(plan.links)))
+
+    def test_budget_limits_fetches(self):
+        """
+        Test that no more links than the budget are picked.
+        """
+        links_per_response = [[f"link{index}-{n}" for n in range(5)] for index in range(4)]
+
+        plan = plan_link_sampling(
+            links_per_response, per_response=3, budget=6, rng=random.Random(2)
+        )
+
+        self.assertEqual(len(plan.links), 6)
+        self.assertLess(plan.coverage, 1.0)
+
+    def test_expected_coverage(self):
+        """
+        Test that failed fetches lower the expected coverage.
+        """
+        plan = plan_link_sampling(
+            [["a", "b"], ["c"], []], per_response=2, success_rate=0.5
+        )
+
+        self.assertEqual(plan.coverage, 1.0)
+        self.assertAlmostEqual(plan.expected_coverage, (0.25 + 0.5) / 2)
+        self.assertAlmostEqual(binomial_tail(3, 2, 0.5), 0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
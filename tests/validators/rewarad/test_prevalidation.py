@@ -0,0 +1,104 @@
+import unittest
+from types import SimpleNamespace
+from neurons.validators.reward.twitter_content_relevance import (
+    TwitterContentRelevanceModel,
+)
+from neurons.validators.reward.search_content_relevance import (
+    WebSearchContentRelevanceModel,
+)
+
+MINER_TWEET = {
+    "id": "1",
+    "author_id": "10",
+    "text": "Battery breakthrough announced",
+    "edit_history_tweet_ids": ["1"],
+    "public_metrics": {
+        "retweet_count": 0,
+        "reply_count": 0,
+        "like_count": 0,
+        "quote_count": 0,
+    },
+    "created_at": "2024-01-10T12:00:00.000Z",
+}
+MINER_USER = {
+    "id": "10",
+    "name": "Author",
+    "username": "author",
+    "created_at": "2020-01-01T00:00:00.000Z",
+}
+
+
+def make_response(
+    status_code=200,
+    completion="Summary of tweets",
+    completion_links=("https://x.com/a/status/1", "https://x.com/a/status/2"),
+    miner_tweets=None,
+    search_completion_links=("https://a.com", "https://b.com"),
+    search_results=None,
+):
+    return SimpleNamespace(
+        dendrite=SimpleNamespace(status_code=status_code),
+        axon=SimpleNamespace(hotkey="hotkey"),
+        completion_links=list(completion_links),
+        search_completion_links=list(search_completion_links),
+        search_results=search_results if search_results is not None else {"organic_results": ["https://a.com"]},
+        miner_tweets=miner_tweets
+        if miner_tweets is not None
+        else {
+            "data": [MINER_TWEET],
+            "includes": {"users": [MINER_USER]},
+            "meta": {"result_count": 1},
+        },
+        get_twitter_completion=lambda: completion,
+        get_search_summary_completion=lambda: completion,
+    )
+
+
+class TwitterPrevalidationTestCase(unittest.TestCase):
+    """
+    This class contains unit tests for TwitterContentRelevanceModel.prevalidate.
+    """
+
+    def setUp(self):
+        # prevalidate only reads the responses, so the scraper and LLM are not needed
+        self.model = TwitterContentRelevanceModel.__new__(TwitterContentRelevanceModel)
+
+    def test_accepts_well_formed_response(self):
+        self.assertEqual(self.model.prevalidate([make_response()]), [True])
+
+    def test_rejects_responses_that_score_zero(self):
+        responses = [
+            make_response(status_code=408),
+            make_response(completion_links=["https://x.com/a/status/1"]),
+            make_response(miner_tweets={"data": [], "meta": {"result_count": 0}}),
+            make_response(
+                miner_tweets={
+                    "data": [{**MINER_TWEET, "author_id": "11"}],
+                    "includes": {"users": [MINER_USER]},
+                    "meta": {"result_count": 1},
+                }
+            ),
+        ]
+        self.assertEqual(self.model.prevalidate(responses), [False] * 4)
+
+
+class SearchPrevalidationTestCase(unittest.TestCase):
+    """
+    This class contains unit tests for WebSearchContentRelevanceModel.prevalidate.
+    """
+
+    def setUp(self):
+        self.model = WebSearchContentRelevanceModel.__new__(WebSearchContentRelevanceModel)
+
+    def test_marks_eligible_responses(self):
+        responses = [
+            make_response(),
+            make_response(completion=""),
+            make_response(search_completion_links=["https://a.com"]),
+            make_response(search_results={}),
+        ]
+        self.assertEqual(self.model.prevalidate(responses), [True, False, False, False])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+from neurons.validators.utils.prompts import (
+    ScoringPrompt,
+    SummaryRelevancePrompt,
+    LinkContentPrompt,
+)
+
+
+class ScoringPromptTestCase(unittest.TestCase):
+    """
+    This class contains unit tests for the ScoringPrompt class.
+    """
+
+    def setUp(self):
+        self.scoring_prompt = ScoringPrompt()
+
+    def test_extract_score_from_code(self):
+        """
+        Test that special codes are mapped to their scores.
+        """
+        self.assertEqual(
+            self.scoring_prompt.extract_score("SM_SCS_GRY, Explanation: partial"), 8
+        )
+
+    def test_extract_expected_score(self):
+        """
+        Test that expected scores from logit scoring keep their fractional part.
+        """
+        self.assertAlmostEqual(self.scoring_prompt.extract_score("7.3521"), 7.3521)
+
+    def test_has_score(self):
+        """
+        Test that codes and numbers count as scores while empty text does not.
+        """
+        self.assertTrue(self.scoring_prompt.has_score("SM_SCS_GRN"))
+        self.assertTrue(self.scoring_prompt.has_score("7.5"))
+        self.assertFalse(self.scoring_prompt.has_score(""))
+        self.assertFalse(self.scoring_prompt.has_score("Explanation not found"))
+
+    def test_find_score_codes(self):
+        """
+        Test that the candidate codes are read from each system message.
+        """
+        self.assertEqual(
+            self.scoring_prompt.find_score_codes(
+                SummaryRelevancePrompt().get_system_message()
+            ),
+            ["SM_SCS_RDD", "SM_SCS_PNK", "SM_SCS_BLE", "SM_SCS_GRY", "SM_SCS_GRN"],
+        )
+        self.assertEqual(
+            self.scoring_prompt.find_score_codes(
+                LinkContentPrompt().get_system_message()
+            ),
+            ["SM_SCS_PNK", "SM_SCS_BLE", "SM_SCS_YAL"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+import unittest
+from neurons.validators.reward.relevance_prefilter import (
+    IRRELEVANT_SCORE_TEXT,
+    RELEVANT_SCORE_TEXT,
+    RelevancePrefilter,
+    calibrate_thresholds,
+)
+from neurons.validators.utils.prompts import (
+    LinkContentPrompt,
+    SearchSummaryRelevancePrompt,
+)
+
+
+class CalibrateThresholdsTestCase(unittest.TestCase):
+    """
+    This class contains unit tests for the relevance prefilter calibration.
+    """
+
+    def test_separable_records(self):
+        """
+        Test that the thresholds enclose the band where LLM scores are mixed.
+        """
+        records = [
+            {"similarity": 0.05, "score": 0},
+            {"similarity": 0.10, "score": 0},
+            {"similarity": 0.20, "score": 2},
+            {"similarity": 0.40, "score": 5},
+            {"similarity": 0.50, "score": 8},
+            {"similarity": 0.80, "score": 10},
+            {"similarity": 0.90, "score": 9},
+        ]
+        low_threshold, high_threshold = calibrate_thresholds(records, tolerance=0)
+
+        self.assertGreater(low_threshold, 0.20)
+        self.assertLess(low_threshold, 0.40)
+        self.assertGreater(high_threshold, 0.40)
+        self.assertLess(high_threshold, 0.50)
+
+    def test_no_confident_band(self):
+        """
+        Test that nothing is decided when the LLM disagrees at both ends.
+        """
+        records = [
+            {"similarity": 0.05, "score": 10},
+            {"similarity": 0.90, "score": 0},
+        ]
+        low_threshold, high_threshold = calibrate_thresholds(records, tolerance=0)
+
+        self.assertEqual(low_threshold, float("-inf"))
+        self.assertEqual(high_threshold, float("inf"))
+
+
+class PrefilterTestCase(unittest.IsolatedAsyncioTestCase):
+    """
+    This class contains unit tests for RelevancePrefilter.prefilter.
+    """
+
+    def make_prefilter(self, **kwargs):
+        prefilter = RelevancePrefilter(low_threshold=0.1, **kwargs)
+        # Fixed similarities stand in for the embedding model
+        prefilter.get_similarities = lambda prompt, contents: [0.05, 0.5, 0.95]
+        return prefilter
+
+    async def test_only_rejects_by_default(self):
+        """
+        Test that content restating the prompt is still sent to the LLM by default.
+        """
+        decided, similarities = await self.make_prefilter().prefilter(
+            "battery news", {"a": "cats", "b": "battery", "c": "battery news"}
+        )
+
+        self.assertEqual(decided, {"a": IRRELEVANT_SCORE_TEXT})
+        self.assertEqual(list(similarities.keys()), ["a", "b", "c"])
+
+    async def test_high_threshold_is_opt_in(self):
+        """
+        Test that a calibrated high threshold scores similar content as relevant.
+        """
+        decided, _ = await self.make_prefilter(high_threshold=0.9).prefilter(
+            "battery news", {"a": "cats", "b": "battery", "c": "battery news"}
+        )
+
+        self.assertEqual(
+            decided, {"a": IRRELEVANT_SCORE_TEXT, "c": RELEVANT_SCORE_TEXT}
+        )
+
+    def test_score_codes_match_templates(self):
+        """
+        Test that the prefilter uses the lowest and highest codes the LLM can answer with.
+        """
+        for scoring_prompt in [LinkContentPrompt(), SearchSummaryRelevancePrompt()]:
+            codes = scoring_prompt.find_score_codes(scoring_prompt.get_system_message())
+            scores = [scoring_prompt.special_scores[code] for code in codes]
+            self.assertIn(IRRELEVANT_SCORE_TEXT, codes)
+            self.assertIn(RELEVANT_SCORE_TEXT, codes)
+            self.assertEqual(
+                scoring_prompt.special_scores[IRRELEVANT_SCORE_TEXT], min(scores)
+            )
+            self.assertEqual(
+                scoring_prompt.special_scores[RELEVANT_SCORE_TEXT], max(scores)
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
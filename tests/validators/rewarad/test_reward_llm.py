@@ -0,0 +1,110 @@
+import os
+import time
+import tempfile
+import unittest
+from neurons.validators.reward.reward_llm import RewardLLM
+from neurons.validators.reward.score_cache import ScoreCache
+from neurons.validators.utils.cache import PersistentLRUCache
+
+SCORE_TEXT = "SM_SCS_YAL"
+
+
+def make_messages(count):
+    return [
+        {str(index): [{"role": "user", "content": f"message {index}"}]}
+        for index in range(count)
+    ]
+
+
+def make_reward_llm(local_seconds, local_score_text=SCORE_TEXT, score_cache=None):
+    reward_llm = RewardLLM(
+        scoring_batch_size=1,
+        scoring_batch_max_wait=0,
+        scoring_source_timeout=0.1,
+        scoring_deadline=5,
+        scoring_chunk_size=1,
+        score_cache=score_cache,
+    )
+    # One message per batch, so each chunk waits for the ones queued before it
+    reward_llm.scoring_window_size = 1
+    reward_llm.pipe = object()
+    reward_llm.scoring_backend = "int8"
+    reward_llm.openai_calls = 0
+
+    def get_score_by_zephyer(messages):
+        time.sleep(local_seconds)
+        return {
+            next(iter(message_dict)): local_score_text for message_dict in messages
+        }
+
+    async def get_score_by_openai(messages):
+        reward_llm.openai_calls += 1
+        return {next(iter(message_dict)): SCORE_TEXT for message_dict in messages}
+
+    reward_llm.get_score_by_zephyer = get_score_by_zephyer
+    reward_llm.get_score_by_openai = get_score_by_openai
+    return reward_llm
+
+
+class ScoreChunkTestCase(unittest.IsolatedAsyncioTestCase):
+    """
+    This class contains unit tests for the hedging of RewardLLM.score_by_sources.
+    """
+
+    async def test_queued_chunks_are_not_hedged(self):
+        """
+        Test that chunks waiting for the local model do not hedge to OpenAI.
+        """
+        reward_llm = make_reward_llm(local_seconds=0.05)
+
+        # Eight chunks take 0.4 seconds on the local model, four times the source timeout
+        score_responses = await reward_llm.score_by_sources(make_messages(8))
+
+        self.assertEqual(list(score_responses.values()), [SCORE_TEXT] * 8)
+        self.assertEqual(reward_llm.openai_calls, 0)
+
+    async def test_slow_local_model_is_hedged(self):
+        """
+        Test that a chunk the local model takes too long on is hedged to OpenAI.
+        """
+        reward_llm = make_reward_llm(local_seconds=0.3)
+
+        score_responses = await reward_llm.score_by_sources(make_messages(1))
+
+        self.assertEqual(score_responses, {"0": SCORE_TEXT})
+        self.assertEqual(reward_llm.openai_calls, 1)
+
+
+class ScoreCacheSourceTestCase(unittest.IsolatedAsyncioTestCase):
+    """
+    This class contains unit tests for the score cache keys of RewardLLM.llm_processing.
+    """
+
+    async def test_scores_are_cached_under_their_source(self):
+        """
+        Test that a score from OpenAI is cached as OpenAI's and not as the local model's.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            score_cache = ScoreCache(
+                PersistentLRUCache(os.path.join(directory, "scores.sqlite"))
+            )
+            # The local model answers without a score, so OpenAI scores the message
+            reward_llm = make_reward_llm(
+                local_seconds=0, local_score_text="", score_cache=score_cache
+            )
+            messages = make_messages(1)
+
+            self.assertEqual(await reward_llm.llm_processing(messages), {"0": SCORE_TEXT})
+
+            local_tag = reward_llm.get_local_model_tag()
+            self.assertIn("int8", local_tag)
+            self.assertEqual(score_cache.lookup(messages, [local_tag])[0], {})
+            self.assertEqual(
+                score_cache.lookup(messages, ["openai-gpt-3.5-turbo-16k"])[0],
+                {"0": SCORE_TEXT},
+            )
+            score_cache.cache.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
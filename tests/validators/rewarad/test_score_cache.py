@@ -0,0 +1,54 @@
+import os
+import tempfile
+import unittest
+from neurons.validators.reward.score_cache import ScoreCache
+from neurons.validators.utils.cache import PersistentLRUCache
+
+MESSAGES = [
+    {"0": [{"role": "system", "content": "template"}, {"role": "user", "content": "tweet"}]}
+]
+
+
+class ScoreCacheTestCase(unittest.TestCase):
+    """
+    This class contains unit tests for the ScoreCache class.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.score_cache = ScoreCache(
+            PersistentLRUCache(os.path.join(self.directory.name, "scores.sqlite"))
+        )
+
+    def tearDown(self):
+        self.score_cache.cache.close()
+        self.directory.cleanup()
+
+    def test_scores_are_kept_per_model(self):
+        """
+        Test that a score is only returned for the model that produced it.
+        """
+        self.score_cache.store(
+            MESSAGES, {"0": "SM_SCS_YAL"}, 1.0, {"0": "openai-gpt-3.5-turbo-16k"}
+        )
+
+        cached, missing = self.score_cache.lookup(MESSAGES, ["zephyr-int8-generate"])
+        self.assertEqual((cached, missing), ({}, MESSAGES))
+
+        cached, missing = self.score_cache.lookup(
+            MESSAGES, ["zephyr-int8-generate", "openai-gpt-3.5-turbo-16k"]
+        )
+        self.assertEqual((cached, missing), ({"0": "SM_SCS_YAL"}, []))
+
+    def test_scores_without_model_are_not_stored(self):
+        """
+        Test that scores of a source without a model tag are not cached.
+        """
+        self.score_cache.store(MESSAGES, {"0": "SM_SCS_YAL"}, 1.0, {"0": None})
+
+        cached, missing = self.score_cache.lookup(MESSAGES, ["None"])
+        self.assertEqual((cached, missing), ({}, MESSAGES))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+import unittest
+from types import SimpleNamespace
+from neurons.validators.reward.twitter_content_relevance import (
+    TwitterContentRelevanceModel,
+    parse_tweet_timestamp,
+)
+
+MINER_TWEET = {
+    "id": "1",
+    "author_id": "10",
+    "text": "Battery breakthrough announced",
+    "edit_history_tweet_ids": ["1"],
+    "public_metrics": {"like_count": 0},
+    "created_at": "2024-01-10T12:00:00.000Z",
+}
+MINER_USER = {
+    "id": "10",
+    "name": "Author",
+    "username": "author",
+    "created_at": "2020-01-01T00:00:00.000Z",
+}
+
+
+def make_response():
+    return SimpleNamespace(
+        dendrite=SimpleNamespace(status_code=200),
+        axon=SimpleNamespace(hotkey="hotkey"),
+        completion_links=["https://x.com/a/status/1", "https://x.com/a/status/2"],
+        miner_tweets={
+            "data": [MINER_TWEET],
+            "includes": {"users": [MINER_USER]},
+            "meta": {"result_count": 1},
+        },
+        validator_tweets=[],
+        get_twitter_completion=lambda: "Summary of tweets",
+    )
+
+
+class TweetVerificationTestCase(unittest.TestCase):
+    """
+    This class contains unit tests for TwitterContentRelevanceModel.check_response_random_tweet.
+    """
+
+    def setUp(self):
+        # The check only reads the responses, so the scraper and LLM are not needed
+        self.model = TwitterContentRelevanceModel.__new__(TwitterContentRelevanceModel)
+
+    def make_validator_tweet(self, text, created_at="Wed Jan 10 12:00:00 +0000 2024"):
+        return SimpleNamespace(id="1", full_text=text, created_at=created_at)
+
+    def test_parses_both_date_formats(self):
+        self.assertEqual(
+            parse_tweet_timestamp("2024-01-10T12:00:00.000Z"),
+            parse_tweet_timestamp("Wed Jan 10 12:00:00 +0000 2024"),
+        )
+        self.assertIsNone(parse_tweet_timestamp("not a date"))
+
+    def test_matches_normalized_text_and_date(self):
+        response = make_response()
+        response.validator_tweets = [
+            self.make_validator_tweet("@someone  Battery breakthrough\nannounced https://t.co/x")
+        ]
+        self.assertEqual(self.model.check_response_random_tweet(response), 1)
+
+    def test_rejects_different_date(self):
+        response = make_response()
+        response.validator_tweets = [
+            self.make_validator_tweet(MINER_TWEET["text"], "Wed Jan 10 12:00:01 +0000 2024")
+        ]
+        self.assertEqual(self.model.check_response_random_tweet(response), 0)
+
+    def test_shares_validator_keys_between_responses(self):
+        validator_tweet_keys = {}
+        validator_tweet = self.make_validator_tweet(MINER_TWEET["text"])
+        responses = [make_response(), make_response()]
+        for response in responses:
+            response.validator_tweets = [validator_tweet]
+
+        scores = [
+            self.model.check_response_random_tweet(response, validator_tweet_keys)
+            for response in responses
+        ]
+
+        self.assertEqual(scores, [1, 1])
+        self.assertEqual(list(validator_tweet_keys.keys()), ["1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
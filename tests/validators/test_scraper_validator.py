@@ -0,0 +1,201 @@
+import os
+import sys
+import json
+import asyncio
+import unittest
+import torch
+import bittensor as bt
+from types import SimpleNamespace
+
+# scraper_validator imports its siblings the way the validator entry point runs it
+sys.path.insert(
+    0,
+    os.path.join(
+        os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+        "neurons",
+        "validators",
+    ),
+)
+
+from neurons.validators.scraper_validator import ScraperValidator
+from template.protocol import ScraperStreamingSynapse
+
+UIDS = [1, 2, 3]
+
+
+def text_chunk(content, role="summary"):
+    return json.dumps({"type": "text", "role": role, "content": content}).encode("utf-8")
+
+
+def make_validator():
+    validator = ScraperValidator.__new__(ScraperValidator)
+    validator.model = "gpt-3.5-turbo-0125"
+    validator.seed = 1234
+    validator.timeout = 150
+    validator.neuron = SimpleNamespace(
+        available_uids=UIDS,
+        config=SimpleNamespace(neuron=SimpleNamespace(organic_stream_policy="first")),
+        metagraph=SimpleNamespace(
+            axons={
+                uid: SimpleNamespace(ip="127.0.0.1", port=8091, hotkey=f"hotkey-{uid}")
+                for uid in UIDS
+            }
+        ),
+    )
+    return validator
+
+
+class OrganicTestCase(unittest.IsolatedAsyncioTestCase):
+    """
+    This class contains unit tests for ScraperValidator.organic.
+    """
+
+    async def test_missing_final_synapse_keeps_uid_order(self):
+        """
+        Test that a miner failing without a final synapse is scored as timed out in its own place.
+        """
+        validator = make_validator()
+
+        async def miner_stream(uid, finishes=True):
+            yield text_chunk(f"answer of {uid}")
+            if not finishes:
+                raise ConnectionError("miner went away")
+            yield ScraperStreamingSynapse(
+                messages="battery news",
+                completion=f"answer of {uid}",
+                dendrite=bt.TerminalInfo(status_code=200),
+                axon=bt.TerminalInfo(hotkey=f"hotkey-{uid}"),
+            )
+
+        async def run_task_and_score(**kwargs):
+            streams = [miner_stream(1), miner_stream(2, finishes=False), miner_stream(3)]
+            return streams, torch.tensor(UIDS), {}, 0
+
+        scored = asyncio.Event()
+        scoring_kwargs = {}
+
+        async def compute_rewards_and_penalties(**kwargs):
+            scoring_kwargs.update(kwargs)
+            scored.set()
+
+        validator.run_task_and_score = run_task_and_score
+        validator.compute_rewards_and_penalties = compute_rewards_and_penalties
+
+        [chunk async for chunk in validator.organic({"content": "battery news"})]
+        await asyncio.wait_for(scored.wait(), 5)
+
+        responses = scoring_kwargs["responses"]
+        self.assertEqual(len(responses), len(scoring_kwargs["uids"]))
+        self.assertEqual(
+            [response.axon.hotkey for response in responses],
+            ["hotkey-1", "hotkey-2", "hotkey-3"],
+        )
+        self.assertEqual(
+            [response.dendrite.status_code for response in responses], [200, 408, 200]
+        )
+        self.assertEqual(responses[1].completion, "answer of 2")
+
+
+class TimeoutSynapseTestCase(unittest.TestCase):
+    """
+    This class contains unit tests for ScraperValidator.create_timeout_synapse.
+    """
+
+    def test_built_like_streamed_synapse(self):
+        """
+        Test that a cut stream gets texts, completion and links like a finished stream.
+        """
+        validator = make_validator()
+        chunks = [
+            text_chunk("Battery news. ", role="intro"),
+            text_chunk("[Tweet](https://x.com/user/status/123)", role="twitter_summary"),
+            json.dumps({"type": "tweets", "content": {"data": []}}),
+        ]
+
+        synapse = validator.create_timeout_synapse(prompt="battery news", uid=2, chunks=chunks)
+
+        self.assertEqual(synapse.dendrite.status_code, 408)
+        self.assertEqual(synapse.axon.hotkey, "hotkey-2")
+        self.assertEqual(
+            synapse.texts,
+            {
+                "intro": "Battery news. ",
+                "twitter_summary": "[Tweet](https://x.com/user/status/123)",
+            },
+        )
+        self.assertEqual(
+            synapse.completion, "Battery news. [Tweet](https://x.com/user/status/123)"
+        )
+        self.assertEqual(synapse.completion_links, ["https://x.com/user/status/123"])
+        self.assertEqual(synapse.miner_tweets, {"data": []})
+
+    def test_empty_stream_has_defaults(self):
+        """
+        Test that a miner that sent nothing gets the empty defaults of a streamed synapse.
+        """
+        synapse = make_validator().create_timeout_synapse(
+            prompt="battery news", uid=1, chunks=[]
+        )
+        self.assertEqual(synapse.texts, {})
+        self.assertEqual(synapse.completion, "")
+        self.assertEqual(synapse.completion_links, [])
+        self.assertEqual(synapse.search_completion_links, [])
+
+    def test_default_round_deadline_covers_dendrite_timeout(self):
+        """
+        Test that without a configured deadline, streams are not cut before the dendrite times out.
+        """
+        validator = make_validator()
+        validator.neuron.config.neuron.round_deadline = None
+        self.assertGreater(validator.get_round_deadline(), validator.timeout)
+
+
+class QueryAndScoreTestCase(unittest.IsolatedAsyncioTestCase):
+    """
+    This class contains unit tests for ScraperValidator.query_and_score.
+    """
+
+    async def test_short_round_deadline_ends_round(self):
+        """
+        Test that a configured deadline below the dendrite timeout cuts a hung miner.
+        """
+        validator = make_validator()
+        validator.tools = []
+        validator.neuron.config.neuron.round_deadline = 0.2
+        validator.neuron.config.neuron.stream_idle_timeout = 30
+        validator.neuron.config.neuron.stream_first_chunk_timeout = 120
+
+        async def miner_stream(uid, hangs=False):
+            yield text_chunk(f"answer of {uid}")
+            if hangs:
+                await asyncio.sleep(60)
+            yield ScraperStreamingSynapse(
+                messages="battery news",
+                completion=f"answer of {uid}",
+                dendrite=bt.TerminalInfo(status_code=200),
+                axon=bt.TerminalInfo(hotkey=f"hotkey-{uid}"),
+            )
+
+        async def run_task_and_score(**kwargs):
+            streams = [miner_stream(1), miner_stream(2, hangs=True), miner_stream(3)]
+            return streams, torch.tensor(UIDS), {}, 0
+
+        scoring_kwargs = {}
+
+        async def compute_rewards_and_penalties(**kwargs):
+            scoring_kwargs.update(kwargs)
+
+        validator.run_task_and_score = run_task_and_score
+        validator.compute_rewards_and_penalties = compute_rewards_and_penalties
+
+        await asyncio.wait_for(validator.query_and_score(), 5)
+
+        responses = scoring_kwargs["responses"]
+        self.assertEqual(
+            [response.dendrite.status_code for response in responses], [200, 408, 200]
+        )
+        self.assertEqual(responses[1].completion, "answer of 2")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import os
+import time
+import sqlite3
+import tempfile
+import unittest
+from neurons.validators.utils.cache import PersistentLRUCache
+
+
+class PersistentLRUCacheTestCase(unittest.TestCase):
+    """
+    This class contains unit tests for the PersistentLRUCache class.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "cache.sqlite")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_values_survive_restart(self):
+        """
+        Test that values evicted from memory are still read back from disk.
+        """
+        cache = PersistentLRUCache(self.path, max_memory_items=1)
+        cache.set_many({"first": "SM_SCS_GRN", "second": "SM_SCS_PNK"})
+        cache.close()
+
+        cache = PersistentLRUCache(self.path, max_memory_items=1)
+        self.assertEqual(cache.get("first"), "SM_SCS_GRN")
+        self.assertEqual(cache.get("second"), "SM_SCS_PNK")
+        cache.close()
+
+    def test_expired_values_are_missing(self):
+        """
+        Test that values older than the TTL are not returned.
+        """
+        cache = PersistentLRUCache(self.path, ttl=0.05)
+        cache.set("key", 1)
+        time.sleep(0.1)
+        self.assertIsNone(cache.get("key"))
+        cache.close()
+
+    def test_disk_size_limit(self):
+        """
+        Test that the least recently used entries are dropped past the disk size.
+        """
+        cache = PersistentLRUCache(self.path, max_memory_items=10, max_disk_items=100)
+        cache.set_many({f"key{index}": index for index in range(300)})
+        self.assertEqual(len(cache), 100)
+        cache.close()
+
+    def test_reads_leave_database_unlocked(self):
+        """
+        Test that a disk hit does not hold a write transaction open for other processes.
+        """
+        cache = PersistentLRUCache(self.path, max_memory_items=1)
+        cache.set_many({"first": 1, "second": 2})
+        self.assertEqual(cache.get("first"), 1)
+        self.assertFalse(cache.connection.in_transaction)
+
+        other = sqlite3.connect(self.path, timeout=0.1)
+        other.execute("INSERT INTO cache VALUES ('third', '3', 0, 0)")
+        other.commit()
+        other.close()
+
+        # The buffered access time is written with the next write
+        cache.set("fourth", 4)
+        self.assertEqual(cache.pending_accesses, {})
+        cache.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,202 @@
+import asyncio
+import unittest
+from aiohttp import web
+from neurons.validators.utils.cache import PersistentLRUCache
+from neurons.validators.utils.page_metadata import (
+    PageMetadataFetcher,
+    PublicAddressResolver,
+    is_public_address,
+)
+
+PAGE_HEAD = (
+    b"<html><head><title>Solid &amp; state</title>"
+    b'<meta name="description" content="Battery news"></head>'
+)
+
+
+class PageMetadataFetcherTestCase(unittest.IsolatedAsyncioTestCase):
+    """
+    This class contains unit tests for the PageMetadataFetcher class, against a local server.
+    """
+
+    async def asyncSetUp(self):
+        self.requests = []
+
+        async def page(request):
+            self.requests.append(request.path)
+            return web.Response(body=PAGE_HEAD + b"<body>text</body></html>", content_type="text/html")
+
+        async def cached_page(request):
+            self.requests.append(request.path)
+            if request.headers.get("If-None-Match") == '"v1"':
+                return web.Response(status=304, headers={"ETag": '"v1"'})
+            return web.Response(
+                body=PAGE_HEAD + b"<body></body></html>",
+                content_type="text/html",
+                headers={"ETag": '"v1"'},
+            )
+
+        async def endless_page(request):
+            # The head is sent, the body never finishes
+            response = web.StreamResponse(headers={"Content-Type": "text/html"})
+            await response.prepare(request)
+            await response.write(PAGE_HEAD + b"<body>")
+            await asyncio.sleep(3)
+            return response
+
+        async def missing_page(request):
+            return web.Response(status=404)
+
+        async def redirect(request):
+            self.requests.append(request.path)
+            raise web.HTTPFound(request.query["to"])
+
+        app = web.Application()
+        app.router.add_get("/page", page)
+        app.router.add_get("/cached", cached_page)
+        app.router.add_get("/endless", endless_page)
+        app.router.add_get("/missing", missing_page)
+        app.router.add_get("/redirect", redirect)
+
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.base_url = f"http://127.0.0.1:{port}"
+
+        # The local server is on loopback, which only this fetcher may reach
+        self.fetcher = PageMetadataFetcher(
+            cache=PersistentLRUCache(),
+            timeout=5,
+            is_allowed_address=lambda address: address == "127.0.0.1",
+        )
+
+    async def asyncTearDown(self):
+        await self.fetcher.close()
+        await self.runner.cleanup()
+
+    async def test_reads_title_and_description(self):
+        """
+        Test that the metadata has the WebScraperActor shape and skips missing pages.
+        """
+        urls = [f"{self.base_url}/page", f"{self.base_url}/missing"]
+        result = await self.fetcher.scrape_metadata(urls)
+
+        self.assertEqual(
+            result,
+            [{"title": "Solid & state", "description": "Battery news", "url": urls[0]}],
+        )
+
+    async def test_stops_at_end_of_head(self):
+        """
+        Test that a page whose body never finishes is read without waiting for it.
+        """
+        result = await asyncio.wait_for(
+            self.fetcher.scrape_metadata([f"{self.base_url}/endless"]), 2
+        )
+        self.assertEqual(result[0]["title"], "Solid & state")
+
+    async def test_revalidates_with_etag(self):
+        """
+        Test that a page with an ETag is served from the cache after a 304.
+        """
+        url = f"{self.base_url}/cached"
+        first = await self.fetcher.scrape_metadata([url])
+        second = await self.fetcher.scrape_metadata([url])
+
+        self.assertEqual(first, second)
+        self.assertEqual(self.requests, ["/cached", "/cached"])
+        self.assertEqual(self.fetcher.cache.get(url)["etag"], '"v1"')
+
+    async def test_follows_allowed_redirects(self):
+        """
+        Test that redirects are followed and the metadata keeps the requested url.
+        """
+        url = f"{self.base_url}/redirect?to=/page"
+        result = await self.fetcher.scrape_metadata([url])
+
+        self.assertEqual(result[0]["title"], "Solid & state")
+        self.assertEqual(result[0]["url"], url)
+        self.assertEqual(self.requests, ["/redirect", "/page"])
+
+    async def test_rejects_redirect_to_disallowed_address(self):
+        """
+        Test that every redirect hop is checked, not only the first url.
+        """
+        port = self.base_url.rsplit(":", 1)[1]
+        for target in [
+            f"http://127.0.0.2:{port}/page",
+            f"http://127.000.000.001:{port}/page",
+            "http://169.254.169.254/latest/meta-data/",
+            "file:///etc/passwd",
+        ]:
+            result = await self.fetcher.scrape_metadata(
+                [f"{self.base_url}/redirect?to={target}"]
+            )
+            self.assertEqual(result, [], target)
+        self.assertNotIn("/page", self.requests)
+
+
+class PageMetadataAddressTestCase(unittest.IsolatedAsyncioTestCase):
+    """
+    This class contains unit tests for the address checks of PageMetadataFetcher.
+    """
+
+    def test_public_addresses(self):
+        """
+        Test that only publicly routable addresses are allowed.
+        """
+        for address in ["8.8.8.8", "2606:4700:4700::1111"]:
+            self.assertTrue(is_public_address(address), address)
+        for address in [
+            "127.0.0.1",
+            "10.0.0.1",
+            "172.16.0.1",
+            "192.168.1.1",
+            "169.254.169.254",
+            "100.64.0.1",
+            "0.0.0.0",
+            "224.0.0.1",
+            "::1",
+            "fe80::1",
+            "fc00::1",
+            "::ffff:127.0.0.1",
+            "not an address",
+        ]:
+            self.assertFalse(is_public_address(address), address)
+
+    async def test_rejects_internal_urls_by_default(self):
+        """
+        Test that the default fetcher does not request loopback, private or non-http urls.
+        """
+        fetcher = PageMetadataFetcher(timeout=2)
+        try:
+            result = await fetcher.scrape_metadata(
+                [
+                    "http://127.0.0.1:1/",
+                    "http://localhost:1/",
+                    "http://[::1]:1/",
+                    "http://192.168.0.1/",
+                    "http://2130706433/",
+                    "ftp://example.com/",
+                ]
+            )
+        finally:
+            await fetcher.close()
+        self.assertEqual(result, [])
+
+    async def test_resolver_drops_internal_addresses(self):
+        """
+        Test that host names resolving only to loopback are rejected.
+        """
+        resolver = PublicAddressResolver()
+        try:
+            with self.assertRaises(OSError):
+                await resolver.resolve("localhost", 80)
+        finally:
+            await resolver.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
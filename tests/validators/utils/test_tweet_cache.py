@@ -0,0 +1,75 @@
+import os
+import time
+import tempfile
+import unittest
+from template.protocol import TwitterScraperTweet, TwitterScraperUser
+from neurons.validators.utils.cache import PersistentLRUCache
+from neurons.validators.utils.tweet_cache import BloomFilter, TweetVerificationCache
+
+
+class TweetVerificationCacheTestCase(unittest.TestCase):
+    """
+    This class contains unit tests for the TweetVerificationCache class.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "tweets.sqlite")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def get_tweet(self, tweet_id):
+        return TwitterScraperTweet(
+            id=tweet_id,
+            full_text=f"Tweet {tweet_id}",
+            created_at="Wed Jan 10 12:00:00 +0000 2024",
+            user=TwitterScraperUser(id="1", username="smartscrape"),
+        )
+
+    def test_tweets_survive_restart(self):
+        """
+        Test that stored tweets are returned after the cache is reopened.
+        """
+        cache = TweetVerificationCache(PersistentLRUCache(self.path, table="tweets"))
+        cache.store([self.get_tweet("100")])
+        cache.cache.close()
+
+        cache = TweetVerificationCache(PersistentLRUCache(self.path, table="tweets"))
+        tweets, missing_ids = cache.lookup(["100", "200"])
+        self.assertEqual(tweets["100"].full_text, "Tweet 100")
+        self.assertEqual(tweets["100"].user.username, "smartscrape")
+        self.assertEqual(missing_ids, ["200"])
+        cache.cache.close()
+
+    def test_negative_entries_expire(self):
+        """
+        Test that tweets confirmed missing are skipped until the negative TTL passes.
+        """
+        cache = TweetVerificationCache(PersistentLRUCache(), negative_ttl=0.05)
+        cache.store([], ["300"])
+
+        tweets, missing_ids = cache.lookup(["300"])
+        self.assertEqual(tweets, {})
+        self.assertEqual(missing_ids, [])
+
+        time.sleep(0.1)
+        tweets, missing_ids = cache.lookup(["300"])
+        self.assertEqual(missing_ids, ["300"])
+
+    def test_bloom_filter_has_no_false_negatives(self):
+        """
+        Test that every added key is reported as present.
+        """
+        bloom_filter = BloomFilter(capacity=1000)
+        keys = [str(index) for index in range(1000)]
+        for key in keys:
+            bloom_filter.add(key)
+
+        self.assertTrue(all(key in bloom_filter for key in keys))
+        false_positives = sum(str(index) in bloom_filter for index in range(1000, 11000))
+        self.assertLess(false_positives, 500)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import unittest
+from aiohttp import web
+from neurons.validators.utils.tweet_verifier import (
+    TwitterV2TweetVerifier,
+    convert_iso_date,
+)
+
+
+class TwitterV2TweetVerifierTestCase(unittest.IsolatedAsyncioTestCase):
+    """
+    This class contains unit tests for the TwitterV2TweetVerifier class, against a local stand-in of the Twitter API.
+    """
+
+    async def asyncSetUp(self):
+        self.requested_ids = []
+
+        async def lookup(request):
+            self.assertEqual(request.headers["Authorization"], "Bearer token")
+            ids = request.query["ids"].split(",")
+            self.requested_ids.append(ids)
+            return web.json_response(
+                {
+                    "data": [
+                        {
+                            "id": tweet_id,
+                            "text": f"Tweet {tweet_id}",
+                            "author_id": "7",
+                            "created_at": "2024-01-10T12:00:00.000Z",
+                            "public_metrics": {"like_count": 3, "impression_count": 40},
+                            "referenced_tweets": [{"type": "quoted", "id": "1"}],
+                        }
+                        for tweet_id in ids
+                        if tweet_id != "404"
+                    ],
+                    "includes": {
+                        "users": [
+                            {
+                                "id": "7",
+                                "username": "smartscrape",
+                                "name": "Smart Scrape",
+                                "created_at": "2020-05-01T08:30:00.000Z",
+                                "public_metrics": {"followers_count": 10, "tweet_count": 99},
+                            }
+                        ]
+                    },
+                }
+            )
+
+        app = web.Application()
+        app.router.add_get("/2/tweets", lookup)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+
+        self.verifier = TwitterV2TweetVerifier(
+            bearer_token="token", base_url=f"http://127.0.0.1:{port}/2"
+        )
+
+    async def asyncTearDown(self):
+        await self.verifier.close()
+        await self.runner.cleanup()
+
+    async def test_ids_are_chunked(self):
+        """
+        Test that IDs are looked up in requests of at most 100 and missing tweets are left out.
+        """
+        urls = [f"https://x.com/user/status/{index}" for index in range(1000, 1250)]
+        urls.append("https://x.com/user/status/404")
+
+        tweets = [tweet async for tweet in self.verifier.iterate_tweets(urls)]
+
+        self.assertEqual(sorted(len(ids) for ids in self.requested_ids), [51, 100, 100])
+        self.assertEqual(len(tweets), 250)
+
+    async def test_tweet_mapping(self):
+        """
+        Test that the API payload is mapped to the fields of the Apify tweet scraper.
+        """
+        urls = ["https://twitter.com/smartscrape/status/1234"]
+        (tweet,) = [tweet async for tweet in self.verifier.iterate_tweets(urls)]
+
+        self.assertEqual(tweet.id, "1234")
+        self.assertEqual(tweet.full_text, "Tweet 1234")
+        self.assertEqual(tweet.created_at, "Wed Jan 10 12:00:00 +0000 2024")
+        self.assertEqual(tweet.view_count, 40)
+        self.assertTrue(tweet.is_quote_tweet)
+        self.assertEqual(tweet.url, "https://x.com/smartscrape/status/1234")
+        self.assertEqual(tweet.user.username, "smartscrape")
+        self.assertEqual(tweet.user.statuses_count, 99)
+        self.assertEqual(tweet.user.created_at, "Fri May 01 08:30:00 +0000 2020")
+
+    def test_convert_iso_date(self):
+        """
+        Test that invalid dates convert to an empty string.
+        """
+        self.assertEqual(convert_iso_date("not a date"), "")
+        self.assertEqual(convert_iso_date(None), "")
+
+
+if __name__ == "__main__":
+    unittest.main()